@@ -0,0 +1,362 @@
+"""Offline benchmark suite for gc, run against the local stand-in server.
+
+    python benchmarks/run.py                          # print results
+    python benchmarks/run.py -o results.json          # save them
+    python benchmarks/run.py --compare baseline.json  # fail on regressions
+
+Scenarios:
+
+  cold_start_*    process start to exit for `gc --help` and one real command
+  command_*       in-process latency per command (warm client)
+  render_*        table/JSON rendering of a 10k-row result set (--rows)
+  range_fanout_*  5-year weigh-in range split into API-limit chunks
+  paginate_*      paged activity listing
+
+Every scenario reports median/p95/min wall time in ms plus peak memory
+(tracemalloc for in-process scenarios, max RSS for subprocesses). With
+--compare, a scenario regresses when its median exceeds the baseline
+median by more than --threshold (ratio) and --min-delta ms; the exit code
+is then 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from standin import (
+    StandinServer,
+    load_cassette,
+    load_fixtures,
+    write_fake_tokens,
+)
+
+COMMANDS = {
+    "health_today": ["health", "today"],
+    "sleep_today": ["sleep", "today"],
+    "steps_month": ["steps", "--start", "2025-01-01", "--end", "2025-01-31"],
+    "activities_100": ["activities", "--limit", "100"],
+    "activities_count": ["activities", "count"],
+}
+RENDER_ROWS = 10_000
+RENDER_RUNS = 3
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summary(samples: list[float], **extra: Any) -> dict[str, Any]:
+    return {
+        "runs": len(samples),
+        "median_ms": statistics.median(samples),
+        "p95_ms": _percentile(samples, 95),
+        "min_ms": min(samples),
+        **extra,
+    }
+
+
+def measure(func: Callable[[], Any], runs: int, warmup: int = 1) -> dict[str, Any]:
+    """Time ``func`` in-process; memory is the tracemalloc peak of one run."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return _summary(samples, peak_kb=peak // 1024)
+
+
+def measure_process(args: list[str], runs: int, env: dict[str, str]) -> dict[str, Any]:
+    """Time a subprocess from spawn to exit and record its max RSS."""
+    samples, rss = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+        _, status, usage = os.wait4(proc.pid, 0)
+        samples.append((time.perf_counter() - start) * 1000)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} failed: {proc.stderr.read()}")
+        proc.stderr.close()
+        # ru_maxrss is KiB on Linux, bytes on macOS.
+        scale = 1024 if sys.platform == "darwin" else 1
+        rss.append(usage.ru_maxrss // scale)
+    return _summary(samples, max_rss_kb=max(rss))
+
+
+class Suite:
+    def __init__(
+        self,
+        server: StandinServer,
+        token_dir: Path,
+        runs: int,
+        rows: int = RENDER_ROWS,
+    ) -> None:
+        self.server = server
+        self.token_dir = token_dir
+        self.runs = runs
+        self.rows = rows
+        self.results: dict[str, dict[str, Any]] = {}
+
+        from typer.main import get_command
+
+        from garmincli.cli import app
+
+        self.root = get_command(app)
+
+    def run_command(self, args: list[str]) -> dict[str, Any]:
+        from garmincli.commands.batch import run_line
+
+        record = run_line(self.root, [*args, "--tokenstore", str(self.token_dir)])
+        if not record["ok"]:
+            raise RuntimeError(f"gc {' '.join(args)} failed: {record['error']}")
+        return record
+
+    def record(self, name: str, result: dict[str, Any]) -> None:
+        self.results[name] = result
+        extra = ""
+        if "requests" in result:
+            extra = f"  {result['requests']} requests"
+        memory = result.get("peak_kb", result.get("max_rss_kb"))
+        print(
+            f"{name:<32} {result['median_ms']:>10.1f} ms  (p95 {result['p95_ms']:.1f})"
+            f"  {memory} KiB{extra}",
+            file=sys.stderr,
+        )
+
+    def with_requests(self, func: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """Add server-side request counts per invocation (warmup included)."""
+        self.server.reset_stats()
+        result = func()
+        invocations = result["runs"] + 2
+        result["requests"] = round(sum(self.server.requests.values()) / invocations, 1)
+        result["throttled"] = self.server.throttled
+        return result
+
+    def cold_start(self) -> None:
+        env = {
+            **os.environ,
+            "GARMINCLI_API_URL": self.server.url,
+            "GARMINTOKENS": str(self.token_dir),
+        }
+        gc = [sys.executable, "-m", "garmincli"]
+        runs = max(3, self.runs // 2)
+        self.record("cold_start_help", measure_process([*gc, "--help"], runs, env))
+        self.record(
+            "cold_start_health_today",
+            measure_process([*gc, "health", "today", "--format", "json"], runs, env),
+        )
+
+    def commands(self) -> None:
+        for name, args in COMMANDS.items():
+            self.record(
+                f"command_{name}",
+                self.with_requests(
+                    lambda args=args: measure(lambda: self.run_command(args), self.runs)
+                ),
+            )
+
+    def render(self) -> None:
+        from garmincli.output import capture_output, render
+
+        template = load_fixtures()
+        activities = next(f for f in template if f.paginate).items
+        rows = [
+            {**activities[i % len(activities)], "activityId": i}
+            for i in range(self.rows)
+        ]
+
+        def _render(fmt: str) -> Callable[[], None]:
+            def run() -> None:
+                with capture_output():
+                    render(rows, fmt=fmt, title="Activities")
+
+            return run
+
+        # Rendering is slow enough at 10k rows that a warmup adds nothing.
+        runs = min(self.runs, RENDER_RUNS)
+        for fmt in ("table", "json"):
+            self.record(
+                f"render_{fmt}_{self.rows}",
+                measure(_render(fmt), runs, warmup=0),
+            )
+
+    def range_fanout(self) -> None:
+        args = ["body", "weighins", "--start", "2020-01-01", "--end", "2024-12-31"]
+        self.record(
+            "range_fanout_weighins_5y",
+            self.with_requests(
+                lambda: measure(lambda: self.run_command(args), self.runs)
+            ),
+        )
+
+    def paginate(self) -> None:
+        args = ["activities", "--limit", "1000"]
+        self.record(
+            "paginate_activities_1000",
+            self.with_requests(
+                lambda: measure(lambda: self.run_command(args), self.runs)
+            ),
+        )
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+    min_delta: float,
+) -> list[dict[str, Any]]:
+    """Scenarios whose median regressed beyond both limits."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        old, new = before["median_ms"], result["median_ms"]
+        if new > old * threshold and new - old > min_delta:
+            regressions.append(
+                {
+                    "scenario": name,
+                    "baseline_ms": old,
+                    "median_ms": new,
+                    "ratio": new / old if old else None,
+                }
+            )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join(__doc__.splitlines()[1:]),
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Write results JSON here.")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON.")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25, help="Allowed median ratio."
+    )
+    parser.add_argument(
+        "--min-delta", type=float, default=5.0, help="Ignore changes below this (ms)."
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per scenario.")
+    parser.add_argument(
+        "--latency", type=float, default=20.0, help="Server ms/request."
+    )
+    parser.add_argument("--jitter", type=float, default=5.0, help="Server +/- ms.")
+    parser.add_argument(
+        "--rate-429", type=float, default=0.0, help="Share of requests answered 429."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--cassette",
+        type=Path,
+        help="Serve responses recorded with gc --record ahead of the fixtures.",
+    )
+    parser.add_argument(
+        "--rows", type=int, default=RENDER_ROWS, help="Rows for render scenarios."
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="3 runs, 1000 render rows (smoke test)."
+    )
+    parser.add_argument(
+        "--only", action="append", help="Scenario groups to run (repeatable)."
+    )
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.runs, args.rows = 3, 1000
+
+    groups = ["cold_start", "commands", "render", "range_fanout", "paginate"]
+    selected = args.only or groups
+    unknown = set(selected) - set(groups)
+    if unknown:
+        parser.error(f"unknown scenario group(s): {', '.join(sorted(unknown))}")
+
+    fixtures = load_fixtures()
+    if args.cassette:
+        fixtures = load_cassette(args.cassette) + fixtures
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        StandinServer(
+            fixtures,
+            latency_ms=args.latency,
+            jitter_ms=args.jitter,
+            rate_429=args.rate_429,
+            seed=args.seed,
+        ) as server,
+    ):
+        token_dir = write_fake_tokens(Path(tmp) / "tokens")
+        os.environ["GARMINCLI_API_URL"] = server.url
+        # Keep the request log enabled (its cost is part of the hot path).
+        os.environ["GARMINCLI_STATS"] = str(Path(tmp) / "stats.log")
+        suite = Suite(server, token_dir, args.runs, args.rows)
+        for group in groups:
+            if group in selected:
+                getattr(suite, group)()
+
+    from garmincli import __version__
+
+    report: dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                "runs": args.runs,
+                "latency_ms": args.latency,
+                "jitter_ms": args.jitter,
+                "rate_429": args.rate_429,
+                "seed": args.seed,
+                "cassette": str(args.cassette) if args.cassette else None,
+                "rows": args.rows,
+            },
+        },
+        "results": suite.results,
+    }
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        report["regressions"] = compare(
+            suite.results, baseline, args.threshold, args.min_delta
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    for regression in report.get("regressions", []):
+        print(
+            f"REGRESSION {regression['scenario']}: "
+            f"{regression['baseline_ms']:.1f} -> {regression['median_ms']:.1f} ms",
+            file=sys.stderr,
+        )
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
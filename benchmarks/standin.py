@@ -0,0 +1,295 @@
+"""Local Garmin Connect stand-in server replaying JSON fixtures.
+
+Point gc at it with GARMINCLI_API_URL=http://127.0.0.1:PORT and a token
+store created by write_fake_tokens(). Fixtures are JSON files holding a
+list of entries:
+
+    {
+        "method": "GET",                 # optional, default GET
+        "path": "^/weight-service/...",  # regex matched against the path
+        "status": 200,                   # optional
+        "body": {...},                   # JSON response body
+        "paginate": {"total": 2000, "id_key": "activityId"}  # optional
+    }
+
+Paginated entries cycle the body list up to ``total`` items (renumbering
+``id_key``) and serve ``start``/``limit`` slices of it.
+
+Directories recorded with ``gc --record DIR`` can be served as well
+(load_cassette); recorded requests match on method, path and params.
+
+Run standalone with: python benchmarks/standin.py --port 8765 --latency 50
+"""
+
+import argparse
+import base64
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, parse_qsl, urlsplit
+
+from garmincli.transport import Cassette, REPLAY
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@dataclass
+class Fixture:
+    method: str
+    pattern: re.Pattern
+    status: int
+    body: Any
+    paginate: Optional[dict] = None
+    params: Optional[list] = None
+    encoded: bytes = field(default=b"", repr=False)
+    items: list = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.paginate:
+            template = self.body if isinstance(self.body, list) else [self.body]
+            id_key = self.paginate.get("id_key")
+            base = self.paginate.get("id_start", 10_000_000)
+            for i in range(self.paginate["total"]):
+                item = dict(template[i % len(template)])
+                if id_key:
+                    item[id_key] = base + i
+                self.items.append(item)
+        elif not self.encoded:
+            self.encoded = json.dumps(self.body).encode()
+
+    def render(self, query: dict[str, list[str]]) -> bytes:
+        if not self.paginate:
+            return self.encoded
+        start = int(query.get("start", ["0"])[0])
+        limit = int(query.get("limit", ["20"])[0])
+        return json.dumps(self.items[start : start + limit]).encode()
+
+
+def load_cassette(directory: Path) -> list[Fixture]:
+    """Fixtures for every request recorded with ``gc --record``.
+
+    Each key serves its last recorded response; transport errors are
+    skipped.
+    """
+    fixtures = []
+    for entry in Cassette(str(directory), REPLAY).entries():
+        key = entry["key"]
+        exchange = entry["exchanges"][-1]
+        if "error" in exchange:
+            continue
+        body = exchange["body"]
+        if exchange["encoding"] == "base64":
+            encoded = base64.b64decode(body)
+        else:
+            encoded = body.encode()
+        fixtures.append(
+            Fixture(
+                method=key["method"],
+                pattern=re.compile(f"^{re.escape(key['path'])}$"),
+                status=exchange["status"],
+                body=None,
+                params=[list(p) for p in key["params"]],
+                encoded=encoded,
+            )
+        )
+    return fixtures
+
+
+def load_fixtures(directory: Path = FIXTURES_DIR) -> list[Fixture]:
+    """Load every *.json fixture file in ``directory``, in name order."""
+    fixtures = []
+    for path in sorted(Path(directory).glob("*.json")):
+        for entry in json.loads(path.read_text()):
+            fixtures.append(
+                Fixture(
+                    method=entry.get("method", "GET").upper(),
+                    pattern=re.compile(entry["path"]),
+                    status=entry.get("status", 200),
+                    body=entry.get("body"),
+                    paginate=entry.get("paginate"),
+                )
+            )
+    return fixtures
+
+
+class StandinServer:
+    """Threaded HTTP server with configurable latency and 429 injection."""
+
+    def __init__(
+        self,
+        fixtures: Optional[list[Fixture]] = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_429: float = 0.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.fixtures = fixtures if fixtures is not None else load_fixtures()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.requests: Counter = Counter()
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.throttled = 0
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def match(self, method: str, path: str, query: str = "") -> Optional[Fixture]:
+        params = None
+        for fixture in self.fixtures:
+            if fixture.method != method or not fixture.pattern.search(path):
+                continue
+            if fixture.params is not None:
+                if params is None:
+                    params = sorted(parse_qsl(query, keep_blank_values=True))
+                if [list(p) for p in params] != fixture.params:
+                    continue
+            return fixture
+        return None
+
+    def _delay(self) -> tuple[float, bool]:
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+            throttle = self._random.random() < self.rate_429
+        return max(0.0, self.latency_ms + jitter) / 1000, throttle
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                parts = urlsplit(self.path)
+                delay, throttle = server._delay()
+                if delay:
+                    time.sleep(delay)
+                with server._lock:
+                    server.requests[parts.path] += 1
+                    server.throttled += throttle
+                if throttle:
+                    self._send(429, b'{"message": "Too Many Requests"}')
+                    return
+                fixture = server.match(self.command, parts.path, parts.query)
+                if fixture is None:
+                    self._send(404, b'{"message": "No fixture"}')
+                    return
+                self._send(fixture.status, fixture.render(parse_qs(parts.query)))
+
+            def _send(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def write_fake_tokens(token_dir: Path) -> Path:
+    """Create a token store whose tokens never expire, for the stand-in."""
+    token_dir.mkdir(parents=True, exist_ok=True)
+    far_future = int(time.time()) + 10 * 365 * 86400
+    (token_dir / "oauth1_token.json").write_text(
+        json.dumps(
+            {
+                "oauth_token": "standin",
+                "oauth_token_secret": "standin",
+                "domain": "garmin.com",
+            }
+        )
+    )
+    (token_dir / "oauth2_token.json").write_text(
+        json.dumps(
+            {
+                "scope": "standin",
+                "jti": "standin",
+                "token_type": "Bearer",
+                "access_token": "standin",
+                "refresh_token": "standin",
+                "expires_in": 3600,
+                "expires_at": far_future,
+                "refresh_token_expires_in": 7200,
+                "refresh_token_expires_at": far_future,
+            }
+        )
+    )
+    return token_dir
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    parser.add_argument(
+        "--cassette", type=Path, help="Also serve a gc --record directory."
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="ms per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- ms")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="0..1")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if args.cassette:
+        fixtures = load_cassette(args.cassette) + fixtures
+    server = StandinServer(
+        fixtures,
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        rate_429=args.rate_429,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Serving {len(server.fixtures)} fixtures on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
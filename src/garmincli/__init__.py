@@ -1,3 +1,16 @@
 """Garmin Connect CLI - Read health data from Garmin Connect."""
 
+from typing import Any
+
 __version__ = "0.1.0"
+
+__all__ = ["Client", "Record", "Records"]
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use so `gc` startup does not pay for the Python API.
+    if name in __all__:
+        from . import client
+
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
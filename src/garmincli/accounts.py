@@ -0,0 +1,167 @@
+"""Run one command for many accounts (token stores) in parallel."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from .errors import GarminCliError
+
+TOKEN_FILE = "oauth2_token.json"
+DEFAULT_ACCOUNT_WORKERS = 4
+
+
+def resolve_accounts(spec: str) -> list[tuple[str, Path]]:
+    """Resolve --accounts into (name, token_dir) pairs.
+
+    ``spec`` is either a directory whose subdirectories are token stores
+    (named after the subdirectory) or a comma-separated list of token
+    store paths (named after their last path component).
+    """
+    path = Path(spec).expanduser()
+    if "," not in spec and path.is_dir() and not (path / TOKEN_FILE).exists():
+        accounts = [
+            (child.name, child.resolve())
+            for child in sorted(path.iterdir())
+            if (child / TOKEN_FILE).exists()
+        ]
+    else:
+        accounts = [
+            (Path(item).name, Path(item).expanduser().resolve())
+            for item in (part.strip() for part in spec.split(","))
+            if item
+        ]
+    if not accounts:
+        raise GarminCliError(f"No token stores found in {spec}.")
+    return accounts
+
+
+def pop_option(
+    args: list[str], names: tuple[str, ...]
+) -> tuple[Optional[str], list[str]]:
+    """Remove an option and its value from ``args``; the last occurrence wins."""
+    value = None
+    rest: list[str] = []
+    it = iter(args)
+    for arg in it:
+        if arg in names:
+            value = next(it, None)
+        elif arg.startswith("--") and arg.split("=", 1)[0] in names:
+            value = arg.split("=", 1)[1]
+        else:
+            rest.append(arg)
+    return value, rest
+
+
+def _gc_command() -> list[str]:
+    if getattr(sys, "frozen", False):
+        return [sys.executable]
+    return [sys.executable, "-m", "garmincli"]
+
+
+def _run(cmd: list[str], env: dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, capture_output=True, text=True, env=env)
+
+
+def run_account(
+    name: str,
+    token_dir: Path,
+    args: list[str],
+    rate_limit: Optional[float] = None,
+    options: Sequence[str] = (),
+    cassette: Optional[tuple[str, str]] = None,
+) -> dict[str, Any]:
+    """Run ``gc <options> <args>`` for one account; its JSON result or error.
+
+    ``options`` are global options placed before the command. ``cassette``
+    is ``("--record" | "--replay", directory)``; each account gets its own
+    subdirectory, since their requests look alike. With ``--profile`` among
+    the options, the child's timing breakdown is returned as ``profile``.
+    """
+    env = dict(os.environ)
+    if rate_limit:
+        env["GARMIN_RATE_LIMIT"] = str(rate_limit)
+    options = list(options)
+    if cassette is not None:
+        flag, directory = cassette
+        options += [flag, str(Path(directory) / name)]
+    cmd = [
+        *_gc_command(),
+        *options,
+        *args,
+        "--tokenstore",
+        str(token_dir),
+        "--format",
+        "json",
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "result.json"
+        proc = _run([*cmd, "--output", str(out)], env)
+        if proc.returncode == 2 and "--output" in proc.stderr:
+            # Commands without --output print JSON to stdout instead.
+            proc = _run(cmd, env)
+            text = proc.stdout
+        else:
+            text = out.read_text() if out.exists() else ""
+
+    if proc.returncode != 0:
+        lines = [line for line in proc.stderr.splitlines() if line.strip()]
+        message = lines[-1] if lines else f"exit code {proc.returncode}"
+        return {"account": name, "error": message.removeprefix("Error: ")}
+    result: dict[str, Any] = {"account": name, "data": None}
+    if "--profile" in options:
+        result["profile"] = proc.stderr
+    if not text.strip():
+        return result
+    try:
+        result["data"] = json.loads(text)
+    except json.JSONDecodeError as e:
+        return {"account": name, "error": f"Invalid JSON output: {e}"}
+    return result
+
+
+def run_accounts(
+    accounts: list[tuple[str, Path]],
+    args: list[str],
+    workers: int = DEFAULT_ACCOUNT_WORKERS,
+    rate_limit: Optional[float] = None,
+    options: Sequence[str] = (),
+    cassette: Optional[tuple[str, str]] = None,
+) -> list[dict[str, Any]]:
+    """Run the command for every account concurrently, preserving order."""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(run_account, name, path, args, rate_limit, options, cassette)
+            for name, path in accounts
+        ]
+        return [f.result() for f in futures]
+
+
+def merge_account_results(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Flatten per-account results into rows with a leading account column."""
+    rows: list[dict[str, Any]] = []
+    for result in results:
+        name = result["account"]
+        if "error" in result:
+            rows.append({"account": name, "error": result["error"]})
+            continue
+        data = result["data"]
+        items = data if isinstance(data, list) else [data]
+        for item in items:
+            if isinstance(item, dict):
+                rows.append({"account": name, **item})
+            else:
+                rows.append({"account": name, "value": item})
+    return rows
+
+
+def union_columns(rows: list[dict[str, Any]]) -> list[str]:
+    """Column names across all rows, in first-seen order."""
+    columns: dict[str, None] = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return list(columns)
@@ -1,6 +1,12 @@
 """Garmin API wrapper with error handling."""
 
-from typing import Any, Callable
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Iterable, Optional
 
 from garminconnect import (
     GarminConnectAuthenticationError,
@@ -8,11 +14,96 @@ from garminconnect import (
     GarminConnectTooManyRequestsError,
 )
 
+from . import async_backend
+from .cache import MISSING, ResponseCache, cache_key
+from .dates import RANGE_LIMITS, plan_range
 from .errors import AuthenticationError, ConnectionError, GarminCliError, RateLimitError
+from .profiling import describe_args, get_profiler
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise GarminCliError("Rate limit must be greater than zero.")
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def reserve(self) -> float:
+        """Claim the next slot; returns how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        return max(wait, 0.0)
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def set_rate_limit(rate: Optional[float]) -> None:
+    """Limit API calls in this process to ``rate`` per second (None disables)."""
+    global _rate_limiter
+    _rate_limiter = RateLimiter(rate) if rate else None
+
+
+def get_rate_limit() -> Optional[float]:
+    """Current calls-per-second limit, or None when unlimited."""
+    return 1.0 / _rate_limiter.interval if _rate_limiter is not None else None
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def set_cache(cache: Optional[ResponseCache]) -> None:
+    """Serve repeated read-only calls in this process from ``cache``."""
+    global _cache
+    _cache = cache
+
+
+def get_cache() -> Optional[ResponseCache]:
+    return _cache
 
 
 def api_call(func: Callable, *args: Any, **kwargs: Any) -> Any:
     """Execute a Garmin API call with standardized error handling."""
+    profiler = get_profiler()
+    if profiler is None:
+        return _cached_call(func, args, kwargs)
+    name = _endpoint_name(func)
+    with profiler.span("api", name, args=describe_args(args, kwargs)) as span:
+        return _cached_call(func, args, kwargs, span)
+
+
+def _cached_call(
+    func: Callable, args: tuple, kwargs: dict, span: Optional[dict] = None
+) -> Any:
+    cache = _cache
+    key = cache_key(func, args, kwargs) if cache is not None else None
+    if key is None:
+        return _call(func, args, kwargs)
+
+    with cache.lock(key):
+        result = cache.get(key)
+        if span is not None:
+            span["cache"] = "miss" if result is MISSING else "hit"
+        if result is MISSING:
+            result = _call(func, args, kwargs)
+            cache.set(key, result)
+        return result
+
+
+def _call(func: Callable, args: tuple, kwargs: dict) -> Any:
+    # The asyncio backend spaces the requests themselves instead.
+    if _rate_limiter is not None and not async_backend.deferring():
+        _rate_limiter.acquire()
     try:
         return func(*args, **kwargs)
     except GarminConnectAuthenticationError as e:
@@ -27,3 +118,155 @@ def api_call(func: Callable, *args: Any, **kwargs: Any) -> Any:
         raise ConnectionError(f"Connection error: {e}") from e
     except Exception as e:
         raise GarminCliError(f"Unexpected error: {e}") from e
+
+
+DEFAULT_WORKERS = 4
+
+# Single-date endpoints behind the daily datasets of export, sync and Client.
+DAILY_DATASETS = {
+    "summary": "get_user_summary",
+    "sleep": "get_sleep_data",
+    "stress": "get_stress_data",
+    "hrv": "get_hrv_data",
+}
+
+
+def _run_concurrent(
+    calls: list[Callable[[], Any]], workers: int, func: Optional[Callable] = None
+) -> list[Any]:
+    """Results of ``calls`` in order; ``func`` is the endpoint they all call."""
+    if workers <= 1 or len(calls) <= 1:
+        return [call() for call in calls]
+    if func is not None and async_backend.drives(func):
+        return async_backend.run(calls, _rate_limiter)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda call: call(), calls))
+
+
+def api_map(
+    func: Callable, items: Iterable[Any], workers: int = DEFAULT_WORKERS
+) -> list[Any]:
+    """Call ``func(item)`` for every item concurrently, preserving input order."""
+    calls = [partial(api_call, func, item) for item in items]
+    return _run_concurrent(calls, workers, func)
+
+
+@dataclass(frozen=True)
+class RangeMerge:
+    """How to stitch chunked responses of a range endpoint back together."""
+
+    list_key: Optional[str] = None
+    id_key: Optional[str] = None
+    descending: bool = False
+    average_key: Optional[str] = None
+
+
+RANGE_MERGE = {
+    "get_daily_steps": RangeMerge(id_key="calendarDate"),
+    "get_body_composition": RangeMerge(
+        list_key="dateWeightList", id_key="samplePk", average_key="totalAverage"
+    ),
+    "get_weigh_ins": RangeMerge(
+        list_key="dailyWeightSummaries",
+        id_key="summaryDate",
+        descending=True,
+        average_key="totalAverage",
+    ),
+    "get_blood_pressure": RangeMerge(
+        list_key="measurementSummaries", id_key="startDate", descending=True
+    ),
+    "get_menstrual_calendar_data": RangeMerge(
+        list_key="cycleSummaries", id_key="startDate"
+    ),
+    "get_activities_by_date": RangeMerge(id_key="activityId", descending=True),
+    "get_device_solar_data": RangeMerge(
+        list_key="solarDailyDataDTOs", id_key="localConstantDate"
+    ),
+}
+
+
+def _endpoint_name(func: Callable) -> str:
+    return getattr(getattr(func, "func", func), "__name__", "")
+
+
+def _items(chunk: Any, key: Optional[str]) -> list:
+    if isinstance(chunk, list):
+        return chunk
+    if key and isinstance(chunk, dict) and isinstance(chunk.get(key), list):
+        return chunk[key]
+    return []
+
+
+def _average(items: list[dict], template: dict) -> dict:
+    """Recompute numeric averages over the merged items for the template keys."""
+    result = dict(template)
+    for key, value in template.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        values = [
+            item[key]
+            for item in items
+            if isinstance(item.get(key), (int, float))
+            and not isinstance(item.get(key), bool)
+        ]
+        result[key] = sum(values) / len(values) if values else None
+    return result
+
+
+def merge_range_chunks(chunks: list[Any], merge: RangeMerge) -> Any:
+    """Merge ascending chunk responses into one response, dropping duplicates."""
+    ordered = list(reversed(chunks)) if merge.descending else chunks
+    seen: set = set()
+    items = []
+    for chunk in ordered:
+        for item in _items(chunk, merge.list_key):
+            if merge.id_key and isinstance(item, dict) and item.get(merge.id_key):
+                key = item[merge.id_key]
+            else:
+                key = json.dumps(item, sort_keys=True, default=str)
+            if key in seen:
+                continue
+            seen.add(key)
+            items.append(item)
+
+    dicts = [chunk for chunk in chunks if isinstance(chunk, dict)]
+    if merge.list_key is None or not dicts:
+        return items
+
+    # Scalars from the outermost chunks describe the full range.
+    merged = {**dicts[-1], **{k: v for k, v in dicts[0].items() if "previous" in k}}
+    for key in ("startDate", "from"):
+        if key in dicts[0]:
+            merged[key] = dicts[0][key]
+    merged[merge.list_key] = items
+    if merge.average_key and isinstance(merged.get(merge.average_key), dict):
+        merged[merge.average_key] = _average(items, merged[merge.average_key])
+    return merged
+
+
+def api_range_call(
+    func: Callable,
+    start: str,
+    end: Optional[str],
+    *args: Any,
+    workers: int = DEFAULT_WORKERS,
+    **kwargs: Any,
+) -> Any:
+    """Call a start/end range endpoint, splitting long ranges into windows.
+
+    Windows follow the endpoint's limit in ``RANGE_LIMITS``; chunks run
+    concurrently and are merged in order via ``RANGE_MERGE``. Short ranges
+    and single-date calls go straight through ``api_call``.
+    """
+    name = _endpoint_name(func)
+    max_days = RANGE_LIMITS.get(name)
+    if end is None or max_days is None:
+        return api_call(func, start, end, *args, **kwargs)
+
+    chunks = plan_range(start, end, max_days)
+    if len(chunks) == 1:
+        return api_call(func, start, end, *args, **kwargs)
+
+    calls = [partial(api_call, func, s, e, *args, **kwargs) for s, e in chunks]
+    results = _run_concurrent(calls, workers, func)
+    return merge_range_chunks(results, RANGE_MERGE.get(name, RangeMerge()))
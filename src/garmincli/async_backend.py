@@ -0,0 +1,237 @@
+"""Optional asyncio engine for concurrent API calls on a single thread.
+
+The commands stay synchronous: ``api_map`` and ``api_range_call`` hand their
+calls to ``run``, which drives each one as a task. A call runs through the
+usual ``api_call`` -> garminconnect -> garth stack; when it reaches the
+network, the ``DeferredAdapter`` mounted on the garth session raises
+``Deferred`` with the prepared request (OAuth header included) instead of
+blocking. The task fetches it with httpx under a semaphore, then runs the
+call again, and this time the adapter answers with the fetched response.
+Running the Python side twice costs microseconds; the requests themselves
+are all in flight at once on one thread.
+"""
+
+import asyncio
+import contextvars
+import email.utils
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from .errors import GarminCliError
+from .transport import (
+    RedirectAdapter,
+    build_response,
+    get_cassette,
+    key_digest,
+    request_key,
+)
+
+DEFAULT_ASYNC_LIMIT = 64
+# Token exchanges stay synchronous: they are rare and garth signs them itself.
+SYNC_PATHS = ("/oauth-service/",)
+# Decoded by httpx already, so these would describe the wrong body.
+_DROP_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+_limit: Optional[int] = None
+
+# Responses fetched for the call a task is running; None outside ``run``.
+_responses: contextvars.ContextVar[Optional[dict[str, Any]]] = contextvars.ContextVar(
+    "garmincli_async_responses", default=None
+)
+
+
+def _httpx() -> Any:
+    try:
+        import httpx
+    except ImportError as e:
+        raise GarminCliError(
+            "The asyncio backend needs httpx: pip install 'garmin-cli[async]'"
+        ) from e
+    return httpx
+
+
+def set_async_limit(limit: Optional[int]) -> None:
+    """Run concurrent calls on the asyncio engine, ``limit`` requests in flight.
+
+    Applies to clients loaded from now on; None switches back to threads.
+    """
+    global _limit
+    if limit is not None:
+        if limit < 1:
+            raise GarminCliError("--async-requests must be at least 1.")
+        _httpx()
+    _limit = limit
+
+
+def async_limit() -> Optional[int]:
+    return _limit
+
+
+def deferring() -> bool:
+    """Whether the current call is being driven by the engine."""
+    return _responses.get() is not None
+
+
+def available() -> bool:
+    """Enabled, and not already inside an event loop (e.g. Jupyter)."""
+    if _limit is None:
+        return False
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return True
+    return False
+
+
+def _session(func: Callable) -> Any:
+    """The requests session behind a Garmin or garth method, if any."""
+    while callable(getattr(func, "func", None)):  # partials
+        func = func.func
+    owner = getattr(func, "__self__", None)
+    return getattr(getattr(owner, "garth", owner), "sess", None)
+
+
+def drives(func: Callable) -> bool:
+    """Whether calls of ``func`` can run on the engine.
+
+    Only sessions with a ``DeferredAdapter`` mounted hand their requests
+    over; anything else (a client loaded before the engine was enabled, one
+    passed in by the caller, a cassette) would block the event loop, so it
+    stays on threads.
+    """
+    if not available() or get_cassette() is not None:
+        return False
+    session = _session(func)
+    if session is None:
+        return False
+    adapter = session.get_adapter("https://connectapi.garmin.com/")
+    return isinstance(adapter, DeferredAdapter)
+
+
+class Deferred(BaseException):
+    """Unwinds a call that needs a network response.
+
+    A BaseException, so the ``except Exception`` error mapping on the way up
+    (garminconnect, ``api_call``) lets it through untouched.
+    """
+
+    suspends_call = True  # keeps the first, partial run out of --profile
+
+    def __init__(self, request: requests.PreparedRequest, timeout: Any, retry: Any):
+        super().__init__(request.url)
+        self.request = request
+        self.timeout = timeout
+        self.retry = retry
+
+
+class DeferredAdapter(RedirectAdapter):
+    """Defers requests made under ``run`` and serves their responses."""
+
+    def send(self, request: Any, **kwargs: Any) -> Any:
+        responses = _responses.get()
+        if responses is None or urlsplit(request.url).path.startswith(SYNC_PATHS):
+            return super().send(request, **kwargs)
+        self.redirect(request)
+        digest = key_digest(request_key(request.method, request.url, request.body))
+        if digest not in responses:
+            raise Deferred(request, kwargs.get("timeout"), self.max_retries)
+        result = responses[digest]
+        if isinstance(result, Exception):
+            raise result
+        return build_response(request, *result)
+
+
+def _timeout(httpx: Any, timeout: Any) -> Any:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _backoff(retry: Any, attempt: int, headers: Any) -> float:
+    """urllib3's delay: Retry-After when given, else exponential backoff."""
+    after = headers.get("retry-after")
+    if after:
+        if after.isdigit():
+            return float(after)
+        moment = email.utils.parsedate_tz(after)
+        if moment is not None:
+            return max(0.0, email.utils.mktime_tz(moment) - time.time())
+    return min(retry.backoff_factor * 2 ** (attempt - 1), 120.0)
+
+
+async def _fetch(
+    http: Any, semaphore: asyncio.Semaphore, deferred: Deferred, limiter: Any
+) -> Any:
+    """(status, reason, headers, body) for a deferred request, or the error.
+
+    Retries follow the adapter's urllib3 ``Retry`` (garth's policy).
+    """
+    httpx = _httpx()
+    request, retry = deferred.request, deferred.retry
+    statuses = retry.status_forcelist or ()
+    attempt = 0
+    while True:
+        async with semaphore:
+            if limiter is not None:
+                await asyncio.sleep(limiter.reserve())
+            try:
+                response = await http.request(
+                    request.method,
+                    request.url,
+                    headers=dict(request.headers),
+                    content=request.body,
+                    timeout=_timeout(httpx, deferred.timeout),
+                )
+            except httpx.TimeoutException as e:
+                return requests.Timeout(str(e), request=request)
+            except httpx.HTTPError as e:
+                return requests.ConnectionError(str(e), request=request)
+        if response.status_code in statuses and attempt < (retry.total or 0):
+            attempt += 1
+            await asyncio.sleep(_backoff(retry, attempt, response.headers))
+            continue
+        headers = {
+            k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS
+        }
+        return response.status_code, response.reason_phrase, headers, response.content
+
+
+async def _drive(
+    call: Callable[[], Any], http: Any, semaphore: asyncio.Semaphore, limiter: Any
+) -> Any:
+    responses: dict[str, Any] = {}
+    while True:
+        token = _responses.set(responses)
+        try:
+            return call()
+        except Deferred as deferred:
+            pending = deferred
+        finally:
+            _responses.reset(token)
+        request = pending.request
+        digest = key_digest(request_key(request.method, request.url, request.body))
+        responses[digest] = await _fetch(http, semaphore, pending, limiter)
+
+
+async def _run(calls: list[Callable[[], Any]], limiter: Any) -> list[Any]:
+    httpx = _httpx()
+    limit = _limit or DEFAULT_ASYNC_LIMIT
+    semaphore = asyncio.Semaphore(limit)
+    limits = httpx.Limits(max_connections=limit, max_keepalive_connections=limit)
+    async with httpx.AsyncClient(limits=limits) as http:
+        return await asyncio.gather(
+            *(_drive(call, http, semaphore, limiter) for call in calls)
+        )
+
+
+def run(calls: list[Callable[[], Any]], limiter: Any = None) -> list[Any]:
+    """Results of ``calls`` in order, fetched concurrently on this thread.
+
+    ``limiter`` is the process ``RateLimiter``; it spaces the requests
+    themselves rather than the calls.
+    """
+    return asyncio.run(_run(calls, limiter))
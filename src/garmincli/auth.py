@@ -1,13 +1,38 @@
 """Authentication and token management."""
 
+import json
 import os
 import shutil
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional
 
 from garminconnect import Garmin
+from garth.auth_tokens import OAuth2Token
+from garth.utils import asdict
 
 from .errors import AuthenticationError
+from .output import atomic_write
+from .profiling import get_profiler
+from .transport import install_transport, replaying
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+OAUTH1_FILE = "oauth1_token.json"
+OAUTH2_FILE = "oauth2_token.json"
+LOCK_FILE = ".lock"
+
+# Refresh OAuth2 tokens this many seconds before they actually expire.
+REFRESH_MARGIN = 300
+
+# Clients loaded in this process, shared by every command run in it.
+_clients: dict[Path, Garmin] = {}
+_clients_lock = threading.Lock()
 
 
 def get_token_dir(tokenstore: Optional[str] = None) -> Path:
@@ -28,6 +53,72 @@ def get_token_dir(tokenstore: Optional[str] = None) -> Path:
     return Path.home() / ".config" / "garmin-cli" / "tokens"
 
 
+@contextmanager
+def token_lock(token_dir: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a token directory across processes."""
+    token_dir.mkdir(parents=True, exist_ok=True)
+    with open(token_dir / LOCK_FILE, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _write_token(path: Path, data: Any) -> None:
+    # Owner-only and synced: the tokens are credentials and must survive a crash.
+    atomic_write(path, json.dumps(data, indent=4).encode(), mode=0o600, sync=True)
+
+
+def dump_tokens(garth_client: Any, token_dir: Path) -> None:
+    """Write tokens via temp file + rename so readers never see partial files."""
+    token_dir.mkdir(parents=True, exist_ok=True)
+    if garth_client.oauth1_token:
+        _write_token(token_dir / OAUTH1_FILE, asdict(garth_client.oauth1_token))
+    if garth_client.oauth2_token:
+        _write_token(token_dir / OAUTH2_FILE, asdict(garth_client.oauth2_token))
+
+
+def _read_oauth2(token_dir: Path) -> Optional[OAuth2Token]:
+    try:
+        with open(token_dir / OAUTH2_FILE) as f:
+            return OAuth2Token(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _expiring(token: Any) -> bool:
+    if not isinstance(token, OAuth2Token):
+        return True
+    return token.expires_at - REFRESH_MARGIN < time.time()
+
+
+def _install_refresh_hook(garth_client: Any, token_dir: Path) -> None:
+    """Make OAuth2 refreshes lock-protected and persisted for other processes.
+
+    Before exchanging, the hook re-reads the token file: if another process
+    has already refreshed, its token is reused without a network exchange.
+    When replaying a cassette the token is left as it is: recorded responses
+    do not depend on it, and the exchange would need the network.
+    """
+    exchange = garth_client.refresh_oauth2
+
+    def refresh_oauth2() -> None:
+        if replaying():
+            return
+        with token_lock(token_dir):
+            fresh = _read_oauth2(token_dir)
+            if fresh is not None and not _expiring(fresh):
+                garth_client.oauth2_token = fresh
+                return
+            exchange()
+            dump_tokens(garth_client, token_dir)
+
+    garth_client.refresh_oauth2 = refresh_oauth2
+
+
 def login(
     email: str,
     password: str,
@@ -58,21 +149,54 @@ def login(
         raise AuthenticationError(str(e)) from e
 
     # Save tokens
-    token_dir.mkdir(parents=True, exist_ok=True)
-    client.garth.dump(str(token_dir))
+    with token_lock(token_dir):
+        dump_tokens(client.garth, token_dir)
 
     return client
 
 
 def load_client(tokenstore: Optional[str] = None) -> Garmin:
-    """Load a Garmin client from saved tokens."""
+    """Load a Garmin client from saved tokens.
+
+    Clients are reused within a process, so commands run together (e.g. by
+    'gc batch') share one session and connection pool per token store.
+    """
     token_dir = get_token_dir(tokenstore)
+    profiler = get_profiler()
+    if profiler is None:
+        return _shared_client(token_dir)
+    with profiler.span("auth", "load_client", tokenstore=str(token_dir)):
+        client = _shared_client(token_dir)
+    profiler.attach(client.garth.sess)
+    return client
+
+
+def _shared_client(token_dir: Path) -> Garmin:
+    with _clients_lock:
+        client = _clients.get(token_dir)
+        if client is None:
+            client = _clients[token_dir] = _load_client(token_dir)
+    return client
+
 
+def _load_client(token_dir: Path) -> Garmin:
     if not token_dir.exists():
         raise AuthenticationError("Not logged in. Run 'gc login' first.")
 
     client = Garmin()
+    install_transport(client.garth)
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.attach(client.garth.sess)
+    _install_refresh_hook(client.garth, token_dir)
     try:
+        if (
+            not replaying()
+            and _expiring(_read_oauth2(token_dir))
+            and (token_dir / OAUTH1_FILE).exists()
+        ):
+            client.garth.load(str(token_dir))
+            client.garth.refresh_oauth2()
         client.login(tokenstore=str(token_dir))
     except FileNotFoundError:
         raise AuthenticationError("Token files not found. Run 'gc login' first.")
@@ -85,5 +209,7 @@ def load_client(tokenstore: Optional[str] = None) -> Garmin:
 def logout(tokenstore: Optional[str] = None) -> None:
     """Remove saved tokens."""
     token_dir = get_token_dir(tokenstore)
+    with _clients_lock:
+        _clients.pop(token_dir, None)
     if token_dir.exists():
         shutil.rmtree(token_dir)
@@ -0,0 +1,72 @@
+"""In-process response cache for read-only API calls."""
+
+import copy
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+# Only calls whose name starts with one of these are cacheable; everything
+# else (create/update/delete/upload/download) always hits the API.
+CACHEABLE_PREFIXES = ("get_", "count_")
+
+MISSING = object()
+
+
+def cache_key(func: Callable, args: tuple, kwargs: dict) -> Optional[Hashable]:
+    """Build a cache key for an API call, or None if it must not be cached."""
+    target = getattr(func, "func", func)
+    name = getattr(target, "__name__", "")
+    if not name.startswith(CACHEABLE_PREFIXES):
+        return None
+    if hasattr(func, "args"):  # functools.partial
+        args = (*func.args, *args)
+    owner = id(getattr(target, "__self__", None))
+    try:
+        key = (owner, name, args, tuple(sorted(kwargs.items())))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class ResponseCache:
+    """Thread-safe TTL cache keyed by endpoint and arguments."""
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+
+    def lock(self, key: Hashable) -> threading.Lock:
+        """Per-key lock so concurrent identical calls fetch only once."""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: Hashable) -> Any:
+        """Return a copy of the cached value, or ``MISSING``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
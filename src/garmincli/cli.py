@@ -1,13 +1,30 @@
 """Main Typer application and global options."""
 
+from typing import Optional
+
+import click
 import typer
+from typer.core import TyperGroup
 
+from .accounts import (
+    DEFAULT_ACCOUNT_WORKERS,
+    merge_account_results,
+    pop_option,
+    resolve_accounts,
+    run_accounts,
+    union_columns,
+)
+from .api import set_rate_limit
+from .async_backend import set_async_limit
 from .commands import (
     activities,
     api,
     auth,
+    batch,
     body,
     devices,
+    export,
+    exporter,
     gear,
     goals,
     health,
@@ -15,23 +32,176 @@ from .commands import (
     hydration,
     menstrual,
     metrics,
+    query,
     sleep,
+    stats,
     stress,
+    sync,
     vitals,
+    watch,
     workouts,
 )
+from .errors import GarminCliError
+from .output import print_error, print_profile, render, set_compact_json
+from .profiling import enable_profiling
+from .projection import Projection, set_projection
+from .stats import enable_stats_log
+from .transport import RECORD, REPLAY, Cassette, set_cassette
+
+
+class _RootGroup(TyperGroup):
+    """Root group that keeps the raw subcommand arguments for --accounts."""
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[Optional[str], Optional[click.Command], list[str]]:
+        # Called with the subcommand and its arguments before the group
+        # callback runs, which is where --accounts needs them.
+        ctx.meta["gc.subcommand_args"] = list(args)
+        return super().resolve_command(ctx, args)
+
 
 app = typer.Typer(
     name="gc",
+    cls=_RootGroup,
     help="CLI to read health data from Garmin Connect.",
     no_args_is_help=True,
     pretty_exceptions_enable=False,
 )
 
 
+def _run_for_accounts(
+    ctx: typer.Context,
+    spec: str,
+    workers: int,
+    rate_limit: Optional[float],
+    options: list[str],
+    cassette: Optional[tuple[str, str]],
+) -> None:
+    fmt, args = pop_option(ctx.meta.get("gc.subcommand_args", []), ("--format", "-f"))
+    output, args = pop_option(args, ("--output", "-o"))
+    _, args = pop_option(args, ("--tokenstore",))
+    try:
+        accounts = resolve_accounts(spec)
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+    results = run_accounts(
+        accounts,
+        args,
+        workers=workers,
+        rate_limit=rate_limit,
+        options=options,
+        cassette=cassette,
+    )
+    for result in results:
+        if result.get("profile"):
+            typer.echo(f"== {result['account']} ==\n{result['profile']}", err=True)
+    rows = merge_account_results(results)
+    # Each account already applied --fields/--where; doing it again here
+    # would drop the account column.
+    set_projection(None)
+    try:
+        if fmt and fmt != "table":
+            render(rows, fmt=fmt, output=output)
+        else:
+            render(rows, columns=union_columns(rows), title="Accounts", output=output)
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+    failed = sum(1 for r in results if "error" in r)
+    raise typer.Exit(1 if failed == len(results) else 0)
+
+
 @app.callback()
-def main() -> None:
+def main(
+    ctx: typer.Context,
+    accounts: Optional[str] = typer.Option(
+        None,
+        "--accounts",
+        help="Run the command for each token store in a directory or comma list.",
+    ),
+    account_workers: int = typer.Option(
+        DEFAULT_ACCOUNT_WORKERS,
+        "--account-workers",
+        help="Accounts to query in parallel.",
+    ),
+    rate_limit: Optional[float] = typer.Option(
+        None,
+        "--rate-limit",
+        envvar="GARMIN_RATE_LIMIT",
+        help="Max API calls per second (per account).",
+    ),
+    async_requests: Optional[int] = typer.Option(
+        None,
+        "--async-requests",
+        envvar="GARMINCLI_ASYNC",
+        help="Fetch concurrent calls on one asyncio thread, N requests in flight.",
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Print timing breakdown to stderr at exit."
+    ),
+    profile_output: Optional[str] = typer.Option(
+        None, "--profile-output", help="Write the timing breakdown as JSON."
+    ),
+    record: Optional[str] = typer.Option(
+        None,
+        "--record",
+        envvar="GARMINCLI_RECORD",
+        help="Record all Garmin HTTP traffic to this directory.",
+    ),
+    replay: Optional[str] = typer.Option(
+        None,
+        "--replay",
+        envvar="GARMINCLI_REPLAY",
+        help="Serve Garmin responses from a --record directory, offline.",
+    ),
+    compact: bool = typer.Option(
+        False, "--compact", help="Print JSON on one line (for pipes and jq)."
+    ),
+    fields: Optional[list[str]] = typer.Option(
+        None,
+        "--fields",
+        help="Keep only these comma-separated dotted paths in the output.",
+    ),
+    where: Optional[list[str]] = typer.Option(
+        None,
+        "--where",
+        help="Keep list items matching e.g. 'distance > 5000' (repeatable).",
+    ),
+) -> None:
     """Garmin Connect CLI."""
+    enable_stats_log()
+    if profile or profile_output:
+        profiler = enable_profiling()
+        ctx.call_on_close(lambda: print_profile(profiler.report(), profile_output))
+    try:
+        if rate_limit is not None:
+            set_rate_limit(rate_limit)
+        if async_requests is not None:
+            set_async_limit(async_requests)
+        if record and replay:
+            raise GarminCliError("--record and --replay cannot be combined.")
+        if (record or replay) and not accounts:  # each account gets its own
+            set_cassette(Cassette(record or replay, RECORD if record else REPLAY))
+        set_projection(Projection(fields, where) if fields or where else None)
+        set_compact_json(compact)
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+    if accounts:
+        options = ["--profile"] if profile else []
+        options += [arg for spec in fields or [] for arg in ("--fields", spec)]
+        options += [arg for expr in where or [] for arg in ("--where", expr)]
+        if compact:
+            options.append("--compact")
+        if async_requests is not None:
+            options += ["--async-requests", str(async_requests)]
+        cassette = ("--record", record) if record else None
+        if replay:
+            cassette = ("--replay", replay)
+        _run_for_accounts(ctx, accounts, account_workers, rate_limit, options, cassette)
 
 
 # Register command groups
@@ -80,3 +250,10 @@ app.add_typer(
 
 app.add_typer(menstrual.app, name="menstrual", help="Menstrual cycle data.")
 app.add_typer(api.app, name="api", help="Raw Garmin Connect API calls.")
+app.command("sync")(sync.sync)
+app.command("batch")(batch.batch)
+app.command("query")(query.query)
+app.command("stats")(stats.stats)
+app.command("export")(export.export)
+app.command("exporter")(exporter.exporter)
+app.command("watch")(watch.watch)
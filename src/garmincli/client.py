@@ -0,0 +1,303 @@
+"""Python API over the same call pipeline as the `gc` commands.
+
+    >>> from garmincli import Client
+    >>> gc = Client()
+    >>> sleep = gc.daily("sleep", "2024-01-01", "2024-12-31")
+    >>> sleep[0].dailySleepDTO.sleepTimeSeconds
+    >>> gc.activities("ytd").to_dataframe()
+
+Calls go through ``api_call``, so they share the CLI's error handling, rate
+limiter, response cache and profiler; long ranges are split with the range
+planner and fetched concurrently.
+"""
+
+import math
+from collections.abc import Mapping, Sequence
+from datetime import date, timedelta
+from functools import partial
+from typing import Any, Callable, Iterator, Optional, Union, overload
+
+import typer
+
+from .api import (
+    DAILY_DATASETS,
+    DEFAULT_WORKERS,
+    api_call,
+    api_map,
+    api_range_call,
+    get_cache,
+    get_rate_limit,
+    set_cache,
+    set_rate_limit,
+)
+from .async_backend import async_limit, set_async_limit
+from .auth import load_client
+from .cache import CACHEABLE_PREFIXES, ResponseCache
+from .dates import RANGE_LIMITS, fmt, parse_date, resolve_range
+from .errors import GarminCliError
+from .tabular import flatten, table_rows, to_arrow, union_keys
+
+DateLike = Union[str, date]
+
+DEFAULT_CACHE_TTL = 300.0
+
+
+def _pandas() -> Any:
+    try:
+        import pandas
+    except ImportError as e:
+        raise GarminCliError(
+            "DataFrames need pandas: pip install 'garmin-cli[pandas]'"
+        ) from e
+    return pandas
+
+
+def _wrap(value: Any) -> Any:
+    if isinstance(value, dict):
+        return Record(value)
+    if isinstance(value, list) and value and isinstance(value[0], dict):
+        return Records(value)
+    return value
+
+
+class Record(Mapping):
+    """Read-only view of one payload; keys are also attributes.
+
+    Nested objects are wrapped only when accessed.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return _wrap(self._data[key])
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"Record({self._data!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        return self._data
+
+
+class Records(Sequence):
+    """The records of a response, wrapped in ``Record`` only when accessed."""
+
+    def __init__(self, data: Any) -> None:
+        self.raw = data
+        self._rows: Optional[list[dict[str, Any]]] = None
+
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        """The plain record dicts (see ``tabular.table_rows``)."""
+        if self._rows is None:
+            self._rows = table_rows(self.raw)
+        return self._rows
+
+    @overload
+    def __getitem__(self, index: int) -> Record: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "Records": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return Records(self.rows[index])
+        return Record(self.rows[index])
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        return f"<Records: {len(self)}>"
+
+    def to_list(self) -> list[dict[str, Any]]:
+        return self.rows
+
+    def to_dataframe(self) -> Any:
+        """pandas DataFrame with one column per flattened (dotted) field."""
+        pandas = _pandas()
+        rows = [flatten(row) for row in self.rows]
+        return pandas.DataFrame.from_records(rows, columns=union_keys(rows))
+
+    def to_arrow(self) -> Any:
+        """pyarrow Table, typed the same way as ``--format parquet``."""
+        return to_arrow(self.rows)
+
+
+def _each_day(start: str, end: str) -> list[str]:
+    first, last = parse_date(start), parse_date(end)
+    if first > last:
+        raise GarminCliError(f"Start date {start} is after end date {end}.")
+    return [fmt(first + timedelta(days=i)) for i in range((last - first).days + 1)]
+
+
+def _dates(start: DateLike, end: Optional[DateLike]) -> tuple[str, Optional[str]]:
+    """Dates, date strings or shortcuts (``ytd``, ``last-90d``) as strings.
+
+    A range given as ``end`` ends on its last day (``"2024-03"`` on the 31st).
+    """
+    try:
+        if end is not None:
+            first = start if isinstance(start, date) else resolve_range(start).start
+            if isinstance(end, date):
+                return fmt(first), fmt(end)
+            last = resolve_range(end)
+            return fmt(first), fmt(last.end or last.start)
+        if isinstance(start, date):
+            return fmt(start), None
+        return resolve_range(start).as_strings()
+    except typer.BadParameter as e:
+        raise GarminCliError(e.format_message()) from e
+
+
+def _conflict(name: str, current: Any, wanted: Any) -> None:
+    raise GarminCliError(
+        f"{name} is process-wide and already {current}; every Client in the"
+        f" process must use the same value (got {wanted})."
+    )
+
+
+class Client:
+    """Garmin Connect from Python, without spawning `gc`.
+
+    ``tokenstore`` is the directory written by `gc login`. Responses of
+    read-only calls are cached for ``cache_ttl`` seconds (``None`` keeps them
+    for the life of the process, ``0`` disables the cache). ``rate_limit``
+    caps calls per second, like `gc --rate-limit`. ``async_requests`` fetches
+    concurrent calls on one asyncio thread with that many in flight, like
+    `gc --async-requests`.
+
+    The cache, rate limit and async setting are process-wide, shared by every
+    ``Client`` and by commands run in the process; ``rate_limit`` and
+    ``async_requests`` left as None keep the current setting. A client asking
+    for a different value than the one in effect raises ``GarminCliError``.
+
+    Any read-only method of ``garminconnect.Garmin`` is available as an
+    attribute (``gc.get_stats("2024-05-01")``); range endpoints listed in
+    ``RANGE_LIMITS`` are split into windows automatically.
+    """
+
+    def __init__(
+        self,
+        tokenstore: Optional[str] = None,
+        *,
+        cache_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        rate_limit: Optional[float] = None,
+        workers: int = DEFAULT_WORKERS,
+        async_requests: Optional[int] = None,
+        garmin: Any = None,
+    ) -> None:
+        self.tokenstore = tokenstore
+        self.workers = workers
+        self._garmin = garmin
+        cache, rate, limit = get_cache(), get_rate_limit(), async_limit()
+        if cache is not None and cache.ttl != cache_ttl:
+            _conflict("cache_ttl", cache.ttl, cache_ttl)
+        if rate is not None and rate_limit is not None:
+            if not math.isclose(rate, rate_limit):
+                _conflict("rate_limit", rate, rate_limit)
+        if limit is not None and async_requests not in (None, limit):
+            _conflict("async_requests", limit, async_requests)
+        if cache is None and cache_ttl != 0:
+            set_cache(ResponseCache(ttl=cache_ttl))
+        if rate is None and rate_limit is not None:
+            set_rate_limit(rate_limit)
+        if limit is None and async_requests is not None:
+            set_async_limit(async_requests)
+
+    @property
+    def garmin(self) -> Any:
+        """The underlying ``garminconnect.Garmin`` client (loaded on first use)."""
+        if self._garmin is None:
+            self._garmin = load_client(tokenstore=self.tokenstore)
+        return self._garmin
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if not name.startswith(CACHEABLE_PREFIXES):
+            raise AttributeError(name)
+        method = getattr(self.garmin, name)
+        if name in RANGE_LIMITS:
+            return partial(api_range_call, method, workers=self.workers)
+        return partial(api_call, method)
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call any ``garminconnect.Garmin`` method through ``api_call``."""
+        return api_call(getattr(self.garmin, method), *args, **kwargs)
+
+    def records(self, method: str, *args: Any, **kwargs: Any) -> Records:
+        """``call`` with the response wrapped as ``Records``."""
+        return Records(self.call(method, *args, **kwargs))
+
+    def daily(
+        self, dataset: str, start: DateLike, end: Optional[DateLike] = None
+    ) -> Records:
+        """One record per day of a daily endpoint, fetched concurrently.
+
+        ``dataset`` is ``summary``, ``sleep``, ``stress``, ``hrv`` or the name
+        of a single-date ``Garmin`` method such as ``get_steps_data``. Each
+        record gets a ``calendarDate``; days without data are left out.
+        """
+        name = DAILY_DATASETS.get(dataset, dataset)
+        if not hasattr(self.garmin, name):
+            raise GarminCliError(
+                f"Unknown dataset '{dataset}'. Use {', '.join(DAILY_DATASETS)}"
+                " or a Garmin method name."
+            )
+        first, last = _dates(start, end)
+        days = _each_day(first, last or first)
+        payloads = api_map(getattr(self.garmin, name), days, workers=self.workers)
+        return Records(
+            [
+                {"calendarDate": day, **payload}
+                if isinstance(payload, dict)
+                else {"calendarDate": day, "value": payload}
+                for day, payload in zip(days, payloads)
+                if payload
+            ]
+        )
+
+    def activities(
+        self,
+        start: DateLike,
+        end: Optional[DateLike] = None,
+        activity_type: Optional[str] = None,
+    ) -> Records:
+        """Activities between two dates (or within a shortcut such as ``ytd``)."""
+        first, last = _dates(start, end)
+        return Records(
+            api_range_call(
+                self.garmin.get_activities_by_date,
+                first,
+                last or first,
+                activity_type,
+                workers=self.workers,
+            )
+        )
+
+    def weigh_ins(self, start: DateLike, end: Optional[DateLike] = None) -> Records:
+        """Individual weigh-ins between two dates."""
+        first, last = _dates(start, end)
+        data = api_range_call(
+            self.garmin.get_weigh_ins, first, last or first, workers=self.workers
+        )
+        return Records(
+            [
+                sample
+                for summary in (data or {}).get("dailyWeightSummaries") or []
+                for sample in summary.get("allWeightMetrics") or []
+            ]
+        )
@@ -1,14 +1,21 @@
 """Activities commands."""
 
-from typing import Optional
+import json
+import os
+import re
+from pathlib import Path
+from typing import Iterator, Optional
 
 import typer
 
-from ..api import api_call
+from .. import heatmap as heatmap_tiles
+from .. import tracks
+from ..api import DEFAULT_WORKERS, api_call, api_map, api_range_call
 from ..auth import load_client
-from ..dates import resolve_date
+from ..dates import resolve_bounds, resolve_date
 from ..errors import GarminCliError
-from ..output import print_error, print_success, render
+from ..output import atomic_write, print_error, print_success, render
+from ..store import SEARCH_COLUMNS, ZONE_PERIODS, Store
 
 app = typer.Typer(no_args_is_help=True, invoke_without_command=True)
 
@@ -52,7 +59,9 @@ def activities_cmd(
             cdate, end_date = resolve_date(date_str=date)
             data = api_call(client.get_activities_fordate, cdate)
         elif start and end:
-            data = api_call(client.get_activities_by_date, start, end, activity_type)
+            data = api_range_call(
+                client.get_activities_by_date, start, end, activity_type
+            )
         else:
             data = api_call(client.get_activities, offset, limit, activity_type)
 
@@ -252,6 +261,94 @@ def power_zones(
         raise typer.Exit(1)
 
 
+ZONE_BATCH = 100
+ZONE_KINDS = {
+    "hr": "get_activity_hr_in_timezones",
+    "power": "get_activity_power_in_timezones",
+}
+
+
+def pivot_zone_totals(rows: list, percent: bool = False) -> list[dict]:
+    """One row per period with minutes (or shares) per zone."""
+    zones = sorted({row["zone"] for row in rows if row["zone"] is not None})
+    periods: dict[str, dict] = {}
+    for row in rows:
+        entry = periods.setdefault(
+            row["period"],
+            {"period": row["period"], "activities": row["activities"]}
+            | {f"zone_{z}": 0.0 for z in zones},
+        )
+        if row["zone"] is not None:
+            entry[f"zone_{row['zone']}"] += (row["seconds"] or 0) / 60
+    data = []
+    for entry in periods.values():
+        total = sum(entry[f"zone_{z}"] for z in zones)
+        for z in zones:
+            value = entry[f"zone_{z}"]
+            if percent:
+                value = 100 * value / total if total else 0.0
+            entry[f"zone_{z}"] = round(value, 1)
+        entry["total_minutes"] = round(total, 1)
+        data.append(entry)
+    return data
+
+
+@app.command("zone-totals")
+def zone_totals(
+    by: str = typer.Option("week", "--by", help="Period: week, month or year."),
+    power: bool = typer.Option(
+        False, "--power", help="Power zones instead of heart rate zones."
+    ),
+    start: Optional[str] = typer.Option(None, "--start", help="Start date."),
+    end: Optional[str] = typer.Option(None, "--end", help="End date."),
+    activity_type: Optional[str] = typer.Option(
+        None, "--type", "-t", help="Exact activity type key."
+    ),
+    percent: bool = typer.Option(
+        False, "--percent", help="Show each zone as a share of the period's time."
+    ),
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, "--workers", "-w", help="Concurrent requests."
+    ),
+    store: Optional[str] = typer.Option(None, "--store", help="Local store path."),
+    tokenstore: Optional[str] = typer.Option(
+        None, "--tokenstore", help="Token storage path."
+    ),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format."),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file."),
+) -> None:
+    """Total time in zones per week, month or year across synced activities.
+
+    Zone times missing from the local store are fetched concurrently and kept
+    there for good.
+    """
+    kind = "power" if power else "hr"
+    try:
+        if by not in ZONE_PERIODS:
+            raise GarminCliError(f"Unknown period '{by}'. Use: week, month, year.")
+        start, end = resolve_bounds(start, end)
+        with Store(store) as db:
+            if not db.count_activities():
+                raise GarminCliError(
+                    "No activities in the local store. Run 'gc sync' first."
+                )
+            missing = db.activities_missing_zones(kind, start, end, activity_type)
+            if missing:
+                client = load_client(tokenstore=tokenstore)
+                method = getattr(client, ZONE_KINDS[kind])
+                # Store in batches so an interrupted run keeps what it fetched.
+                for first in range(0, len(missing), ZONE_BATCH):
+                    batch = missing[first : first + ZONE_BATCH]
+                    zones = api_map(method, batch, workers=workers)
+                    db.set_activity_zones(kind, zip(batch, zones))
+            rows = db.zone_totals(kind, by, start, end, activity_type)
+        title = f"{'Power' if power else 'HR'} Zone Minutes by {by.title()}"
+        render(pivot_zone_totals(rows, percent), fmt=fmt, title=title, output=output)
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+
 @app.command("exercise-sets")
 def exercise_sets(
     activity_id: str = typer.Argument(..., help="Activity ID."),
@@ -398,3 +495,279 @@ def activity_gear(
     except GarminCliError as e:
         print_error(str(e))
         raise typer.Exit(1)
+
+
+_SEARCH_TERM_RE = re.compile(r"(?:(\w+):)?(\w+)")
+
+
+def search_expression(text: Optional[str]) -> Optional[str]:
+    """FTS5 expression for e.g. ``tempo type:treadmill``.
+
+    Every word must match as a prefix; ``field:word`` restricts a word to
+    one of SEARCH_COLUMNS.
+    """
+    terms = []
+    for column, word in _SEARCH_TERM_RE.findall(text or ""):
+        if column and column not in SEARCH_COLUMNS:
+            raise GarminCliError(
+                f"Unknown search field '{column}'. Use: {', '.join(SEARCH_COLUMNS)}."
+            )
+        term = f'"{word}"*'
+        terms.append(f"{column} : {term}" if column else term)
+    return " AND ".join(terms) or None
+
+
+@app.command()
+def search(
+    text: Optional[str] = typer.Argument(
+        None, help="Words to find, e.g. 'tempo type:treadmill'."
+    ),
+    start: Optional[str] = typer.Option(None, "--start", help="Start date."),
+    end: Optional[str] = typer.Option(None, "--end", help="End date."),
+    activity_type: Optional[str] = typer.Option(
+        None, "--type", "-t", help="Exact activity type key."
+    ),
+    limit: int = typer.Option(50, "--limit", "-l", help="Maximum results."),
+    facets: bool = typer.Option(
+        False, "--facets", help="Show counts by type, month and device instead."
+    ),
+    store: Optional[str] = typer.Option(None, "--store", help="Local store path."),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format."),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file."),
+) -> None:
+    """Search synced activities by name, description, type, location and gear."""
+    try:
+        match = search_expression(text)
+        start, end = resolve_bounds(start, end)
+        with Store(store) as db:
+            if not db.count_activities():
+                raise GarminCliError(
+                    "No activities in the local store. Run 'gc sync' first."
+                )
+            db.ensure_search_index()
+            if facets:
+                data = db.search_facets(match, start, end, activity_type)
+                title = "Activity Facets"
+            else:
+                rows = db.search_activities(match, start, end, activity_type, limit)
+                data = [dict(row) for row in rows]
+                title = "Activities"
+        render(data, fmt=fmt, title=title, output=output)
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+
+def parse_point(text: str) -> tuple[float, float]:
+    """``LAT,LON`` in decimal degrees."""
+    try:
+        lat, lon = (float(part) for part in text.split(","))
+    except ValueError:
+        raise GarminCliError(f"Invalid point '{text}'. Use LAT,LON.") from None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise GarminCliError(f"Point '{text}' is out of range.")
+    return lat, lon
+
+
+@app.command("index-tracks")
+def index_tracks(
+    paths: list[Path] = typer.Argument(
+        ..., help="Downloaded GPX/TCX/FIT files or directories to scan."
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", help="Parser processes (default: CPU count)."
+    ),
+    store: Optional[str] = typer.Option(None, "--store", help="Local store path."),
+) -> None:
+    """Add simplified tracks of downloaded activities to the location index."""
+    try:
+        with Store(store) as db:
+            db.ensure_spatial_index()
+            known = db.track_sources()
+            files = []
+            for path in tracks.find_track_files(paths):
+                if tracks.activity_id_for(path) is None:
+                    continue
+                stat = path.stat()
+                if known.get(str(path)) != (stat.st_mtime, stat.st_size):
+                    files.append(path)
+            failed: list[str] = []
+
+            def readable() -> Iterator[dict]:
+                for track in tracks.iter_parsed(files, workers or os.cpu_count() or 1):
+                    if track is None:
+                        continue
+                    if track.get("error"):
+                        failed.append(track["source"])
+                    else:
+                        yield track
+
+            indexed = db.upsert_tracks(readable())
+        for source in failed:
+            print_error(f"Could not read {source}")
+        print_success(f"Indexed {indexed} track(s) from {len(files)} new file(s).")
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+
+@app.command()
+def near(
+    points: list[str] = typer.Argument(
+        ..., help="LAT,LON point(s); several points need --track."
+    ),
+    radius: float = typer.Option(1.0, "--radius", "-r", help="Radius in km."),
+    track: bool = typer.Option(
+        False,
+        "--track",
+        help="Match tracks passing within the radius of every point,"
+        " not just start points.",
+    ),
+    limit: int = typer.Option(50, "--limit", "-l", help="Maximum results."),
+    store: Optional[str] = typer.Option(None, "--store", help="Local store path."),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format."),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file."),
+) -> None:
+    """Find synced activities that started (or passed) near a location."""
+    try:
+        where = [parse_point(p) for p in points]
+        if len(where) > 1 and not track:
+            raise GarminCliError("Several points need --track.")
+        radius_m = radius * 1000
+        with Store(store) as db:
+            db.ensure_spatial_index()
+            if track:
+                distances = _near_tracks(db, where, radius_m)
+            else:
+                distances = {
+                    row["activity_id"]: tracks.haversine_m(
+                        where[0], (row["lat"], row["lon"])
+                    )
+                    for row in db.starts_within(tracks.bounding_box(where[0], radius_m))
+                }
+                distances = {k: d for k, d in distances.items() if d <= radius_m}
+            summaries = db.activity_summaries(list(distances))
+        data = []
+        for activity_id, distance in distances.items():
+            row = summaries.get(activity_id)
+            data.append(
+                {
+                    "activity_id": activity_id,
+                    "start": row["start_time_local"] if row else None,
+                    "name": row["activity_name"] if row else None,
+                    "type": row["activity_type"] if row else None,
+                    "distance_km": round(distance / 1000, 3),
+                }
+            )
+        data.sort(key=lambda r: r["start"] or "", reverse=True)
+        render(data[:limit], fmt=fmt, title="Activities", output=output)
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+
+def _near_tracks(
+    db: Store, where: list[tuple[float, float]], radius_m: float
+) -> dict[int, float]:
+    """Activities whose track passes within radius_m of every point.
+
+    Each point's bounding box narrows the candidates through the R-tree, so
+    only tracks near all points are decoded; the value is the largest of
+    the per-point distances.
+    """
+    candidates: Optional[dict[int, str]] = None
+    for point in where:
+        rows = db.tracks_overlapping(tracks.bounding_box(point, radius_m))
+        found = {row["activity_id"]: row["points"] for row in rows}
+        if candidates is not None:
+            found = {k: v for k, v in found.items() if k in candidates}
+        candidates = found
+    distances = {}
+    for activity_id, points in (candidates or {}).items():
+        polyline = [tuple(p) for p in json.loads(points)]
+        worst = max(tracks.distance_to_track_m(p, polyline) for p in where)
+        if worst <= radius_m:
+            distances[activity_id] = worst
+    return distances
+
+
+@app.command()
+def heatmap(
+    target: Path = typer.Argument(
+        ..., help="Directory for {z}/{x}/{y}.png tiles, or a .png file for one image."
+    ),
+    zoom: Optional[str] = typer.Option(
+        None, "--zoom", "-z", help="Zoom or MIN-MAX range (tiles 10-14, image 13)."
+    ),
+    saturation: int = typer.Option(
+        heatmap_tiles.DEFAULT_SATURATION,
+        "--saturation",
+        help="Activities per pixel drawn at full brightness.",
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", help="Render processes (default: CPU count)."
+    ),
+    store: Optional[str] = typer.Option(None, "--store", help="Local store path."),
+) -> None:
+    """Draw a heatmap of the tracks added with `gc activities index-tracks`."""
+    as_image = target.suffix.lower() == ".png"
+    try:
+        zooms = heatmap_tiles.parse_zooms(zoom or ("13" if as_image else "10-14"))
+        if as_image and len(zooms) > 1:
+            raise GarminCliError("A single image needs a single --zoom.")
+        heatmap_tiles.require_numpy()
+        workers = workers or os.cpu_count() or 1
+        with Store(store) as db:
+            db.ensure_spatial_index()
+            pending = db.heatmap_pending(zooms)
+            db.add_heatmap_pixels(
+                tracks.process_map(
+                    heatmap_tiles.activity_tiles, pending, workers, chunksize=16
+                )
+            )
+            tiles = [t for z in zooms for t in db.heatmap_tiles(z)]
+            if not tiles:
+                raise GarminCliError(
+                    "No tracks indexed. Run 'gc activities index-tracks' first."
+                )
+            db_path = str(db.path)
+            if as_image:
+                counts = tracks.process_map(
+                    heatmap_tiles.tile_counts,
+                    [(db_path, b) for b in heatmap_tiles.batches(tiles, 16)],
+                    workers,
+                )
+                data = heatmap_tiles.image(
+                    (c for batch in counts for c in batch), tiles, saturation
+                )
+                atomic_write(target, data)
+                print_success(f"Wrote {target} from {len(pending)} new track(s).")
+                return
+            # The manifest in the tile directory says which store generation
+            # (and style) its tiles show; redraw what changed since then.
+            drawn = heatmap_tiles.rendered_generations(str(target), saturation)
+            generation = db.heatmap_generation()
+            redraw = {
+                t for z in zooms for t in db.changed_heatmap_tiles(z, drawn.get(z, 0))
+            }
+            redraw.update(heatmap_tiles.missing_tiles(tiles, str(target)))
+            redraw = sorted(redraw)
+            rendered = sum(
+                tracks.process_map(
+                    heatmap_tiles.render_tiles,
+                    [
+                        (db_path, b, str(target), saturation)
+                        for b in heatmap_tiles.batches(redraw, 32)
+                    ],
+                    workers,
+                )
+            )
+            drawn.update(dict.fromkeys(zooms, generation))
+            heatmap_tiles.write_manifest(str(target), saturation, drawn)
+        print_success(
+            f"Rendered {rendered} of {len(tiles)} tile(s) from"
+            f" {len(pending)} new track(s)."
+        )
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
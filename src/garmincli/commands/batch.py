@@ -0,0 +1,171 @@
+"""Run many commands in one process."""
+
+import json
+import shlex
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+import click
+import typer
+
+from ..api import set_cache
+from ..cache import ResponseCache
+from ..errors import GarminCliError
+from ..output import capture_output, print_error
+
+DEFAULT_CACHE_TTL = 300.0
+
+
+def parse_line(line: str) -> Optional[list[str]]:
+    """Parse one batch line into argv; None for blank lines and comments.
+
+    Lines are shell-quoted command lines or JSON arrays of strings; a
+    leading "gc" is optional.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("["):
+        try:
+            args = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise GarminCliError(f"Invalid JSON argv: {e}") from e
+        if not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+            raise GarminCliError("JSON argv must be an array of strings.")
+    else:
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            raise GarminCliError(f"Invalid command line: {e}") from e
+    if args and args[0] == "gc":
+        args = args[1:]
+    if not args:
+        return None
+    if args[0] == "batch":
+        raise GarminCliError("Nested 'gc batch' is not supported.")
+    return args
+
+
+def _has_format(args: list[str]) -> bool:
+    return any(a in ("--format", "-f") or a.startswith("--format=") for a in args)
+
+
+def _invoke(root: click.Command, args: list[str]) -> tuple[int, str, str]:
+    with capture_output() as (out, err):
+        try:
+            result = root.main(args=args, prog_name="gc", standalone_mode=False)
+            code = result if isinstance(result, int) else 0
+        except click.ClickException as e:
+            err.write(f"Error: {e.format_message()}\n")
+            code = e.exit_code
+        except click.Abort:
+            err.write("Error: Aborted.\n")
+            code = 1
+        except Exception as e:  # one bad line must not end the batch
+            if isinstance(e, GarminCliError):
+                err.write(f"Error: {e}\n")
+            else:
+                err.write(f"Error: Unexpected error: {e!r}\n")
+            code = 1
+    return code, out.getvalue(), err.getvalue()
+
+
+def run_line(root: click.Command, args: list[str]) -> dict[str, Any]:
+    """Run one command in-process and return its result record."""
+    if _has_format(args):
+        code, out, err = _invoke(root, args)
+    else:
+        code, out, err = _invoke(root, [*args, "--format", "json"])
+        if code == 2 and "--format" in err:
+            # The command has no --format option; run it as written.
+            code, out, err = _invoke(root, args)
+
+    record: dict[str, Any] = {"args": args, "ok": code == 0, "exit_code": code}
+    if code != 0:
+        lines = [line for line in err.splitlines() if line.strip()]
+        message = lines[-1] if lines else f"exit code {code}"
+        record["error"] = message.removeprefix("Error: ")
+        return record
+    try:
+        record["data"] = json.loads(out) if out.strip() else None
+    except json.JSONDecodeError:
+        record["output"] = out
+    return record
+
+
+def _numbered_lines(stream: TextIO) -> Iterator[tuple[int, str]]:
+    for number, line in enumerate(stream, start=1):
+        yield number, line
+
+
+def run_batch(
+    root: click.Command,
+    lines: Iterable[tuple[int, str]],
+    jobs: int = 1,
+) -> Iterator[dict[str, Any]]:
+    """Yield result records in input order, running up to ``jobs`` at once."""
+
+    def _run(number: int, line: str) -> dict[str, Any]:
+        try:
+            args = parse_line(line)
+        except GarminCliError as e:
+            return {"line": number, "ok": False, "exit_code": 2, "error": str(e)}
+        if args is None:
+            return {}
+        return {"line": number, **run_line(root, args)}
+
+    if jobs <= 1:
+        for number, line in lines:
+            record = _run(number, line)
+            if record:
+                yield record
+        return
+
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for number, line in lines:
+            pending.append(pool.submit(_run, number, line))
+            while pending and pending[0].done():
+                record = pending.popleft().result()
+                if record:
+                    yield record
+        while pending:
+            record = pending.popleft().result()
+            if record:
+                yield record
+
+
+def batch(
+    ctx: typer.Context,
+    file: Optional[str] = typer.Argument(
+        None, help="File with one command per line (default: stdin)."
+    ),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Lines to run concurrently."),
+    cache_ttl: float = typer.Option(
+        DEFAULT_CACHE_TTL,
+        "--cache-ttl",
+        help="Seconds to reuse identical read-only responses (0 disables).",
+    ),
+) -> None:
+    """Run commands from stdin or a file and print NDJSON results."""
+    root = ctx.find_root().command
+    set_cache(ResponseCache(ttl=cache_ttl) if cache_ttl > 0 else None)
+    failed = 0
+    try:
+        stream = open(file) if file else sys.stdin
+    except OSError as e:
+        print_error(f"Cannot read {file}: {e}")
+        raise typer.Exit(1)
+    try:
+        for record in run_batch(root, _numbered_lines(stream), jobs=jobs):
+            failed += not record["ok"]
+            sys.stdout.write(json.dumps(record, default=str) + "\n")
+            sys.stdout.flush()
+    finally:
+        set_cache(None)
+        if file:
+            stream.close()
+    if failed:
+        raise typer.Exit(1)
@@ -4,7 +4,7 @@ from typing import Optional
 
 import typer
 
-from ..api import api_call
+from ..api import api_call, api_range_call
 from ..auth import load_client
 from ..dates import resolve_date
 from ..errors import GarminCliError
@@ -32,7 +32,7 @@ def body_cmd(
     try:
         client = load_client(tokenstore=tokenstore)
         cdate, end_date = resolve_date(date_str=date, end=end)
-        data = api_call(client.get_body_composition, cdate, end_date or cdate)
+        data = api_range_call(client.get_body_composition, cdate, end_date or cdate)
         render(data, fmt=fmt, title=f"Body Composition ({cdate})", output=output)
     except GarminCliError as e:
         print_error(str(e))
@@ -58,7 +58,7 @@ def weighins(
         client = load_client(tokenstore=tokenstore)
         cdate, end_date = resolve_date(date_shortcut, date, start, end)
         if end_date:
-            data = api_call(client.get_weigh_ins, cdate, end_date)
+            data = api_range_call(client.get_weigh_ins, cdate, end_date)
         else:
             data = api_call(client.get_daily_weigh_ins, cdate)
         render(data, fmt=fmt, title="Weigh-ins", output=output)
@@ -1,10 +1,11 @@
 """Device commands."""
 
+from functools import partial
 from typing import Optional
 
 import typer
 
-from ..api import api_call
+from ..api import api_call, api_range_call
 from ..auth import load_client
 from ..dates import resolve_date
 from ..errors import GarminCliError
@@ -125,7 +126,9 @@ def solar(
     try:
         client = load_client(tokenstore=tokenstore)
         cdate, end_date = resolve_date(date_shortcut, date, end=end)
-        data = api_call(client.get_device_solar_data, device_id, cdate, end_date)
+        data = api_range_call(
+            partial(client.get_device_solar_data, device_id), cdate, end_date
+        )
         render(data, fmt=fmt, title=f"Solar Data ({device_id})", output=output)
     except GarminCliError as e:
         print_error(str(e))
@@ -0,0 +1,397 @@
+"""Export a whole account into a partitioned directory with a manifest."""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import typer
+
+from ..api import (
+    DAILY_DATASETS,
+    DEFAULT_WORKERS,
+    api_call,
+    get_rate_limit,
+    set_rate_limit,
+)
+from ..auth import load_client
+from ..dates import parse_date
+from ..errors import GarminCliError
+from ..output import atomic_write, print_error, render
+
+MANIFEST_FILE = "manifest.json"
+JOURNAL_FILE = "checkpoint.jsonl"
+MANIFEST_VERSION = 1
+
+# Applied unless a global --rate-limit is set; an export is thousands of calls.
+EXPORT_RATE_LIMIT = 3.0
+# Days this recent are still filling in on Garmin's side and are re-exported.
+OPEN_DAYS = 2
+PAGE_SIZE = 100
+GOAL_STATUSES = ("active", "future", "past")
+
+
+@dataclass(frozen=True)
+class Unit:
+    """One checkpointed piece of the export: a single file."""
+
+    id: str
+    path: str  # relative to the export directory
+    fetch: Callable[[Any], Any]  # client -> JSON-able data, or bytes
+    refresh: bool = False  # re-export even if already in the manifest
+
+
+class Manifest:
+    """Exported units with checksums.
+
+    Every finished unit is appended to a checkpoint journal immediately;
+    the journal is folded into manifest.json on save(), so an interrupted
+    export resumes where it stopped.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.path = root / MANIFEST_FILE
+        self.journal = root / JOURNAL_FILE
+        self._lock = threading.Lock()
+        self.data: dict[str, Any] = {"version": MANIFEST_VERSION, "units": {}}
+        if self.path.exists():
+            try:
+                self.data = json.loads(self.path.read_text())
+            except json.JSONDecodeError as e:
+                raise GarminCliError(f"Corrupt manifest {self.path}: {e}") from e
+        if self.journal.exists():
+            for line in self.journal.read_text().splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line of an interrupted run
+                self.data["units"][entry.pop("id")] = entry
+
+    @property
+    def units(self) -> dict[str, dict[str, Any]]:
+        return self.data["units"]
+
+    def done(self, unit_id: str) -> bool:
+        return unit_id in self.units
+
+    def record(self, unit: Unit, content: bytes) -> None:
+        entry = {
+            "path": unit.path,
+            "sha256": hashlib.sha256(content).hexdigest(),
+            "bytes": len(content),
+            "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self.units[unit.id] = entry
+            with open(self.journal, "a") as f:
+                f.write(json.dumps({"id": unit.id, **entry}) + "\n")
+
+    def save(self, **fields: Any) -> None:
+        with self._lock:
+            self.data.update(fields)
+            self.data["updated"] = datetime.now(timezone.utc).isoformat(
+                timespec="seconds"
+            )
+            text = json.dumps(self.data, indent=2, sort_keys=True) + "\n"
+            atomic_write(self.path, text.encode())
+            self.journal.unlink(missing_ok=True)
+
+    def verify(self) -> list[dict[str, str]]:
+        """Units whose file is missing or does not match its checksum."""
+        problems = []
+        for unit_id, entry in sorted(self.units.items()):
+            path = self.root / entry["path"]
+            if not path.exists():
+                problems.append({"unit": unit_id, "problem": "missing"})
+            elif hashlib.sha256(path.read_bytes()).hexdigest() != entry["sha256"]:
+                problems.append({"unit": unit_id, "problem": "checksum mismatch"})
+        return problems
+
+
+def _call(method: str, *args: Any) -> Callable[[Any], Any]:
+    return lambda client: api_call(getattr(client, method), *args)
+
+
+def _months(start: date, end: date) -> Iterable[tuple[date, date]]:
+    current = start
+    while current <= end:
+        next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+        yield current, min(end, next_month - timedelta(days=1))
+        current = next_month
+
+
+def _paged(method: str, *args: Any) -> Callable[[Any], list]:
+    def fetch(client: Any) -> list:
+        items: list = []
+        while True:
+            page = api_call(getattr(client, method), len(items), PAGE_SIZE, *args)
+            items += page or []
+            if not page or len(page) < PAGE_SIZE:
+                return items
+
+    return fetch
+
+
+def _gear(client: Any) -> Any:
+    profile_id = (getattr(client.garth, "profile", None) or {}).get("profileId")
+    if profile_id is None:
+        raise GarminCliError("User profile number unavailable; cannot list gear.")
+    return api_call(client.get_gear, profile_id)
+
+
+def _goals(client: Any) -> dict[str, Any]:
+    return {
+        status: api_call(client.get_goals, status, 0, PAGE_SIZE)
+        for status in GOAL_STATUSES
+    }
+
+
+def plan_units(start: date, end: date, today: date) -> list[Unit]:
+    """Date-partitioned and account-wide units (activities are planned later)."""
+    open_from = today - timedelta(days=OPEN_DAYS - 1)
+    units = []
+    day = start
+    while day <= end:
+        for name, method in DAILY_DATASETS.items():
+            units.append(
+                Unit(
+                    f"daily/{name}/{day.isoformat()}",
+                    f"daily/{name}/{day.year}/{day.isoformat()}.json",
+                    _call(method, day.isoformat()),
+                    refresh=day >= open_from,
+                )
+            )
+        day += timedelta(days=1)
+
+    for first, last in _months(start, end):
+        month = first.strftime("%Y-%m")
+        refresh = last >= open_from
+        units.append(
+            Unit(
+                f"body/composition/{month}",
+                f"body/composition/{first.year}/{month}.json",
+                _call("get_body_composition", first.isoformat(), last.isoformat()),
+                refresh=refresh,
+            )
+        )
+        units.append(
+            Unit(
+                f"activities/{month}",
+                f"activities/{first.year}/{month}.json",
+                _call("get_activities_by_date", first.isoformat(), last.isoformat()),
+                refresh=refresh,
+            )
+        )
+
+    account = {
+        "workouts": _paged("get_workouts"),
+        "gear": _gear,
+        "goals": _goals,
+        "badges": _call("get_earned_badges"),
+        "devices": _call("get_devices"),
+    }
+    units += [
+        Unit(name, f"account/{name}.json", fetch, refresh=True)
+        for name, fetch in account.items()
+    ]
+    return units
+
+
+def plan_activity_units(root: Path, month_units: Iterable[Unit]) -> list[Unit]:
+    """Summary, details and original file for every exported activity."""
+    from garminconnect import Garmin as GarminAPI
+
+    original = GarminAPI.ActivityDownloadFormat.ORIGINAL
+    units = []
+    for month_unit in month_units:
+        path = root / month_unit.path
+        if not path.exists():
+            continue  # the month listing failed; retried next run
+        for activity in json.loads(path.read_text()) or []:
+            activity_id = activity.get("activityId")
+            started = activity.get("startTimeLocal") or ""
+            if activity_id is None or len(started) < 7:
+                continue
+            base = f"activities/{started[:4]}/{started[5:7]}/{activity_id}"
+            units += [
+                Unit(
+                    f"activity/{activity_id}/summary",
+                    f"{base}/activity.json",
+                    _call("get_activity", activity_id),
+                ),
+                Unit(
+                    f"activity/{activity_id}/details",
+                    f"{base}/details.json",
+                    _call("get_activity_details", activity_id),
+                ),
+                Unit(
+                    f"activity/{activity_id}/original",
+                    f"{base}/original.zip",
+                    _call("download_activity", activity_id, original),
+                ),
+            ]
+    return units
+
+
+def _serialize(data: Any) -> bytes:
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    return json.dumps(data, default=str, sort_keys=True).encode()
+
+
+def _export_unit(unit: Unit, client: Any, root: Path) -> bytes:
+    content = _serialize(unit.fetch(client))
+    target = root / unit.path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(target, content)
+    return content
+
+
+def run_units(
+    units: list[Unit],
+    manifest: Manifest,
+    client: Any,
+    workers: int,
+    force: bool = False,
+) -> dict[str, Any]:
+    """Export pending units with a bounded pool, checkpointing each one."""
+    todo = [u for u in units if force or u.refresh or not manifest.done(u.id)]
+    result: dict[str, Any] = {
+        "exported": 0,
+        "skipped": len(units) - len(todo),
+        "failed": [],
+    }
+    pending: set[Future] = set()
+    owners: dict[Future, Unit] = {}
+    queue = iter(todo)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            while True:
+                # Keep at most 2x workers in flight so an interrupt loses little.
+                for unit in queue:
+                    future = pool.submit(_export_unit, unit, client, manifest.root)
+                    owners[future] = unit
+                    pending.add(future)
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    unit = owners.pop(future)
+                    try:
+                        manifest.record(unit, future.result())
+                        result["exported"] += 1
+                    except (GarminCliError, OSError) as e:
+                        # A full disk or unwritable directory fails this unit
+                        # only; it is retried on the next run.
+                        result["failed"].append({"unit": unit.id, "error": str(e)})
+        except KeyboardInterrupt:
+            for future in pending:
+                future.cancel()
+            raise
+    return result
+
+
+def export(
+    directory: Path = typer.Argument(..., help="Export directory."),
+    start: Optional[str] = typer.Option(
+        None, "--start", help="First day (YYYY-MM-DD); required for a new export."
+    ),
+    end: Optional[str] = typer.Option(None, "--end", help="Last day (default: today)."),
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, "--workers", "-w", help="Concurrent API calls."
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Re-export units already in the manifest."
+    ),
+    verify: bool = typer.Option(
+        False, "--verify", help="Only check files against the manifest checksums."
+    ),
+    tokenstore: Optional[str] = typer.Option(
+        None, "--tokenstore", help="Token storage path."
+    ),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format."),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file."),
+) -> None:
+    """Export all account data into DIRECTORY (resumable, incremental)."""
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest = Manifest(directory)
+    except (OSError, GarminCliError) as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+    if verify:
+        problems = manifest.verify()
+        if problems:
+            render(problems, fmt=fmt, output=output, title="Export problems")
+            raise typer.Exit(1)
+        render(
+            {"units": len(manifest.units), "problems": 0},
+            fmt=fmt,
+            output=output,
+            title="Export verified",
+        )
+        return
+
+    start = start or manifest.data.get("start")
+    if not start:
+        raise typer.BadParameter("--start is required for a new export.")
+    today = date.today()
+    first, last = parse_date(start), parse_date(end) if end else today
+    if first > last:
+        raise typer.BadParameter(
+            f"Start date {start} is after end date {last.isoformat()}."
+        )
+    last = min(last, today)
+
+    default_limit = get_rate_limit() is None
+    if default_limit:
+        set_rate_limit(EXPORT_RATE_LIMIT)
+
+    summary: dict[str, Any] = {"exported": 0, "skipped": 0, "failed": []}
+    try:
+        client = load_client(tokenstore=tokenstore)
+        units = plan_units(first, last, today)
+        stages = [run_units(units, manifest, client, workers, force)]
+        # Activity files are planned from the month listings just exported.
+        months = [u for u in units if u.id.startswith("activities/")]
+        activity_units = plan_activity_units(directory, months)
+        stages.append(run_units(activity_units, manifest, client, workers, force))
+        for stage in stages:
+            summary["exported"] += stage["exported"]
+            summary["skipped"] += stage["skipped"]
+            summary["failed"] += stage["failed"]
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+    finally:
+        if default_limit:
+            set_rate_limit(None)  # don't throttle later `gc batch` lines
+        known_start = manifest.data.get("start")
+        known_end = manifest.data.get("end")
+        manifest.save(
+            start=min(filter(None, [known_start, first.isoformat()])),
+            end=max(filter(None, [known_end, last.isoformat()])),
+            failed={f["unit"]: f["error"] for f in summary["failed"]},
+        )
+
+    failed = summary.pop("failed")
+    for failure in failed:
+        print_error(f"{failure['unit']}: {failure['error']}")
+    summary.update(
+        {
+            "failed": len(failed),
+            "units": len(manifest.units),
+            "directory": str(directory),
+        }
+    )
+    render(summary, fmt=fmt, output=output, title="Export")
+    if failed:
+        raise typer.Exit(1)
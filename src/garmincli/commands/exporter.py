@@ -0,0 +1,388 @@
+"""Prometheus exporter: cached Garmin metrics over HTTP or as a textfile."""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import typer
+
+from ..api import api_call
+from ..auth import load_client
+from ..dates import parse_intervals
+from ..errors import GarminCliError
+from ..output import atomic_write, print_error, print_success
+
+DEFAULT_LISTEN = "127.0.0.1:9877"
+PREFIX = "garmin_"
+
+Sample = tuple[dict[str, str], float]
+
+
+@dataclass(frozen=True)
+class Source:
+    """One Garmin endpoint, refreshed on its own schedule."""
+
+    name: str
+    fetch: Callable[[Any, str], Any]  # (client, "YYYY-MM-DD") -> response
+    interval: float  # seconds
+
+
+@dataclass(frozen=True)
+class Gauge:
+    name: str
+    help: str
+    source: str
+    extract: Callable[[Any], Iterable[Sample]]
+
+
+SOURCES = [
+    Source("user_summary", lambda c, d: api_call(c.get_user_summary, d), 300),
+    Source("sleep", lambda c, d: api_call(c.get_sleep_data, d), 1800),
+    Source("hrv", lambda c, d: api_call(c.get_hrv_data, d), 1800),
+    Source(
+        "training_readiness",
+        lambda c, d: api_call(c.get_training_readiness, d),
+        1800,
+    ),
+    Source("max_metrics", lambda c, d: api_call(c.get_max_metrics, d), 6 * 3600),
+    Source("devices", lambda c, d: api_call(c.get_devices), 3600),
+]
+
+
+def _latest(data: Any) -> Any:
+    """List responses hold one entry per reading; the last one is current."""
+    if isinstance(data, list):
+        return data[-1] if data else None
+    return data
+
+
+def _dig(data: Any, path: str) -> Any:
+    for key in path.split("."):
+        data = _latest(data)
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _at(path: str, **labels: str) -> Callable[[Any], list[Sample]]:
+    def extract(data: Any) -> list[Sample]:
+        value = _number(_dig(data, path))
+        return [] if value is None else [(labels, value)]
+
+    return extract
+
+
+def _each(*extractors: Callable[[Any], list[Sample]]) -> Callable[[Any], list[Sample]]:
+    return lambda data: [s for extract in extractors for s in extract(data)]
+
+
+def _device_battery(data: Any) -> list[Sample]:
+    """Battery level per device; Connect only reports it for some devices."""
+    samples = []
+    for device in data if isinstance(data, list) else []:
+        value = _number(device.get("batteryLevel"))
+        if value is None:
+            continue
+        name = (
+            device.get("displayName")
+            or device.get("productDisplayName")
+            or str(device.get("deviceId", "?"))
+        )
+        samples.append(({"device": name}, value))
+    return samples
+
+
+GAUGES = [
+    Gauge(
+        "resting_heart_rate_bpm",
+        "Resting heart rate today.",
+        "user_summary",
+        _at("restingHeartRate"),
+    ),
+    Gauge(
+        "body_battery",
+        "Most recent body battery level.",
+        "user_summary",
+        _at("bodyBatteryMostRecentValue"),
+    ),
+    Gauge(
+        "stress_level",
+        "Stress level today (average and max).",
+        "user_summary",
+        _each(
+            _at("averageStressLevel", stat="average"),
+            _at("maxStressLevel", stat="max"),
+        ),
+    ),
+    Gauge("steps", "Steps today.", "user_summary", _at("totalSteps")),
+    Gauge("steps_goal", "Daily step goal.", "user_summary", _at("dailyStepGoal")),
+    Gauge(
+        "sleep_score",
+        "Overall sleep score of last night.",
+        "sleep",
+        _at("dailySleepDTO.sleepScores.overall.value"),
+    ),
+    Gauge(
+        "sleep_seconds",
+        "Sleep duration of last night.",
+        "sleep",
+        _at("dailySleepDTO.sleepTimeSeconds"),
+    ),
+    Gauge(
+        "hrv_ms",
+        "Heart rate variability (last night and 7-day average).",
+        "hrv",
+        _each(
+            _at("hrvSummary.lastNightAvg", stat="last_night"),
+            _at("hrvSummary.weeklyAvg", stat="weekly_average"),
+        ),
+    ),
+    Gauge(
+        "vo2max",
+        "VO2 Max estimate.",
+        "max_metrics",
+        _each(
+            _at("generic.vo2MaxPreciseValue", sport="running"),
+            _at("cycling.vo2MaxPreciseValue", sport="cycling"),
+        ),
+    ),
+    Gauge(
+        "training_readiness_score",
+        "Training readiness score.",
+        "training_readiness",
+        _at("score"),
+    ),
+    Gauge(
+        "device_battery_percent",
+        "Device battery level.",
+        "devices",
+        _device_battery,
+    ),
+]
+
+
+@dataclass
+class SourceState:
+    data: Any = None
+    fetched_at: Optional[float] = None
+    duration: float = 0.0
+    errors: int = 0
+    last_error: Optional[str] = None
+
+
+class MetricsCache:
+    """Latest response per source, each refreshed on its own interval.
+
+    The exporter loop refreshes it; HTTP scrapes only read it, so they
+    never wait for Garmin and never cause API calls of their own.
+    """
+
+    def __init__(self, sources: list[Source]) -> None:
+        self.sources = sources
+        self.state = {source.name: SourceState() for source in sources}
+        self._lock = threading.Lock()
+        self._due = {source.name: 0.0 for source in sources}
+
+    def refresh(self, source: Source, client: Any) -> None:
+        start = time.monotonic()
+        try:
+            data = source.fetch(client, date.today().isoformat())
+        except GarminCliError as e:
+            with self._lock:
+                state = self.state[source.name]
+                state.errors += 1
+                state.last_error = str(e)
+                state.duration = time.monotonic() - start
+            return
+        with self._lock:
+            state = self.state[source.name]
+            state.data = data
+            state.fetched_at = time.time()
+            state.duration = time.monotonic() - start
+
+    def refresh_due(self, client: Any, now: Optional[float] = None) -> list[Source]:
+        """Refresh every source whose interval has elapsed; return them."""
+        now = time.monotonic() if now is None else now
+        due = [s for s in self.sources if self._due[s.name] <= now]
+        for source in due:
+            self.refresh(source, client)
+            self._due[source.name] = now + source.interval
+        return due
+
+    def next_due(self) -> float:
+        return min(self._due.values())
+
+    def snapshot(self) -> dict[str, SourceState]:
+        with self._lock:
+            return {
+                name: SourceState(**vars(state)) for name, state in self.state.items()
+            }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _line(name: str, labels: dict[str, str], value: float) -> str:
+    if labels:
+        inner = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+        return f"{name}{{{inner}}} {float(value)!r}"
+    return f"{name} {float(value)!r}"
+
+
+def render_metrics(
+    snapshot: dict[str, SourceState], gauges: list[Gauge] = GAUGES
+) -> str:
+    """Prometheus text exposition format for a cache snapshot."""
+    lines: list[str] = []
+    for gauge in gauges:
+        state = snapshot.get(gauge.source)
+        if state is None or state.fetched_at is None:
+            continue
+        samples = gauge.extract(state.data)
+        if not samples:
+            continue
+        name = PREFIX + gauge.name
+        lines += [f"# HELP {name} {gauge.help}", f"# TYPE {name} gauge"]
+        lines += [_line(name, labels, value) for labels, value in samples]
+
+    internal = [
+        (
+            "exporter_last_success_timestamp_seconds",
+            "gauge",
+            "When a source was last refreshed.",
+            lambda s: s.fetched_at,
+        ),
+        (
+            "exporter_refresh_duration_seconds",
+            "gauge",
+            "Duration of the last refresh of a source.",
+            lambda s: s.duration,
+        ),
+        (
+            "exporter_refresh_errors_total",
+            "counter",
+            "Failed refreshes of a source.",
+            lambda s: s.errors,
+        ),
+    ]
+    for suffix, kind, help_text, value_of in internal:
+        name = PREFIX + suffix
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for source, state in sorted(snapshot.items()):
+            value = value_of(state)
+            if value is not None:
+                lines.append(_line(name, {"source": source}, value))
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Path, text: str) -> None:
+    """Replace ``path`` atomically so the textfile collector never sees a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # World-readable: the collector may run as another user.
+    atomic_write(path, text.encode(), mode=0o644)
+
+
+def _serve(cache: MetricsCache, host: str, port: int) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_metrics(cache.snapshot()).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def _parse_listen(value: str) -> tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    try:
+        return host or "0.0.0.0", int(port)
+    except ValueError:
+        raise typer.BadParameter(f"Invalid address: {value}. Use HOST:PORT.")
+
+
+def exporter(
+    listen: Optional[str] = typer.Option(
+        None,
+        "--listen",
+        "-l",
+        help=f"Serve /metrics on HOST:PORT (default {DEFAULT_LISTEN} without --textfile).",
+    ),
+    textfile: Optional[Path] = typer.Option(
+        None, "--textfile", help="Write metrics to this .prom file after each refresh."
+    ),
+    once: bool = typer.Option(
+        False, "--once", help="Refresh every source once, write --textfile and exit."
+    ),
+    interval: list[str] = typer.Option(
+        [],
+        "--interval",
+        help="Refresh interval override, e.g. user_summary=120 (repeatable).",
+    ),
+    tokenstore: Optional[str] = typer.Option(
+        None, "--tokenstore", help="Token storage path."
+    ),
+) -> None:
+    """Export health metrics for Prometheus (HTTP /metrics or textfile)."""
+    if once and not textfile:
+        raise typer.BadParameter("--once needs --textfile.")
+    overrides = parse_intervals(interval, (s.name for s in SOURCES))
+    sources = [
+        Source(s.name, s.fetch, overrides.get(s.name, s.interval)) for s in SOURCES
+    ]
+    cache = MetricsCache(sources)
+
+    try:
+        client = load_client(tokenstore=tokenstore)
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+    httpd = None
+    if not once and (listen or not textfile):
+        host, port = _parse_listen(listen or DEFAULT_LISTEN)
+        try:
+            httpd = _serve(cache, host, port)
+        except OSError as e:
+            print_error(f"Cannot listen on {host}:{port}: {e}")
+            raise typer.Exit(1)
+        print_success(f"Serving metrics on http://{host}:{port}/metrics")
+
+    try:
+        while True:
+            if cache.refresh_due(client) and textfile:
+                write_textfile(textfile, render_metrics(cache.snapshot()))
+            if once:
+                break
+            time.sleep(max(1.0, cache.next_due() - time.monotonic()))
+    except OSError as e:
+        print_error(f"Cannot write {textfile}: {e}")
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
@@ -1,16 +1,89 @@
 """Gear commands."""
 
-from typing import Optional
+from datetime import date
+from typing import Any, Iterable, Optional
 
 import typer
 
-from ..api import api_call
+from ..api import DEFAULT_WORKERS, api_call
 from ..auth import load_client
+from ..dates import resolve_bounds
 from ..errors import GarminCliError
 from ..output import print_error, render
+from ..store import Store
+from .sync import sync_activity_gear
 
 app = typer.Typer(no_args_is_help=True, invoke_without_command=True)
 
+REPORT_PERIODS = ("week", "month", "year")
+
+
+def _period_key(start_time_local: Optional[str], period: str) -> str:
+    """Bucket an activity start time ("YYYY-MM-DD HH:MM:SS") into a period."""
+    if not start_time_local:
+        return "-"
+    if period == "year":
+        return start_time_local[:4]
+    if period == "month":
+        return start_time_local[:7]
+    year, week, _ = date.fromisoformat(start_time_local[:10]).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _aggregate_gear(
+    rows: Iterable[Any],
+    period: Optional[str] = None,
+    threshold_km: Optional[float] = None,
+) -> list[dict]:
+    """Sum distance, time and count per gear (and per period when given)."""
+    totals: dict[tuple, dict] = {}
+    for row in rows:
+        bucket = _period_key(row["start_time_local"], period) if period else None
+        key = (row["gear_uuid"], bucket)
+        entry = totals.get(key)
+        if entry is None:
+            entry = totals[key] = {"gear": row["display_name"] or row["gear_uuid"]}
+            if period:
+                entry["period"] = bucket
+            entry.update(
+                {
+                    "activities": 0,
+                    "distance_km": 0.0,
+                    "duration_h": 0.0,
+                    "uuid": row["gear_uuid"],
+                    "_max_m": row["maximum_meters"],
+                }
+            )
+        entry["activities"] += 1
+        entry["distance_km"] += (row["distance"] or 0) / 1000
+        entry["duration_h"] += (row["duration"] or 0) / 3600
+
+    report = []
+    for entry in totals.values():
+        max_m = entry.pop("_max_m")
+        entry["distance_km"] = round(entry["distance_km"], 1)
+        entry["duration_h"] = round(entry["duration_h"], 1)
+        if not period:
+            limit_km = (
+                threshold_km
+                if threshold_km is not None
+                else (max_m / 1000 if max_m else None)
+            )
+            entry["limit_km"] = limit_km
+            entry["remaining_km"] = (
+                round(limit_km - entry["distance_km"], 1)
+                if limit_km is not None
+                else None
+            )
+            entry["retire"] = limit_km is not None and entry["distance_km"] >= limit_km
+        report.append(entry)
+
+    if period:
+        report.sort(key=lambda e: (e["gear"], e["period"]))
+    else:
+        report.sort(key=lambda e: -e["distance_km"])
+    return report
+
 
 @app.callback(invoke_without_command=True)
 def gear_cmd(
@@ -97,3 +170,50 @@ def gear_activities(
     except GarminCliError as e:
         print_error(str(e))
         raise typer.Exit(1)
+
+
+@app.command()
+def report(
+    start: Optional[str] = typer.Option(None, "--start", help="Start date."),
+    end: Optional[str] = typer.Option(None, "--end", help="End date."),
+    period: Optional[str] = typer.Option(
+        None, "--period", "-p", help="Group by period (week/month/year)."
+    ),
+    threshold: Optional[float] = typer.Option(
+        None,
+        "--threshold",
+        help="Retirement distance in km (defaults to each gear's max distance).",
+    ),
+    offline: bool = typer.Option(
+        False, "--offline", help="Use only stored gear links; make no API calls."
+    ),
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, "--workers", "-w", help="Concurrent gear lookups."
+    ),
+    store: Optional[str] = typer.Option(None, "--store", help="Local store path."),
+    tokenstore: Optional[str] = typer.Option(
+        None, "--tokenstore", help="Token storage path."
+    ),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format."),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file."),
+) -> None:
+    """Aggregate gear mileage from the local activity store."""
+    if period and period not in REPORT_PERIODS:
+        print_error(f"Invalid period: {period}. Use week/month/year.")
+        raise typer.Exit(1)
+    try:
+        start, end = resolve_bounds(start, end)
+        with Store(store) as db:
+            if not db.count_activities():
+                raise GarminCliError(
+                    "No activities in the local store. Run 'gc sync' first."
+                )
+            if not offline and db.activities_missing_gear(start, end):
+                client = load_client(tokenstore=tokenstore)
+                sync_activity_gear(client, db, start, end, workers=workers)
+            rows = db.gear_activities(start, end)
+        data = _aggregate_gear(rows, period=period, threshold_km=threshold)
+        render(data, fmt=fmt, title="Gear Report", output=output)
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
@@ -4,7 +4,7 @@ from typing import Optional
 
 import typer
 
-from ..api import api_call
+from ..api import api_call, api_range_call
 from ..auth import load_client
 from ..dates import resolve_date
 from ..errors import GarminCliError
@@ -59,7 +59,7 @@ def steps(
             data = api_call(client.get_weekly_steps, cdate, weeks)
             render(data, fmt=fmt, title="Weekly Steps", output=output)
         elif end_date:
-            data = api_call(client.get_daily_steps, cdate, end_date)
+            data = api_range_call(client.get_daily_steps, cdate, end_date)
             render(
                 data,
                 fmt=fmt,
@@ -4,7 +4,7 @@ from typing import Optional
 
 import typer
 
-from ..api import api_call
+from ..api import api_call, api_range_call
 from ..auth import load_client
 from ..dates import resolve_date
 from ..errors import GarminCliError
@@ -51,7 +51,7 @@ def calendar(
     """Show menstrual calendar data."""
     try:
         client = load_client(tokenstore=tokenstore)
-        data = api_call(client.get_menstrual_calendar_data, start, end)
+        data = api_range_call(client.get_menstrual_calendar_data, start, end)
         render(
             data, fmt=fmt, title=f"Menstrual Calendar ({start} to {end})", output=output
         )
@@ -0,0 +1,64 @@
+"""SQL over the local store."""
+
+import sqlite3
+from typing import Any, Iterator, Optional
+
+import typer
+
+from ..errors import GarminCliError
+from ..output import print_error, render
+from ..store import QUERY_VIEWS, connect_readonly
+
+
+def _schema(conn: sqlite3.Connection) -> list[dict[str, str]]:
+    rows = []
+    for view in QUERY_VIEWS:
+        columns = conn.execute(f"SELECT * FROM {view} LIMIT 0").description
+        rows.append({"view": view, "columns": ", ".join(c[0] for c in columns)})
+    return rows
+
+
+def _execute(conn: sqlite3.Connection, sql: str) -> sqlite3.Cursor:
+    try:
+        return conn.execute(sql)
+    except sqlite3.Error as e:
+        raise GarminCliError(f"Query failed: {e}") from e
+
+
+def _rows(cursor: sqlite3.Cursor, names: list[str]) -> Iterator[dict[str, Any]]:
+    """Result rows, fetched as they are rendered."""
+    try:
+        for row in cursor:
+            yield dict(zip(names, row))
+    except sqlite3.Error as e:
+        raise GarminCliError(f"Query failed: {e}") from e
+
+
+def query(
+    sql: Optional[str] = typer.Argument(
+        None, help="SELECT statement over the local store views."
+    ),
+    schema: bool = typer.Option(
+        False, "--schema", help="List the queryable views and their columns."
+    ),
+    store: Optional[str] = typer.Option(None, "--store", help="Local store path."),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format."),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file."),
+) -> None:
+    """Run read-only SQL against data synced with `gc sync`."""
+    if not sql and not schema:
+        raise typer.BadParameter("Give a SQL statement or --schema.")
+    try:
+        conn = connect_readonly(store)
+        try:
+            if schema:
+                render(_schema(conn), fmt=fmt, title="Views", output=output)
+            else:
+                cursor = _execute(conn, sql)
+                names = [c[0] for c in cursor.description or []]
+                render(_rows(cursor, names), fmt=fmt, columns=names, output=output)
+        finally:
+            conn.close()
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
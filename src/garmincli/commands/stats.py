@@ -0,0 +1,72 @@
+"""Per-endpoint API latency statistics from the local request log."""
+
+import re
+import time
+from typing import Optional
+
+import typer
+
+from ..output import print_error, render
+from ..stats import StatsLog, get_stats_path, summarize
+
+WINDOW_RE = re.compile(r"^(\d+)([mhd])$")
+WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+COLUMNS = [
+    "endpoint",
+    "calls",
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "error_rate",
+    "rate_429",
+    "cache_hit_rate",
+]
+
+
+def parse_window(value: str) -> Optional[float]:
+    """Window like 30m, 24h or 7d in seconds; None for "all"."""
+    if value == "all":
+        return None
+    match = WINDOW_RE.match(value.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise typer.BadParameter(
+            f"Invalid window: {value}. Use e.g. 30m, 24h, 7d or all."
+        )
+    return int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+
+
+def _rounded(row: dict) -> dict:
+    return {
+        k: round(v, 3 if "rate" in k else 1) if isinstance(v, float) else v
+        for k, v in row.items()
+    }
+
+
+def stats(
+    window: str = typer.Option(
+        "24h", "--window", "-w", help="Time window: 30m, 24h, 7d or all."
+    ),
+    endpoint: Optional[str] = typer.Option(
+        None, "--endpoint", "-e", help="Only endpoints containing this text."
+    ),
+    log: Optional[str] = typer.Option(None, "--log", help="Stats log path."),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format."),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file."),
+) -> None:
+    """Show API latency percentiles and error rates per endpoint."""
+    seconds = parse_window(window)
+    path = get_stats_path(log)
+    if path is None:
+        print_error("Request stats are disabled (GARMINCLI_STATS=off).")
+        raise typer.Exit(1)
+
+    since = time.time() - seconds if seconds else None
+    records = StatsLog(path).read(since)
+    if endpoint:
+        records = (r for r in records if endpoint in r.get("endpoint", ""))
+    rows = [_rounded(row) for row in summarize(records)]
+    if not rows:
+        print_error(f"No API calls logged in {path} for this window.")
+        raise typer.Exit(1)
+    render(rows, fmt=fmt, columns=COLUMNS, title=f"API stats ({window})", output=output)
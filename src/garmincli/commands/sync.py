@@ -0,0 +1,146 @@
+"""Sync Garmin Connect data into the local store."""
+
+from datetime import date, timedelta
+from typing import Any, Optional
+
+import typer
+
+from ..api import DAILY_DATASETS, DEFAULT_WORKERS, api_call, api_map, api_range_call
+from ..auth import load_client
+from ..dates import parse_date
+from ..errors import GarminCliError
+from ..output import print_error, render
+from ..store import Store
+
+PAGE_SIZE = 100
+# First daily sync without --since covers this many days.
+DAILY_BACKFILL_DAYS = 30
+
+
+def sync_activities(
+    client: Any, store: Store, full: bool = False, page_size: int = PAGE_SIZE
+) -> tuple[int, int]:
+    """Page through activities newest-first into the store.
+
+    Stops at the first page containing an already-stored activity unless
+    ``full`` is set. Returns (fetched, new).
+    """
+    fetched = new = 0
+    offset = 0
+    while True:
+        page = api_call(client.get_activities, offset, page_size)
+        if not page:
+            break
+        known = [store.has_activity(a["activityId"]) for a in page]
+        new += known.count(False)
+        fetched += store.upsert_activities(page)
+        if (not full and any(known)) or len(page) < page_size:
+            break
+        offset += page_size
+    return fetched, new
+
+
+def sync_activity_gear(
+    client: Any,
+    store: Store,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    workers: int = DEFAULT_WORKERS,
+) -> int:
+    """Fetch gear links only for activities that have never been looked up."""
+    missing = store.activities_missing_gear(start, end)
+    if not missing:
+        return 0
+    results = api_map(client.get_activity_gear, missing, workers=workers)
+    for activity_id, gear in zip(missing, results):
+        store.set_activity_gear(activity_id, gear or [])
+    return len(missing)
+
+
+def _days(start: date, end: date) -> list[str]:
+    return [
+        (start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)
+    ]
+
+
+def sync_daily(
+    client: Any,
+    store: Store,
+    since: Optional[str] = None,
+    workers: int = DEFAULT_WORKERS,
+) -> int:
+    """Fetch daily summaries, sleep, stress, HRV and weigh-ins into the store.
+
+    Without ``since`` each dataset resumes at its last stored day, which is
+    fetched again because Garmin keeps filling in the current day.
+    """
+    today = date.today()
+    stored = 0
+    weigh_in_start = today
+    for dataset, method in DAILY_DATASETS.items():
+        last = store.last_daily_date(dataset)
+        if since:
+            start = parse_date(since)
+        elif last:
+            start = parse_date(last)
+        else:
+            start = today - timedelta(days=DAILY_BACKFILL_DAYS - 1)
+        weigh_in_start = min(weigh_in_start, start)
+        days = _days(start, today)
+        payloads = api_map(getattr(client, method), days, workers=workers)
+        stored += store.upsert_daily(dataset, zip(days, payloads))
+
+    data = api_range_call(
+        client.get_weigh_ins, weigh_in_start.isoformat(), today.isoformat()
+    )
+    samples = [
+        sample
+        for summary in (data or {}).get("dailyWeightSummaries") or []
+        for sample in summary.get("allWeightMetrics") or []
+    ]
+    return stored + store.upsert_weigh_ins(samples)
+
+
+def sync(
+    full: bool = typer.Option(
+        False, "--full", help="Re-fetch all activities, not only new ones."
+    ),
+    gear: bool = typer.Option(
+        False, "--gear", help="Also fetch gear links for unlinked activities."
+    ),
+    daily: bool = typer.Option(
+        False,
+        "--daily",
+        help="Also sync daily summaries, sleep, stress, HRV and weigh-ins.",
+    ),
+    since: Optional[str] = typer.Option(
+        None, "--since", help="First day for --daily (default: resume)."
+    ),
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, "--workers", "-w", help="Concurrent requests."
+    ),
+    store: Optional[str] = typer.Option(None, "--store", help="Local store path."),
+    tokenstore: Optional[str] = typer.Option(
+        None, "--tokenstore", help="Token storage path."
+    ),
+    fmt: str = typer.Option("table", "--format", "-f", help="Output format."),
+) -> None:
+    """Sync activities (and optionally daily data) into the local store."""
+    try:
+        client = load_client(tokenstore=tokenstore)
+        with Store(store) as db:
+            fetched, new = sync_activities(client, db, full=full)
+            linked = sync_activity_gear(client, db, workers=workers) if gear else 0
+            days = sync_daily(client, db, since, workers=workers) if daily else 0
+            info = {
+                "Fetched": fetched,
+                "New": new,
+                "Gear Lookups": linked,
+                "Daily Records": days,
+                "Stored": db.count_activities(),
+                "Store": str(db.path),
+            }
+        render(info, fmt=fmt, title="Sync")
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
@@ -4,7 +4,7 @@ from typing import Optional
 
 import typer
 
-from ..api import api_call
+from ..api import api_call, api_range_call
 from ..auth import load_client
 from ..dates import resolve_date
 from ..errors import GarminCliError
@@ -71,7 +71,7 @@ def blood_pressure(
     try:
         client = load_client(tokenstore=tokenstore)
         cdate, end_date = resolve_date(date_shortcut, date, end=end)
-        data = api_call(client.get_blood_pressure, cdate, end_date)
+        data = api_range_call(client.get_blood_pressure, cdate, end_date)
         render(data, fmt=fmt, title=f"Blood Pressure ({cdate})", output=output)
     except GarminCliError as e:
         print_error(str(e))
@@ -0,0 +1,218 @@
+"""Poll Garmin Connect in one process and emit changes as NDJSON events."""
+
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Hashable, Optional
+
+import typer
+
+from ..api import api_call
+from ..auth import load_client
+from ..dates import parse_intervals
+from ..errors import GarminCliError
+from ..output import print_error
+
+ACTIVITY_WINDOW = 20
+WEIGHIN_DAYS = 7
+
+
+def digest(data: Any) -> str:
+    return hashlib.sha1(
+        json.dumps(data, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+@dataclass(frozen=True)
+class WatchSource:
+    """A pollable list of items.
+
+    ``probe`` is a cheap call whose result changes whenever the list does;
+    the full ``fetch`` only runs when the probe changed. Sources whose
+    fetch covers a moving window set ``track_removed=False`` so items that
+    slide out of it are not reported as removed.
+    """
+
+    name: str
+    interval: float
+    fetch: Callable[[Any], list[dict]]
+    key: Callable[[dict], Hashable]
+    probe: Optional[Callable[[Any], Any]] = None
+    track_removed: bool = True
+
+
+def _activities_probe(client: Any) -> Any:
+    latest = api_call(client.get_activities, 0, 1)
+    return [api_call(client.count_activities), [a.get("activityId") for a in latest]]
+
+
+def _weighins(client: Any) -> list[dict]:
+    end = date.today()
+    start = end - timedelta(days=WEIGHIN_DAYS - 1)
+    data = api_call(client.get_weigh_ins, start.isoformat(), end.isoformat()) or {}
+    items = []
+    for summary in data.get("dailyWeightSummaries") or []:
+        metrics = summary.get("allWeightMetrics") or [summary.get("latestWeight")]
+        items += [m for m in metrics if m]
+    return items
+
+
+SOURCES = {
+    source.name: source
+    for source in [
+        WatchSource(
+            "activities",
+            300,
+            fetch=lambda c: api_call(c.get_activities, 0, ACTIVITY_WINDOW) or [],
+            key=lambda item: item.get("activityId"),
+            probe=_activities_probe,
+            track_removed=False,
+        ),
+        WatchSource(
+            "weighins",
+            600,
+            fetch=_weighins,
+            key=lambda item: item.get("samplePk"),
+            track_removed=False,
+        ),
+        WatchSource(
+            "badges",
+            3600,
+            fetch=lambda c: api_call(c.get_earned_badges) or [],
+            key=lambda item: item.get("badgeId"),
+        ),
+    ]
+}
+
+
+@dataclass
+class WatchState:
+    probe: Optional[str] = None
+    payload: Optional[str] = None
+    items: Optional[dict[Hashable, str]] = None
+    fetches: int = 0
+    due: float = 0.0
+
+
+def _event(source: str, kind: str, **fields: Any) -> dict[str, Any]:
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": source,
+        "event": kind,
+        **fields,
+    }
+
+
+def poll(
+    source: WatchSource, state: WatchState, client: Any, initial: bool = False
+) -> list[dict[str, Any]]:
+    """Poll one source and return its change events.
+
+    The first poll only records a baseline unless ``initial`` is set.
+    """
+    probe = None
+    if source.probe is not None:
+        probe = digest(source.probe(client))
+        if probe == state.probe and state.items is not None:
+            return []
+
+    items = source.fetch(client)
+    state.fetches += 1
+    state.probe = probe
+    payload = digest(items)
+    if payload == state.payload:
+        return []
+    state.payload = payload
+
+    current = {}
+    by_key = {}
+    for item in items:
+        key = source.key(item)
+        current[key] = digest(item)
+        by_key[key] = item
+
+    previous = state.items
+    state.items = current
+    if previous is None:
+        if not initial:
+            return []
+        previous = {}
+
+    events = []
+    for key, item_hash in current.items():
+        if key not in previous:
+            events.append(_event(source.name, "added", key=key, item=by_key[key]))
+        elif previous[key] != item_hash:
+            events.append(_event(source.name, "changed", key=key, item=by_key[key]))
+    if source.track_removed:
+        for key in previous.keys() - current.keys():
+            events.append(_event(source.name, "removed", key=key))
+    return events
+
+
+def _emit(event: dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(event, default=str) + "\n")
+    sys.stdout.flush()
+
+
+def watch(
+    sources: Optional[list[str]] = typer.Argument(
+        None, help=f"Sources to watch: {', '.join(SOURCES)} (default: all)."
+    ),
+    interval: list[str] = typer.Option(
+        [],
+        "--interval",
+        help="Poll interval override, e.g. activities=60 (repeatable).",
+    ),
+    initial: bool = typer.Option(
+        False, "--initial", help="Emit existing items as 'added' on the first poll."
+    ),
+    count: Optional[int] = typer.Option(
+        None, "--count", "-n", help="Stop after this many polling rounds."
+    ),
+    tokenstore: Optional[str] = typer.Option(
+        None, "--tokenstore", help="Token storage path."
+    ),
+) -> None:
+    """Poll sources and print added/changed/removed items as NDJSON."""
+    names = sources or list(SOURCES)
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise typer.BadParameter(
+            f"Unknown source: {', '.join(unknown)}. Choose from: {', '.join(SOURCES)}."
+        )
+    overrides = parse_intervals(interval, names)
+
+    try:
+        client = load_client(tokenstore=tokenstore)
+    except GarminCliError as e:
+        print_error(str(e))
+        raise typer.Exit(1)
+
+    states = {name: WatchState() for name in names}
+    rounds = 0
+    try:
+        while True:
+            now = time.monotonic()
+            for name in names:
+                state = states[name]
+                if state.due > now:
+                    continue
+                source = SOURCES[name]
+                state.due = now + overrides.get(name, source.interval)
+                try:
+                    events = poll(source, state, client, initial=initial)
+                except GarminCliError as e:
+                    events = [_event(name, "error", error=str(e))]
+                for event in events:
+                    _emit(event)
+            rounds += 1
+            if count is not None and rounds >= count:
+                break
+            next_due = min(state.due for state in states.values())
+            time.sleep(max(0.0, next_due - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
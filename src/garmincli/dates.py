@@ -1,7 +1,9 @@
-"""Date parsing and shortcut handling."""
+"""Date parsing, shortcut handling and polling intervals."""
 
+import re
+from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Optional
+from typing import Iterable, Optional
 
 import typer
 
@@ -14,6 +16,24 @@ SHORTCUTS = {
     "month": lambda: (date.today() - timedelta(days=30), date.today()),
 }
 
+_LAST_RE = re.compile(r"^last-(\d+)([dwm])$")
+_WEEK_RE = re.compile(r"^(\d{4})-W(\d{2})$")
+_MONTH_RE = re.compile(r"^(\d{4})-(\d{2})$")
+_QUARTER_RE = re.compile(r"^(\d{4})-Q([1-4])$")
+_SINCE_PREFIX = "since:"
+_LAST_UNIT_DAYS = {"d": 1, "w": 7, "m": 30}
+
+# Maximum number of days Garmin Connect serves reliably in one request.
+RANGE_LIMITS = {
+    "get_daily_steps": 28,
+    "get_body_composition": 90,
+    "get_weigh_ins": 90,
+    "get_blood_pressure": 90,
+    "get_menstrual_calendar_data": 180,
+    "get_activities_by_date": 180,
+    "get_device_solar_data": 28,
+}
+
 
 def parse_date(value: str) -> date:
     """Parse a date string in YYYY-MM-DD format."""
@@ -30,6 +50,108 @@ def fmt(d: date) -> str:
     return d.strftime(DATE_FORMAT)
 
 
+@dataclass(frozen=True)
+class DateRange:
+    """A resolved, canonical date range (end is None for single dates)."""
+
+    start: date
+    end: Optional[date] = None
+
+    def as_strings(self) -> tuple[str, Optional[str]]:
+        return fmt(self.start), fmt(self.end) if self.end else None
+
+
+def _last_day_of_month(year: int, month: int) -> date:
+    if month == 12:
+        return date(year, 12, 31)
+    return date(year, month + 1, 1) - timedelta(days=1)
+
+
+def _bounded(value: str, start: date, end: date) -> DateRange:
+    """Clip ranges that extend into the future to today.
+
+    A range that has not started yet cannot be clipped and is rejected.
+    """
+    today = date.today()
+    if start > today:
+        raise typer.BadParameter(f"Range {value} starts after today ({fmt(today)}).")
+    return DateRange(start, min(end, today))
+
+
+def parse_range(value: str) -> Optional[DateRange]:
+    """Parse a date-range expression, or return None if it is not one.
+
+    Supported: the SHORTCUTS, last-<N>d/w/m (N days/weeks/months ending
+    today), ytd, ISO weeks (2025-W07), months (2025-03), quarters
+    (2025-Q1) and open-ended since:YYYY-MM-DD.
+    """
+    if value in SHORTCUTS:
+        d, end_d = SHORTCUTS[value]()
+        return DateRange(d, end_d)
+
+    today = date.today()
+    if value == "ytd":
+        return DateRange(date(today.year, 1, 1), today)
+
+    if value.startswith(_SINCE_PREFIX):
+        start = parse_date(value[len(_SINCE_PREFIX) :])
+        return _bounded(value, start, today)
+
+    match = _LAST_RE.match(value)
+    if match:
+        days = int(match.group(1)) * _LAST_UNIT_DAYS[match.group(2)]
+        if days < 1:
+            raise typer.BadParameter(f"Invalid range: {value}.")
+        return DateRange(today - timedelta(days=days - 1), today)
+
+    try:
+        match = _WEEK_RE.match(value)
+        if match:
+            year, week = int(match.group(1)), int(match.group(2))
+            start = date.fromisocalendar(year, week, 1)
+            return _bounded(value, start, start + timedelta(days=6))
+
+        match = _MONTH_RE.match(value)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            return _bounded(
+                value, date(year, month, 1), _last_day_of_month(year, month)
+            )
+
+        match = _QUARTER_RE.match(value)
+        if match:
+            year, quarter = int(match.group(1)), int(match.group(2))
+            first_month = 3 * (quarter - 1) + 1
+            return _bounded(
+                value,
+                date(year, first_month, 1),
+                _last_day_of_month(year, first_month + 2),
+            )
+    except ValueError:
+        raise typer.BadParameter(f"Invalid range: {value}.")
+
+    return None
+
+
+def resolve_range(
+    date_shortcut: Optional[str] = None,
+    date_str: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> DateRange:
+    """Resolve date arguments into a canonical DateRange."""
+    if date_shortcut:
+        return parse_range(date_shortcut) or DateRange(parse_date(date_shortcut))
+
+    if start and end:
+        return DateRange(parse_date(start), parse_date(end))
+
+    if date_str:
+        return parse_range(date_str) or DateRange(parse_date(date_str))
+
+    return DateRange(date.today())
+
+
 def resolve_date(
     date_shortcut: Optional[str] = None,
     date_str: Optional[str] = None,
@@ -41,21 +163,54 @@ def resolve_date(
     Returns a tuple of (start_date_str, end_date_str).
     end_date_str is None for single-date queries.
     """
-    if date_shortcut and date_shortcut in SHORTCUTS:
-        d, end_d = SHORTCUTS[date_shortcut]()
-        return fmt(d), fmt(end_d) if end_d else None
+    return resolve_range(date_shortcut, date_str, start, end).as_strings()
 
-    if date_shortcut:
-        d = parse_date(date_shortcut)
-        return fmt(d), None
 
-    if start and end:
-        return fmt(parse_date(start)), fmt(parse_date(end))
+def resolve_bounds(
+    start: Optional[str] = None, end: Optional[str] = None
+) -> tuple[Optional[str], Optional[str]]:
+    """Resolve optional --start/--end filters into date strings.
 
-    if date_str:
-        if date_str in SHORTCUTS:
-            d, end_d = SHORTCUTS[date_str]()
-            return fmt(d), fmt(end_d) if end_d else None
-        return fmt(parse_date(date_str)), None
-
-    return fmt(date.today()), None
+    Either may be a date, shortcut or range; a range bounds ``start`` by its
+    first day and ``end`` by its last. Unset bounds stay None.
+    """
+    first = resolve_range(date_str=start).start if start else None
+    last = resolve_range(date_str=end) if end else None
+    return (
+        fmt(first) if first else None,
+        fmt(last.end or last.start) if last else None,
+    )
+
+
+def parse_intervals(values: list[str], names: Iterable[str]) -> dict[str, float]:
+    """Parse repeated SOURCE=SECONDS options into {source: seconds}."""
+    names = set(names)
+    intervals = {}
+    for value in values:
+        name, _, seconds = value.partition("=")
+        if name not in names:
+            raise typer.BadParameter(
+                f"Unknown source: {name}. Choose from: {', '.join(sorted(names))}."
+            )
+        try:
+            intervals[name] = float(seconds)
+            if intervals[name] <= 0:
+                raise ValueError
+        except ValueError:
+            raise typer.BadParameter(f"Invalid interval: {value}. Use SOURCE=SECONDS.")
+    return intervals
+
+
+def plan_range(start: str, end: str, max_days: int) -> list[tuple[str, str]]:
+    """Split an inclusive date range into consecutive windows of max_days."""
+    current, last = parse_date(start), parse_date(end)
+    if current > last:
+        raise typer.BadParameter(f"Start date {start} is after end date {end}.")
+
+    chunks = []
+    step = timedelta(days=max_days - 1)
+    while current <= last:
+        chunk_end = min(current + step, last)
+        chunks.append((fmt(current), fmt(chunk_end)))
+        current = chunk_end + timedelta(days=1)
+    return chunks
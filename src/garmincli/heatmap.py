@@ -0,0 +1,268 @@
+"""Rasterize indexed tracks into Web Mercator heatmap tiles and images."""
+
+import json
+import math
+import sqlite3
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .errors import GarminCliError
+from .output import atomic_write
+
+TILE_SIZE = 256
+MAX_LATITUDE = 85.05112878
+DEFAULT_SATURATION = 10
+MAX_IMAGE_SIDE = 16_384
+IMAGE_MARGIN = 16
+MANIFEST_NAME = "heatmap.json"
+
+# (count level 0..1, RGBA) stops of the colour ramp: dark red to white.
+_RAMP = [
+    (0.0, (120, 0, 20, 150)),
+    (0.35, (220, 40, 20, 220)),
+    (0.7, (255, 190, 40, 255)),
+    (1.0, (255, 255, 230, 255)),
+]
+
+
+def require_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise GarminCliError(
+            "Heatmaps need numpy: pip install 'garmin-cli[heatmap]'"
+        ) from e
+    return numpy
+
+
+def parse_zooms(text: str) -> list[int]:
+    """``13`` or ``10-14``."""
+    try:
+        low, _, high = text.partition("-")
+        zooms = list(range(int(low), int(high or low) + 1))
+    except ValueError:
+        zooms = []
+    if not zooms or zooms[0] < 0 or zooms[-1] > 20:
+        raise GarminCliError(f"Invalid zoom '{text}'. Use Z or MIN-MAX within 0-20.")
+    return zooms
+
+
+def world_pixels(np: Any, points: Any, zoom: int) -> tuple[Any, Any]:
+    """Web Mercator pixel coordinates of (lat, lon) rows at ``zoom``."""
+    world = TILE_SIZE * 2**zoom
+    lat = np.radians(np.clip(points[:, 0], -MAX_LATITUDE, MAX_LATITUDE))
+    x = (points[:, 1] + 180.0) / 360.0 * world
+    y = (1.0 - np.arcsinh(np.tan(lat)) / math.pi) / 2.0 * world
+    return np.clip(x, 0, world - 1), np.clip(y, 0, world - 1)
+
+
+def track_pixels(np: Any, points: Any, zoom: int) -> Any:
+    """Unique pixels (``y * world + x``) crossed by a polyline.
+
+    Each segment is sampled at least once per pixel, all segments at once,
+    so a track costs a handful of array operations regardless of length.
+    """
+    x, y = world_pixels(np, np.asarray(points, dtype=np.float64), zoom)
+    dx, dy = np.diff(x), np.diff(y)
+    steps = np.maximum(np.ceil(np.maximum(np.abs(dx), np.abs(dy))), 1).astype(np.int64)
+    segment = np.repeat(np.arange(len(steps)), steps)
+    offset = np.arange(segment.size) - np.repeat(np.cumsum(steps) - steps, steps)
+    t = offset / steps[segment]
+    px = np.concatenate([x[:-1][segment] + dx[segment] * t, x[-1:]])
+    py = np.concatenate([y[:-1][segment] + dy[segment] * t, y[-1:]])
+    world = TILE_SIZE * 2**zoom
+    return np.unique(py.astype(np.int64) * world + px.astype(np.int64))
+
+
+def activity_tiles(task: tuple[int, str, list[int]]) -> list[tuple]:
+    """Heatmap rows (zoom, x, y, activity, pixels) for one track.
+
+    ``pixels`` holds the in-tile offsets as little-endian uint16, so a tile is
+    re-rendered from the stored rows without reading any track again. Runs in
+    worker processes.
+    """
+    np = require_numpy()
+    activity_id, points, zooms = task
+    polyline = np.asarray(json.loads(points), dtype=np.float64)
+    rows = []
+    for zoom in zooms:
+        world = TILE_SIZE * 2**zoom
+        pixels = track_pixels(np, polyline, zoom)
+        py, px = np.divmod(pixels, world)
+        tiles = (py // TILE_SIZE) * (2**zoom) + px // TILE_SIZE
+        local = ((py % TILE_SIZE) * TILE_SIZE + px % TILE_SIZE).astype("<u2")
+        order = np.argsort(tiles, kind="stable")
+        tiles, local = tiles[order], local[order]
+        keys, starts = np.unique(tiles, return_index=True)
+        for key, chunk in zip(keys, np.split(local, starts[1:])):
+            tile_y, tile_x = divmod(int(key), 2**zoom)
+            rows.append((zoom, tile_x, tile_y, activity_id, chunk.tobytes()))
+    return rows
+
+
+def palette(np: Any, saturation: int) -> Any:
+    """RGBA colour for each activity count from 0 to ``saturation``.
+
+    Counts sit on a fixed log scale that does not depend on the other tiles,
+    which is what lets a tile be re-rendered on its own.
+    """
+    saturation = max(saturation, 1)
+    levels = np.log1p(np.arange(saturation + 1)) / math.log1p(saturation)
+    stops = [s[0] for s in _RAMP]
+    channels = [np.interp(levels, stops, [s[1][c] for s in _RAMP]) for c in range(4)]
+    colours = np.stack(channels, axis=1).astype(np.uint8)
+    colours[0] = 0  # transparent where nothing was recorded
+    return colours
+
+
+def colorize(np: Any, counts: Any, saturation: int) -> Any:
+    """RGBA image of activity counts."""
+    colours = palette(np, saturation).view("<u4")[:, 0]  # one lookup per pixel
+    pixels = np.take(colours, np.minimum(counts, max(saturation, 1)))
+    return pixels.view(np.uint8).reshape(*counts.shape, 4)
+
+
+def encode_png(np: Any, rgba: Any) -> bytes:
+    """8-bit RGBA PNG using only zlib."""
+    height, width, _ = rgba.shape
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)  # filter byte 0
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw.tobytes(), 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(f"{Path(db_path).as_uri()}?mode=ro", uri=True)
+
+
+def _tile_counts(np: Any, conn: sqlite3.Connection, zoom: int, x: int, y: int) -> Any:
+    blobs = conn.execute(
+        "SELECT pixels FROM heatmap_pixels WHERE zoom = ? AND tile_x = ? AND tile_y = ?",
+        (zoom, x, y),
+    )
+    offsets = np.frombuffer(b"".join(row[0] for row in blobs), dtype="<u2")
+    counts = np.bincount(offsets, minlength=TILE_SIZE * TILE_SIZE)
+    return counts.reshape(TILE_SIZE, TILE_SIZE)
+
+
+def render_tiles(task: tuple[str, list[tuple[int, int, int]], str, int]) -> int:
+    """Write ``{z}/{x}/{y}.png`` for a batch of tiles (runs in worker processes).
+
+    Tiles left without any track are removed.
+    """
+    np = require_numpy()
+    db_path, tiles, directory, saturation = task
+    conn = _connect(db_path)
+    try:
+        for zoom, x, y in tiles:
+            path = Path(directory, str(zoom), str(x), f"{y}.png")
+            counts = _tile_counts(np, conn, zoom, x, y)
+            if not counts.any():
+                path.unlink(missing_ok=True)
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, encode_png(np, colorize(np, counts, saturation)))
+    finally:
+        conn.close()
+    return len(tiles)
+
+
+def tile_counts(task: tuple[str, list[tuple[int, int, int]]]) -> list[tuple]:
+    """Per-tile count arrays for a batch of tiles (runs in worker processes)."""
+    np = require_numpy()
+    db_path, tiles = task
+    conn = _connect(db_path)
+    try:
+        return [(x, y, _tile_counts(np, conn, zoom, x, y)) for zoom, x, y in tiles]
+    finally:
+        conn.close()
+
+
+def image(
+    counts: Iterable[tuple[int, int, Any]],
+    tiles: list[tuple[int, int, int]],
+    saturation: int,
+) -> bytes:
+    """One PNG covering ``tiles``, cropped to the drawn area."""
+    np = require_numpy()
+    xs = [x for _, x, _ in tiles]
+    ys = [y for _, _, y in tiles]
+    width = (max(xs) - min(xs) + 1) * TILE_SIZE
+    height = (max(ys) - min(ys) + 1) * TILE_SIZE
+    if max(width, height) > MAX_IMAGE_SIDE:
+        raise GarminCliError(
+            f"The image would be {width}x{height} pixels; use a lower --zoom"
+            " or write tiles to a directory."
+        )
+    canvas = np.zeros((height, width), dtype=np.int64)
+    for x, y, tile in counts:
+        top, left = (y - min(ys)) * TILE_SIZE, (x - min(xs)) * TILE_SIZE
+        canvas[top : top + TILE_SIZE, left : left + TILE_SIZE] = tile
+    rows = np.flatnonzero(canvas.any(axis=1))
+    cols = np.flatnonzero(canvas.any(axis=0))
+    canvas = canvas[
+        max(rows[0] - IMAGE_MARGIN, 0) : rows[-1] + IMAGE_MARGIN + 1,
+        max(cols[0] - IMAGE_MARGIN, 0) : cols[-1] + IMAGE_MARGIN + 1,
+    ]
+    return encode_png(np, colorize(np, canvas, saturation))
+
+
+def batches(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def missing_tiles(
+    tiles: Iterable[tuple[int, int, int]], directory: str
+) -> list[tuple[int, int, int]]:
+    """Tiles without a PNG in ``directory`` yet."""
+    return [
+        (z, x, y)
+        for z, x, y in tiles
+        if not Path(directory, str(z), str(x), f"{y}.png").exists()
+    ]
+
+
+def _style(saturation: int) -> dict[str, Any]:
+    """Everything besides the pixels that decides how a tile looks."""
+    return json.loads(json.dumps({"saturation": saturation, "ramp": _RAMP}))
+
+
+def rendered_generations(directory: str, saturation: int) -> dict[int, int]:
+    """Store generation each zoom in ``directory`` was drawn at, per its manifest.
+
+    Empty when there is no manifest or its tiles were drawn in another style,
+    so that every tile is drawn again.
+    """
+    try:
+        manifest = json.loads(Path(directory, MANIFEST_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("style") != _style(saturation):
+        return {}
+    return {int(z): g for z, g in (manifest.get("generations") or {}).items()}
+
+
+def write_manifest(
+    directory: str, saturation: int, generations: dict[int, int]
+) -> None:
+    """Record the style and store generation the tiles in ``directory`` show."""
+    path = Path(directory, MANIFEST_NAME)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "style": _style(saturation),
+        "generations": {str(z): g for z, g in sorted(generations.items())},
+    }
+    atomic_write(path, json.dumps(manifest, indent=2).encode())
@@ -1,11 +1,32 @@
-"""Output formatting for JSON and Rich tables."""
+"""Output formatting for JSON, Rich tables and row/columnar files."""
 
+import datetime
+import gzip
+import io
+import itertools
 import json
-from typing import Any, Optional
+import lzma
+import math
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, Optional, TextIO, Union
 
 from rich.console import Console
 from rich.table import Table
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from .errors import GarminCliError
+from .profiling import get_profiler
+from .projection import get_projection
+
 _CONSOLE_KWARGS = {
     "color_system": None,
     "no_color": True,
@@ -14,18 +35,259 @@ _CONSOLE_KWARGS = {
     "width": 200,
 }
 
-console = Console(**_CONSOLE_KWARGS)
-err_console = Console(stderr=True, **_CONSOLE_KWARGS)
+# Compressed output is fed to the compressor in slices of this size.
+WRITE_CHUNK = 1 << 20
+
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+_capture = threading.local()
+_json_style = threading.local()
+
+
+class _Stream:
+    """Write to the current thread's capture buffer, else the real stream."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def _target(self) -> TextIO:
+        buffer = getattr(_capture, self.name, None)
+        return buffer if buffer is not None else getattr(sys, self.name)
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return self._target().isatty()
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self._target(), "encoding", None) or "utf-8"
+
+
+console = Console(file=_Stream("stdout"), **_CONSOLE_KWARGS)
+err_console = Console(file=_Stream("stderr"), **_CONSOLE_KWARGS)
+
+
+@contextmanager
+def capture_output() -> Iterator[tuple[io.StringIO, io.StringIO]]:
+    """Collect console output of the current thread into (stdout, stderr)."""
+    out, err = io.StringIO(), io.StringIO()
+    _capture.stdout, _capture.stderr = out, err
+    try:
+        yield out, err
+    finally:
+        _capture.stdout = _capture.stderr = None
+
+
+@contextmanager
+def atomic_open(
+    path: Union[str, Path], mode: Optional[int] = None, sync: bool = False
+) -> Iterator[BinaryIO]:
+    """Open a temp file next to ``path`` that replaces it only on success.
+
+    The file gets permission bits ``mode`` (default: what the umask allows);
+    ``sync`` flushes it to disk before the rename.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        # mkstemp files are owner-only
+        os.chmod(tmp, 0o666 & ~_UMASK if mode is None else mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _zstd_writer(f: BinaryIO) -> BinaryIO:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise GarminCliError(
+            "Writing .zst files needs zstandard: pip install 'garmin-cli[zstd]'"
+        ) from e
+    return zstandard.ZstdCompressor().stream_writer(f, closefd=False)
+
+
+# Compressors by --output suffix; none of them close the file they wrap.
+COMPRESSORS: dict[str, Callable[[BinaryIO], BinaryIO]] = {
+    ".gz": lambda f: gzip.GzipFile(fileobj=f, mode="wb", mtime=0),
+    ".xz": lambda f: lzma.LZMAFile(f, "wb"),
+    ".zst": _zstd_writer,
+}
+
+
+@contextmanager
+def open_output(path: Union[str, Path]) -> Iterator[BinaryIO]:
+    """Atomically write ``path``, compressing while writing for .gz/.xz/.zst."""
+    path = Path(path)
+    compressor = COMPRESSORS.get(path.suffix.lower())
+    try:
+        with atomic_open(path) as raw:
+            if compressor is None:
+                yield raw
+            else:
+                with compressor(raw) as f:
+                    yield f
+    except OSError as e:
+        raise GarminCliError(f"Cannot write {path}: {e}") from e
+
+
+@contextmanager
+def open_text_output(path: Union[str, Path]) -> Iterator[TextIO]:
+    """``open_output`` for text, UTF-8 encoded."""
+    with open_output(path) as f:
+        with io.TextIOWrapper(f, encoding="utf-8", newline="") as text:
+            yield text
+
+
+def atomic_write(
+    path: Union[str, Path], data: bytes, mode: Optional[int] = None, sync: bool = False
+) -> None:
+    """Write ``data`` via a temp file and rename; readers never see a partial file.
+
+    ``mode`` and ``sync`` are passed to ``atomic_open``.
+    """
+    with atomic_open(path, mode, sync) as f:
+        f.write(data)
+
+
+def binary_stdout() -> BinaryIO:
+    """Raw stdout for binary formats; refuses terminals and captured output."""
+    stream = getattr(_capture, "stdout", None) or sys.stdout
+    buffer = getattr(stream, "buffer", None)
+    if buffer is None or stream.isatty():
+        raise GarminCliError("Binary output needs --output FILE or a pipe.")
+    stream.flush()
+    return buffer
+
+
+def _json_default(value: Any) -> Any:
+    """Like orjson: ISO 8601 for dates and times, ``str()`` for the rest."""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _finite(data: Any) -> Any:
+    """``data`` with NaN and infinities as None, as orjson writes them."""
+    if isinstance(data, float):
+        return data if math.isfinite(data) else None
+    if isinstance(data, dict):
+        return {key: _finite(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_finite(value) for value in data]
+    return data
+
+
+def _stdlib_dumps(data: Any, compact: bool) -> bytes:
+    """The same bytes orjson produces, for when it is not installed."""
+    layout: dict[str, Any] = {"separators": (",", ":")} if compact else {"indent": 2}
+    options = {"default": _json_default, "ensure_ascii": False, **layout}
+    try:
+        text = json.dumps(data, allow_nan=False, **options)
+    except ValueError:  # NaN or infinity somewhere; rare, so walk only then
+        text = json.dumps(_finite(data), allow_nan=False, **options)
+    return text.encode()
+
+
+def _orjson_dumps(data: Any, compact: bool) -> bytes:
+    options = orjson.OPT_NON_STR_KEYS
+    if not compact:
+        options |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(data, default=str, option=options)
+    except (orjson.JSONEncodeError, TypeError):
+        # e.g. integers beyond 64 bits, which the stdlib handles
+        return _stdlib_dumps(data, compact)
+
+
+dumps_json = _orjson_dumps if orjson is not None else _stdlib_dumps
+
+
+def set_compact_json(compact: bool) -> None:
+    """Emit single-line JSON from this thread (the global --compact flag)."""
+    _json_style.compact = compact
+
+
+def write_stdout(data: bytes) -> None:
+    """Write encoded output to stdout (or the capture buffer) without Rich."""
+    captured = getattr(_capture, "stdout", None)
+    if captured is not None:
+        captured.write(data.decode())
+        return
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(data.decode())
+    else:
+        sys.stdout.flush()
+        buffer.write(data)
+    sys.stdout.flush()
+
+
+def _json_array(items: Iterator[Any], compact: bool) -> Iterator[bytes]:
+    """A JSON array encoded item by item, laid out like ``dumps_json``."""
+    opening, separator, closing = (
+        (b"[", b",", b"]") if compact else (b"[\n  ", b",\n  ", b"\n]")
+    )
+    empty = True
+    for item in items:
+        encoded = dumps_json(item, compact)
+        if not compact:
+            encoded = encoded.replace(b"\n", b"\n  ")
+        yield (opening if empty else separator) + encoded
+        empty = False
+    yield b"[]" if empty else closing
+
+
+def _chunks(parts: Iterator[bytes]) -> Iterator[bytes]:
+    buffered: list[bytes] = []
+    size = 0
+    for part in parts:
+        buffered.append(part)
+        size += len(part)
+        if size >= WRITE_CHUNK:
+            yield b"".join(buffered)
+            buffered, size = [], 0
+    yield b"".join(buffered)
 
 
 def print_json(data: Any, output: Optional[str] = None) -> None:
-    """Print data as formatted JSON."""
-    text = json.dumps(data, default=str, indent=2)
+    """Print data as JSON, bypassing Rich (orjson when installed).
+
+    An iterator (e.g. rows from a database cursor) is written as an array
+    one item at a time instead of being collected first.
+    """
+    compact = getattr(_json_style, "compact", False)
+    if isinstance(data, Iterator):
+        parts = _chunks(itertools.chain(_json_array(data, compact), [b"\n"]))
+    else:
+        encoded = dumps_json(data, compact) + b"\n"
+        if not output:
+            # Captured output is decoded per write, so keep characters whole.
+            write_stdout(encoded)
+            return
+        parts = (
+            encoded[start : start + WRITE_CHUNK]
+            for start in range(0, len(encoded), WRITE_CHUNK)
+        )
     if output:
-        with open(output, "w") as f:
-            f.write(text)
+        with open_output(output) as f:
+            for part in parts:
+                f.write(part)
     else:
-        console.print(text)
+        for part in parts:
+            write_stdout(part)
 
 
 def print_table(
@@ -98,7 +360,7 @@ def _print_list_table(
 def _output_table(table: Table, output: Optional[str] = None) -> None:
     """Output table to console or file."""
     if output:
-        with open(output, "w") as f:
+        with open_text_output(output) as f:
             file_console = Console(file=f, **_CONSOLE_KWARGS)
             file_console.print(table)
     else:
@@ -125,12 +387,86 @@ def render(
     output: Optional[str] = None,
 ) -> None:
     """Render data in the specified format."""
+    projection = get_projection()
+    if projection is not None:
+        data = projection.apply(data)
+        if projection.fields:
+            columns = None
+    profiler = get_profiler()
+    if profiler is None:
+        _render(data, fmt, columns, title, output)
+        return
+    with profiler.span("render", fmt, title=title):
+        _render(data, fmt, columns, title, output)
+
+
+def _render(
+    data: Any,
+    fmt: str,
+    columns: Optional[list[str]],
+    title: Optional[str],
+    output: Optional[str],
+) -> None:
+    if isinstance(data, Iterator) and fmt not in ("json", "csv", "tsv"):
+        data = list(data)  # only JSON and CSV/TSV are written row by row
     if fmt == "json":
         print_json(data, output=output)
+    elif fmt in ("csv", "tsv"):
+        from .tabular import write_delimited
+
+        write_delimited(data, fmt, output, columns)
+    elif fmt in ("parquet", "arrow"):
+        from .tabular import write_columnar
+
+        write_columnar(data, fmt, output, columns)
     else:
         print_table(data, columns=columns, title=title, output=output)
 
 
+def print_profile(report: dict[str, Any], output: Optional[str] = None) -> None:
+    """Print a --profile report to stderr, or write it as JSON to a file."""
+    if output:
+        with open_text_output(output) as f:
+            json.dump(report, f, default=str, indent=2)
+        return
+
+    phases = _new_table(title="Profile", show_header=True)
+    for col in ("phase", "count", "ms"):
+        phases.add_column(col)
+    phases.add_row("wall", "-", f"{report['wall_ms']:.1f}")
+    for name, phase in report["phases"].items():
+        phases.add_row(name, str(phase["count"]), f"{phase['ms']:.1f}")
+    err_console.print(phases)
+
+    if not report["endpoints"]:
+        return
+    endpoints = _new_table(title="Endpoints", show_header=True)
+    columns = [
+        "endpoint",
+        "calls",
+        "ms",
+        "mean_ms",
+        "max_ms",
+        "http_requests",
+        "http_ms",
+        "bytes",
+        "retries",
+        "cache_hits",
+        "cache_misses",
+        "errors",
+    ]
+    for col in columns:
+        endpoints.add_column(col)
+    for stats in report["endpoints"]:
+        endpoints.add_row(
+            *(
+                f"{stats[c]:.1f}" if isinstance(stats[c], float) else str(stats[c])
+                for c in columns
+            )
+        )
+    err_console.print(endpoints)
+
+
 def print_error(message: str) -> None:
     """Print an error message."""
     err_console.print(f"[red]Error:[/red] {message}")
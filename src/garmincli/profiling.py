@@ -0,0 +1,165 @@
+"""Hot-path timing for --profile: token load, API calls, HTTP and rendering."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+MAX_ARGS_LENGTH = 120
+
+
+def describe_args(args: tuple, kwargs: dict) -> str:
+    """Short, printable summary of call arguments."""
+    parts = [repr(a) for a in args]
+    parts += [f"{k}={v!r}" for k, v in kwargs.items()]
+    text = ", ".join(parts)
+    if len(text) > MAX_ARGS_LENGTH:
+        text = text[: MAX_ARGS_LENGTH - 3] + "..."
+    return text
+
+
+class Profiler:
+    """Collects timing spans and per-request HTTP statistics."""
+
+    def __init__(self, keep_spans: bool = True) -> None:
+        self.started = time.perf_counter()
+        self.keep_spans = keep_spans
+        self.listeners: list[Callable[[dict[str, Any]], None]] = []
+        self.spans: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, kind: str, name: str, **fields: Any) -> Iterator[dict[str, Any]]:
+        """Time a block; HTTP responses seen inside it are attributed to it."""
+        record: dict[str, Any] = {
+            "kind": kind,
+            "name": name,
+            **fields,
+            "http_requests": 0,
+            "http_ms": 0.0,
+            "bytes": 0,
+            "retries": 0,
+        }
+        parent = getattr(self._local, "current", None)
+        self._local.current = record
+        start = time.perf_counter()
+        suspended = False
+        try:
+            yield record
+        except BaseException as e:
+            # The asyncio backend runs a suspended call again in full.
+            suspended = getattr(e, "suspends_call", False)
+            record["error"] = type(e).__name__
+            raise
+        finally:
+            record["ms"] = (time.perf_counter() - start) * 1000
+            self._local.current = parent
+            if not suspended:
+                for listener in self.listeners:
+                    listener(record)
+                if self.keep_spans:
+                    with self._lock:
+                        self.spans.append(record)
+
+    def on_response(self, response: Any, *args: Any, **kwargs: Any) -> None:
+        """requests response hook: add HTTP stats to the active span."""
+        record = getattr(self._local, "current", None)
+        if record is None:
+            return
+        record["http_requests"] += 1
+        record["http_ms"] += response.elapsed.total_seconds() * 1000
+        record["bytes"] += len(response.content or b"")
+        record["status"] = response.status_code
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        record["retries"] += len(getattr(retries, "history", ()) or ())
+
+    def attach(self, session: Any) -> None:
+        """Install the response hook on a requests session (once)."""
+        hooks = session.hooks.setdefault("response", [])
+        if self.on_response not in hooks:
+            hooks.append(self.on_response)
+
+    def report(self) -> dict[str, Any]:
+        """Aggregate spans into phase totals and per-endpoint statistics."""
+        with self._lock:
+            spans = list(self.spans)
+
+        phases: dict[str, dict[str, Any]] = {}
+        endpoints: dict[str, dict[str, Any]] = {}
+        for span in spans:
+            phase = phases.setdefault(span["kind"], {"count": 0, "ms": 0.0})
+            phase["count"] += 1
+            phase["ms"] += span["ms"]
+            if span["kind"] != "api":
+                continue
+            stats = endpoints.setdefault(
+                span["name"],
+                {
+                    "endpoint": span["name"],
+                    "calls": 0,
+                    "ms": 0.0,
+                    "max_ms": 0.0,
+                    "http_requests": 0,
+                    "http_ms": 0.0,
+                    "bytes": 0,
+                    "retries": 0,
+                    "cache_hits": 0,
+                    "cache_misses": 0,
+                    "errors": 0,
+                },
+            )
+            stats["calls"] += 1
+            stats["ms"] += span["ms"]
+            stats["max_ms"] = max(stats["max_ms"], span["ms"])
+            for key in ("http_requests", "http_ms", "bytes", "retries"):
+                stats[key] += span[key]
+            if span.get("cache") == "hit":
+                stats["cache_hits"] += 1
+            elif span.get("cache") == "miss":
+                stats["cache_misses"] += 1
+            stats["errors"] += "error" in span
+
+        for stats in endpoints.values():
+            stats["mean_ms"] = stats["ms"] / stats["calls"]
+        return {
+            "wall_ms": (time.perf_counter() - self.started) * 1000,
+            "phases": phases,
+            "endpoints": sorted(endpoints.values(), key=lambda s: -s["ms"]),
+            "spans": spans,
+        }
+
+
+_profiler: Optional[Profiler] = None
+
+
+def enable_profiling() -> Profiler:
+    """Start collecting spans for this process (idempotent)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    _profiler.keep_spans = True
+    return _profiler
+
+
+def add_span_listener(listener: Callable[[dict[str, Any]], None]) -> Profiler:
+    """Call ``listener(span)`` for every finished span.
+
+    Spans are timed from now on even without --profile, but only kept for
+    a report once profiling is enabled.
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(keep_spans=False)
+    if listener not in _profiler.listeners:
+        _profiler.listeners.append(listener)
+    return _profiler
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _profiler
+
+
+def disable_profiling() -> None:
+    global _profiler
+    _profiler = None
@@ -0,0 +1,167 @@
+"""Field projection (--fields) and row filtering (--where) before rendering."""
+
+import operator
+import re
+import shlex
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+from .errors import GarminCliError
+
+Getter = Callable[[Any], Any]
+Predicate = Callable[[dict], bool]
+
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "~": lambda value, needle: str(needle).lower() in str(value).lower(),
+}
+_LITERALS = {"true": True, "false": False, "null": None}
+_NUMBER_RE = re.compile(r"^-?\d+(\.\d+)?$")
+
+_state = threading.local()
+
+
+def compile_path(path: str) -> Getter:
+    """Accessor for a dotted path; missing steps yield None."""
+    steps = path.split(".")
+
+    def get(record: Any) -> Any:
+        for step in steps:
+            if isinstance(record, dict):
+                record = record.get(step)
+            elif isinstance(record, list) and step.isdigit():
+                index = int(step)
+                record = record[index] if index < len(record) else None
+            else:
+                return None
+        return record
+
+    return get
+
+
+def _literal(token: str, quoted: bool) -> Any:
+    if quoted:
+        return token
+    if token in _LITERALS:
+        return _LITERALS[token]
+    if _NUMBER_RE.match(token):
+        return float(token) if "." in token else int(token)
+    return token
+
+
+def _compare(op: Callable[[Any, Any], bool], left: Any, right: Any) -> bool:
+    if op in (operator.eq, operator.ne):
+        return op(left, right)
+    if left is None or right is None:
+        return False
+    try:
+        return op(left, right)
+    except TypeError:
+        return op(str(left), str(right))
+
+
+def _condition(tokens: list[tuple[str, bool]], expression: str) -> Predicate:
+    if len(tokens) != 3 or tokens[1][0] not in _OPERATORS or tokens[1][1]:
+        raise GarminCliError(
+            f"Invalid --where condition in {expression!r}; expected "
+            f"'path OP value' with OP one of {' '.join(_OPERATORS)}."
+        )
+    get = compile_path(tokens[0][0])
+    op = _OPERATORS[tokens[1][0]]
+    value = _literal(*tokens[2])
+    return lambda record: _compare(op, get(record), value)
+
+
+def _tokens(expression: str) -> list[tuple[str, bool]]:
+    lexer = shlex.shlex(expression, posix=False, punctuation_chars="<>=!~")
+    lexer.whitespace_split = False
+    try:
+        raw = list(lexer)
+    except ValueError as e:
+        raise GarminCliError(f"Invalid --where {expression!r}: {e}") from e
+    tokens = []
+    for token in raw:
+        quoted = len(token) >= 2 and token[0] == token[-1] and token[0] in "'\""
+        tokens.append((token[1:-1] if quoted else token, quoted))
+    return tokens
+
+
+def compile_where(expression: str) -> Predicate:
+    """Compile ``a > 1 and b ~ run or c == 'x'`` (``and`` binds tighter)."""
+    alternatives: list[list[Predicate]] = [[]]
+    current: list[tuple[str, bool]] = []
+    for token, quoted in [*_tokens(expression), ("or", False)]:
+        if not quoted and token in ("and", "or"):
+            alternatives[-1].append(_condition(current, expression))
+            current = []
+            if token == "or":
+                alternatives.append([])
+        else:
+            current.append((token, quoted))
+    alternatives.pop()
+
+    return lambda record: any(all(c(record) for c in conds) for conds in alternatives)
+
+
+class Projection:
+    """Compiled --fields and --where, applied to a payload once."""
+
+    def __init__(
+        self, fields: Optional[list[str]] = None, where: Optional[list[str]] = None
+    ) -> None:
+        self.fields = [f.strip() for spec in fields or [] for f in spec.split(",")]
+        self.fields = [f for f in self.fields if f]
+        self._getters = [(f, compile_path(f)) for f in self.fields]
+        self._predicates = [compile_where(w) for w in where or []]
+
+    def matches(self, record: Any) -> bool:
+        return isinstance(record, dict) and all(p(record) for p in self._predicates)
+
+    def project(self, record: Any) -> Any:
+        if not self._getters or not isinstance(record, dict):
+            return record
+        return {field: get(record) for field, get in self._getters}
+
+    def apply(self, data: Any) -> Any:
+        """Filter list items with --where, then keep only --fields.
+
+        A dict wrapping a list of records (e.g. ``dailyWeightSummaries``) is
+        treated as that list, the same way tables and CSV unwrap it.
+        """
+        from .tabular import wrapped_records
+
+        if isinstance(data, Iterator):
+            return (
+                self.project(item)
+                for item in data
+                if not self._predicates or self.matches(item)
+            )
+        if isinstance(data, dict):
+            records = wrapped_records(data)
+            if records is not None:
+                data = records
+            elif self._predicates:
+                raise GarminCliError(
+                    "--where filters lists of records, but this command returns"
+                    " a single object; use --fields to pick values from it."
+                )
+        if isinstance(data, list):
+            if self._predicates:
+                data = [item for item in data if self.matches(item)]
+            return [self.project(item) for item in data]
+        return self.project(data)
+
+
+def set_projection(projection: Optional[Projection]) -> None:
+    """Project everything this thread renders (None disables)."""
+    _state.projection = projection
+
+
+def get_projection() -> Optional[Projection]:
+    return getattr(_state, "projection", None)
@@ -0,0 +1,179 @@
+"""Persistent per-request API timing log, aggregated by `gc stats`."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from .profiling import add_span_listener
+
+STATS_ENV = "GARMINCLI_STATS"
+DISABLED_VALUES = ("0", "off", "false", "no")
+MAX_BYTES = 2_000_000
+BACKUPS = 3
+
+
+def get_stats_path(path: Optional[str] = None) -> Optional[Path]:
+    """Resolve the stats log path; None when logging is disabled.
+
+    Priority:
+    1. Explicit path argument
+    2. GARMINCLI_STATS environment variable ("off" disables logging)
+    3. Fallback: ~/.config/garmin-cli/stats.log
+    """
+    if path:
+        return Path(path).expanduser().resolve()
+
+    env = os.environ.get(STATS_ENV)
+    if env:
+        if env.lower() in DISABLED_VALUES:
+            return None
+        return Path(env).expanduser().resolve()
+
+    return Path.home() / ".config" / "garmin-cli" / "stats.log"
+
+
+def record_from_span(span: dict[str, Any]) -> dict[str, Any]:
+    """Compact log record for one api_call span."""
+    record = {
+        "ts": round(time.time(), 3),
+        "endpoint": span["name"],
+        "ms": round(span["ms"], 1),
+        "status": span.get("status"),
+        "bytes": span["bytes"],
+        "http": span["http_requests"],
+        "retries": span["retries"],
+        "cache": span.get("cache"),
+        "error": span.get("error"),
+    }
+    return {k: v for k, v in record.items() if v is not None}
+
+
+class StatsLog:
+    """Append-only NDJSON log rotated at ``max_bytes`` into ``.1`` .. ``.N``."""
+
+    def __init__(
+        self, path: Path, max_bytes: int = MAX_BYTES, backups: int = BACKUPS
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def files(self) -> list[Path]:
+        """Log files from oldest to newest."""
+        rotated = [
+            self.path.with_name(f"{self.path.name}.{i}")
+            for i in range(self.backups, 0, -1)
+        ]
+        return [p for p in [*rotated, self.path] if p.exists()]
+
+    def _rotate(self) -> None:
+        for i in range(self.backups - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{i}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Append a record; logging failures never break the command."""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    size = self.path.stat().st_size
+                except FileNotFoundError:
+                    size = 0
+                if size and size + len(line) > self.max_bytes:
+                    self._rotate()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError:
+                pass
+
+    def on_span(self, span: dict[str, Any]) -> None:
+        if span["kind"] == "api":
+            self.write(record_from_span(span))
+
+    def read(self, since: Optional[float] = None) -> Iterator[dict[str, Any]]:
+        """Yield records (oldest first) newer than the ``since`` timestamp."""
+        for path in self.files():
+            try:
+                f = open(path, encoding="utf-8")
+            except FileNotFoundError:
+                continue  # rotated away by another process
+            with f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn write
+                    if since is None or record.get("ts", 0) >= since:
+                        yield record
+
+
+_log: Optional[StatsLog] = None
+
+
+def enable_stats_log() -> Optional[StatsLog]:
+    """Log every api_call of this process (idempotent; honours GARMINCLI_STATS)."""
+    global _log
+    if _log is None:
+        path = get_stats_path()
+        if path is None:
+            return None
+        _log = StatsLog(path)
+        add_span_listener(_log.on_span)
+    return _log
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    index = max(0, min(len(ordered) - 1, -(-len(ordered) * pct // 100) - 1))
+    return ordered[int(index)]
+
+
+def _is_throttled(record: dict[str, Any]) -> bool:
+    return record.get("status") == 429 or record.get("error") == "RateLimitError"
+
+
+def _is_error(record: dict[str, Any]) -> bool:
+    return "error" in record or record.get("status", 0) >= 400
+
+
+def summarize(records: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Per-endpoint latency percentiles and error, 429 and cache-hit rates.
+
+    Latency percentiles cover calls that reached the API; cache hits are
+    only counted.
+    """
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(record.get("endpoint", "?"), []).append(record)
+
+    rows = []
+    for endpoint, calls in groups.items():
+        fetched = [r for r in calls if r.get("cache") != "hit"] or calls
+        latencies = sorted(r.get("ms", 0.0) for r in fetched)
+        rows.append(
+            {
+                "endpoint": endpoint,
+                "calls": len(calls),
+                "p50_ms": _percentile(latencies, 50),
+                "p95_ms": _percentile(latencies, 95),
+                "p99_ms": _percentile(latencies, 99),
+                "max_ms": latencies[-1],
+                "error_rate": sum(map(_is_error, calls)) / len(calls),
+                "rate_429": sum(map(_is_throttled, calls)) / len(calls),
+                "cache_hit_rate": sum(r.get("cache") == "hit" for r in calls)
+                / len(calls),
+                "retries": sum(r.get("retries", 0) for r in calls),
+                "avg_kb": sum(r.get("bytes", 0) for r in fetched) / len(fetched) / 1024,
+            }
+        )
+    return sorted(rows, key=lambda r: -r["calls"])
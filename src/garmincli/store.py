@@ -0,0 +1,875 @@
+"""Local SQLite store for synced Garmin Connect data."""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .errors import GarminCliError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    activity_id INTEGER PRIMARY KEY,
+    start_time_local TEXT,
+    activity_type TEXT,
+    activity_name TEXT,
+    distance REAL,
+    duration REAL,
+    gear_synced INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_activities_start ON activities (start_time_local);
+CREATE INDEX IF NOT EXISTS idx_activities_type
+    ON activities (activity_type, start_time_local);
+
+CREATE TABLE IF NOT EXISTS gear (
+    gear_uuid TEXT PRIMARY KEY,
+    display_name TEXT,
+    maximum_meters REAL,
+    payload TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS activity_gear (
+    activity_id INTEGER NOT NULL,
+    gear_uuid TEXT NOT NULL,
+    PRIMARY KEY (activity_id, gear_uuid)
+);
+CREATE INDEX IF NOT EXISTS idx_activity_gear_uuid ON activity_gear (gear_uuid);
+
+-- Time in HR or power zones per activity. Garmin never changes these once an
+-- activity is recorded, so they are fetched once (an empty list included).
+CREATE TABLE IF NOT EXISTS activity_zones (
+    activity_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (activity_id, kind)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily (
+    dataset TEXT NOT NULL,
+    calendar_date TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (dataset, calendar_date)
+);
+
+CREATE TABLE IF NOT EXISTS weigh_in_samples (
+    sample_pk INTEGER PRIMARY KEY,
+    calendar_date TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_weigh_in_samples_date
+    ON weigh_in_samples (calendar_date);
+"""
+
+# Full-text index over activities (rowid is the activity ID), plus a plain
+# table of the filter and facet columns so counts never scan the FTS table.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS activity_search USING fts5(
+    name, description, type, location, gear,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TABLE IF NOT EXISTS activity_facets (
+    activity_id INTEGER PRIMARY KEY,
+    type TEXT,
+    start TEXT,
+    device TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_activity_facets_start ON activity_facets (start);
+CREATE INDEX IF NOT EXISTS idx_activity_facets_type ON activity_facets (type);
+CREATE INDEX IF NOT EXISTS idx_activity_facets_device ON activity_facets (device);
+"""
+SEARCH_COLUMNS = ("name", "description", "type", "location", "gear")
+
+# R-tree indexes of start points (from the activity summaries) and of the
+# bounding boxes of simplified tracks read from downloaded files; the
+# polylines themselves live in activity_tracks.
+SPATIAL_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS activity_start_index USING rtree(
+    activity_id, min_lat, max_lat, min_lon, max_lon
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS activity_track_index USING rtree(
+    activity_id, min_lat, max_lat, min_lon, max_lon
+);
+
+CREATE TABLE IF NOT EXISTS activity_tracks (
+    activity_id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    mtime REAL,
+    size INTEGER,
+    points TEXT NOT NULL
+);
+
+-- Heatmap pixels per activity and tile, so new tracks only touch their own
+-- tiles; heatmap_changes holds the generation at which each tile's pixels
+-- last changed, compared with the generation a tile directory was drawn at.
+CREATE TABLE IF NOT EXISTS heatmap_pixels (
+    zoom INTEGER NOT NULL,
+    tile_x INTEGER NOT NULL,
+    tile_y INTEGER NOT NULL,
+    activity_id INTEGER NOT NULL,
+    pixels BLOB NOT NULL,
+    PRIMARY KEY (zoom, tile_x, tile_y, activity_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_heatmap_pixels_activity
+    ON heatmap_pixels (activity_id, zoom);
+
+CREATE TABLE IF NOT EXISTS heatmap_changes (
+    zoom INTEGER NOT NULL,
+    tile_x INTEGER NOT NULL,
+    tile_y INTEGER NOT NULL,
+    generation INTEGER NOT NULL,
+    PRIMARY KEY (zoom, tile_x, tile_y)
+) WITHOUT ROWID;
+"""
+
+# PRAGMA user_version once existing activities are indexed:
+# 1 = search documents and facets, 2 = start points as well.
+INDEX_VERSION = 2
+
+_START_POINTS = """
+    INSERT OR REPLACE INTO activity_start_index
+    SELECT activity_id, lat, lat, lon, lon FROM (
+        SELECT activity_id,
+               json_extract(payload, '$.startLatitude') AS lat,
+               json_extract(payload, '$.startLongitude') AS lon
+        FROM activities a
+        {where}
+    )
+    WHERE lat IS NOT NULL AND lon IS NOT NULL
+"""
+
+_SEARCH_DOCUMENTS = """
+    INSERT INTO activity_search (rowid, name, description, type, location, gear)
+    SELECT a.activity_id,
+           a.activity_name,
+           json_extract(a.payload, '$.description'),
+           a.activity_type,
+           json_extract(a.payload, '$.locationName'),
+           (SELECT group_concat(g.display_name, ' ')
+            FROM activity_gear ag JOIN gear g ON g.gear_uuid = ag.gear_uuid
+            WHERE ag.activity_id = a.activity_id)
+    FROM activities a
+"""
+_SEARCH_FACETS = """
+    INSERT OR REPLACE INTO activity_facets
+    SELECT activity_id, activity_type, start_time_local,
+           CAST(json_extract(payload, '$.deviceId') AS TEXT)
+    FROM activities a
+"""
+_SEARCH_FACET_COLUMNS = {
+    "type": "f.type",
+    "month": "substr(f.start, 1, 7)",
+    "device": "f.device",
+}
+
+# Period keys for zone totals; weeks are named after their Monday.
+ZONE_PERIODS = {
+    "week": "date(substr(a.start_time_local, 1, 10), '-6 days', 'weekday 1')",
+    "month": "substr(a.start_time_local, 1, 7)",
+    "year": "substr(a.start_time_local, 1, 4)",
+}
+
+# Typed, read-only views for `gc query`. They are created as TEMP views on
+# the query connection, so `activities` shadows the raw table of that name
+# and view definitions can change without migrating existing stores.
+QUERY_VIEWS = {
+    "activities": """
+        SELECT activity_id,
+               substr(start_time_local, 1, 10) AS date,
+               start_time_local,
+               activity_type,
+               activity_name,
+               distance,
+               duration,
+               json_extract(payload, '$.movingDuration') AS moving_duration,
+               json_extract(payload, '$.averageHR') AS avg_hr,
+               json_extract(payload, '$.maxHR') AS max_hr,
+               json_extract(payload, '$.averageSpeed') AS avg_speed,
+               json_extract(payload, '$.elevationGain') AS elevation_gain,
+               json_extract(payload, '$.calories') AS calories,
+               json_extract(payload, '$.activityTrainingLoad') AS training_load,
+               json_extract(payload, '$.aerobicTrainingEffect') AS aerobic_te,
+               json_extract(payload, '$.anaerobicTrainingEffect') AS anaerobic_te,
+               json_extract(payload, '$.averageRunningCadenceInStepsPerMinute')
+                   AS avg_cadence,
+               json_extract(payload, '$.avgPower') AS avg_power,
+               json_extract(payload, '$.locationName') AS location,
+               json_extract(payload, '$.deviceId') AS device_id,
+               payload
+        FROM main.activities
+    """,
+    "daily_summary": """
+        SELECT calendar_date,
+               json_extract(payload, '$.totalSteps') AS steps,
+               json_extract(payload, '$.dailyStepGoal') AS step_goal,
+               json_extract(payload, '$.totalDistanceMeters') AS distance,
+               json_extract(payload, '$.totalKilocalories') AS calories,
+               json_extract(payload, '$.activeKilocalories') AS active_calories,
+               json_extract(payload, '$.floorsAscended') AS floors,
+               json_extract(payload, '$.restingHeartRate') AS resting_hr,
+               json_extract(payload, '$.minHeartRate') AS min_hr,
+               json_extract(payload, '$.maxHeartRate') AS max_hr,
+               json_extract(payload, '$.averageStressLevel') AS avg_stress,
+               json_extract(payload, '$.bodyBatteryHighestValue') AS body_battery_high,
+               json_extract(payload, '$.bodyBatteryLowestValue') AS body_battery_low,
+               json_extract(payload, '$.moderateIntensityMinutes')
+                   AS moderate_minutes,
+               json_extract(payload, '$.vigorousIntensityMinutes')
+                   AS vigorous_minutes,
+               payload
+        FROM main.daily WHERE dataset = 'summary'
+    """,
+    "sleep": """
+        SELECT calendar_date,
+               json_extract(payload, '$.dailySleepDTO.sleepTimeSeconds')
+                   AS sleep_seconds,
+               json_extract(payload, '$.dailySleepDTO.deepSleepSeconds')
+                   AS deep_seconds,
+               json_extract(payload, '$.dailySleepDTO.lightSleepSeconds')
+                   AS light_seconds,
+               json_extract(payload, '$.dailySleepDTO.remSleepSeconds')
+                   AS rem_seconds,
+               json_extract(payload, '$.dailySleepDTO.awakeSleepSeconds')
+                   AS awake_seconds,
+               json_extract(payload, '$.dailySleepDTO.sleepScores.overall.value')
+                   AS score,
+               json_extract(payload, '$.restingHeartRate') AS resting_hr,
+               json_extract(payload, '$.avgOvernightHrv') AS avg_overnight_hrv,
+               payload
+        FROM main.daily WHERE dataset = 'sleep'
+    """,
+    "hrv": """
+        SELECT calendar_date,
+               json_extract(payload, '$.hrvSummary.lastNightAvg') AS last_night_avg,
+               json_extract(payload, '$.hrvSummary.lastNight5MinHigh')
+                   AS last_night_5min_high,
+               json_extract(payload, '$.hrvSummary.weeklyAvg') AS weekly_avg,
+               json_extract(payload, '$.hrvSummary.status') AS status,
+               payload
+        FROM main.daily WHERE dataset = 'hrv'
+    """,
+    "stress": """
+        SELECT calendar_date,
+               json_extract(payload, '$.avgStressLevel') AS avg_stress,
+               json_extract(payload, '$.maxStressLevel') AS max_stress,
+               payload
+        FROM main.daily WHERE dataset = 'stress'
+    """,
+    "weigh_ins": """
+        SELECT sample_pk,
+               calendar_date,
+               json_extract(payload, '$.weight') / 1000.0 AS weight_kg,
+               json_extract(payload, '$.bmi') AS bmi,
+               json_extract(payload, '$.bodyFat') AS body_fat,
+               json_extract(payload, '$.bodyWater') AS body_water,
+               json_extract(payload, '$.muscleMass') / 1000.0 AS muscle_mass_kg,
+               json_extract(payload, '$.boneMass') / 1000.0 AS bone_mass_kg,
+               json_extract(payload, '$.sourceType') AS source,
+               payload
+        FROM main.weigh_in_samples
+    """,
+    "activity_zones": """
+        SELECT az.activity_id,
+               az.kind,
+               CAST(json_extract(z.value, '$.zoneNumber') AS INTEGER) AS zone,
+               json_extract(z.value, '$.secsInZone') AS seconds,
+               json_extract(z.value, '$.zoneLowBoundary') AS low_boundary
+        FROM main.activity_zones az
+        JOIN json_each(
+            CASE json_type(az.payload) WHEN 'array' THEN az.payload ELSE '[]' END
+        ) z
+    """,
+}
+
+
+def get_store_path(store: Optional[str] = None) -> Path:
+    """Resolve the local store database path.
+
+    Priority:
+    1. Explicit --store argument
+    2. GARMINSTORE environment variable
+    3. Fallback: ~/.config/garmin-cli/store.db
+    """
+    if store:
+        return Path(store).expanduser().resolve()
+
+    env = os.environ.get("GARMINSTORE")
+    if env:
+        return Path(env).expanduser().resolve()
+
+    return Path.home() / ".config" / "garmin-cli" / "store.db"
+
+
+def _gear_name(gear: dict) -> Optional[str]:
+    return gear.get("displayName") or gear.get("customMakeModel")
+
+
+class Store:
+    """Thin wrapper around the local SQLite database."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = get_store_path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(SEARCH_SCHEMA)
+            self.searchable = True
+        except sqlite3.OperationalError:  # SQLite built without FTS5
+            self.searchable = False
+        try:
+            self.conn.executescript(SPATIAL_SCHEMA)
+            self.spatial = True
+        except sqlite3.OperationalError:  # SQLite built without R-tree
+            self.spatial = False
+
+    def __enter__(self) -> "Store":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def upsert_activities(self, activities: Iterable[dict]) -> int:
+        """Insert or update activity summaries. Returns the number written."""
+        rows = [
+            (
+                a["activityId"],
+                a.get("startTimeLocal"),
+                (a.get("activityType") or {}).get("typeKey"),
+                a.get("activityName"),
+                a.get("distance"),
+                a.get("duration"),
+                json.dumps(a, default=str),
+            )
+            for a in activities
+            if a.get("activityId") is not None
+        ]
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO activities (
+                    activity_id, start_time_local, activity_type,
+                    activity_name, distance, duration, payload
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (activity_id) DO UPDATE SET
+                    start_time_local = excluded.start_time_local,
+                    activity_type = excluded.activity_type,
+                    activity_name = excluded.activity_name,
+                    distance = excluded.distance,
+                    duration = excluded.duration,
+                    payload = excluded.payload
+                """,
+                rows,
+            )
+            self._index_activities([row[0] for row in rows])
+        return len(rows)
+
+    def _index_activities(self, activity_ids: list[int]) -> None:
+        """Refresh the search documents and start points (in a transaction)."""
+        if not activity_ids:
+            return
+        ids = json.dumps(activity_ids)
+        where = " WHERE a.activity_id IN (SELECT value FROM json_each(?))"
+        if self.searchable:
+            self.conn.execute(
+                "DELETE FROM activity_search"
+                " WHERE rowid IN (SELECT value FROM json_each(?))",
+                (ids,),
+            )
+            self.conn.execute(_SEARCH_DOCUMENTS + where, (ids,))
+            self.conn.execute(_SEARCH_FACETS + where, (ids,))
+        if self.spatial:
+            self.conn.execute(_START_POINTS.format(where=where), (ids,))
+
+    def _backfill_indexes(self) -> None:
+        """Index activities stored before the indexes existed (once)."""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= INDEX_VERSION:
+            return
+        with self.conn:
+            if self.searchable and version < 1:
+                self.conn.execute("DELETE FROM activity_search")
+                self.conn.execute(_SEARCH_DOCUMENTS)
+                self.conn.execute(_SEARCH_FACETS)
+            if self.spatial:
+                self.conn.execute(_START_POINTS.format(where=""))
+            self.conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    def ensure_search_index(self) -> None:
+        if not self.searchable:
+            raise GarminCliError(
+                "This SQLite build has no FTS5; search is unavailable."
+            )
+        self._backfill_indexes()
+
+    def ensure_spatial_index(self) -> None:
+        if not self.spatial:
+            raise GarminCliError(
+                "This SQLite build has no R-tree module; location search is"
+                " unavailable."
+            )
+        self._backfill_indexes()
+
+    def track_sources(self) -> dict[str, tuple[float, int]]:
+        """(mtime, size) of every indexed track file, keyed by path."""
+        return {
+            row["source"]: (row["mtime"], row["size"])
+            for row in self.conn.execute(
+                "SELECT source, mtime, size FROM activity_tracks"
+            )
+        }
+
+    def upsert_tracks(self, tracks: Iterable[dict[str, Any]]) -> int:
+        """Store simplified tracks and their bounding boxes.
+
+        Activities without a start point in their summary get the first
+        track point as one.
+        """
+        count = 0
+        with self.conn:
+            for track in tracks:
+                points = track["points"]
+                if not points:
+                    continue
+                activity_id = track["activity_id"]
+                self._drop_heatmap(activity_id)
+                lats = [p[0] for p in points]
+                lons = [p[1] for p in points]
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO activity_tracks VALUES (?, ?, ?, ?, ?)",
+                    (
+                        activity_id,
+                        track["source"],
+                        track["mtime"],
+                        track["size"],
+                        json.dumps(points),
+                    ),
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO activity_track_index VALUES (?, ?, ?, ?, ?)",
+                    (activity_id, min(lats), max(lats), min(lons), max(lons)),
+                )
+                if not self.conn.execute(
+                    "SELECT 1 FROM activity_start_index WHERE activity_id = ?",
+                    (activity_id,),
+                ).fetchone():
+                    lat, lon = points[0]
+                    self.conn.execute(
+                        "INSERT INTO activity_start_index VALUES (?, ?, ?, ?, ?)",
+                        (activity_id, lat, lat, lon, lon),
+                    )
+                count += 1
+        return count
+
+    def _drop_heatmap(self, activity_id: int) -> None:
+        """Forget an activity's heatmap pixels, marking its tiles changed."""
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO heatmap_changes
+            SELECT zoom, tile_x, tile_y, ? FROM heatmap_pixels WHERE activity_id = ?
+            """,
+            (self.heatmap_generation() + 1, activity_id),
+        )
+        self.conn.execute(
+            "DELETE FROM heatmap_pixels WHERE activity_id = ?", (activity_id,)
+        )
+
+    def heatmap_pending(self, zooms: list[int]) -> list[tuple[int, str, list[int]]]:
+        """(activity ID, points JSON, zooms) for tracks missing heatmap pixels."""
+        pending: dict[int, tuple[int, str, list[int]]] = {}
+        for zoom in zooms:
+            rows = self.conn.execute(
+                """
+                SELECT t.activity_id, t.points FROM activity_tracks t
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM heatmap_pixels h
+                    WHERE h.activity_id = t.activity_id AND h.zoom = ?
+                )
+                """,
+                (zoom,),
+            )
+            for activity_id, points in rows:
+                pending.setdefault(activity_id, (activity_id, points, []))[2].append(
+                    zoom
+                )
+        return list(pending.values())
+
+    def add_heatmap_pixels(self, batches: Iterable[list[tuple]]) -> int:
+        """Store (zoom, x, y, activity, pixels) rows and mark their tiles changed."""
+        count = 0
+        with self.conn:
+            generation = self.heatmap_generation() + 1
+            for rows in batches:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO heatmap_pixels VALUES (?, ?, ?, ?, ?)", rows
+                )
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO heatmap_changes VALUES (?, ?, ?, ?)",
+                    [(*row[:3], generation) for row in rows],
+                )
+                count += 1
+        return count
+
+    def heatmap_tiles(self, zoom: int) -> list[tuple[int, int, int]]:
+        rows = self.conn.execute(
+            "SELECT DISTINCT zoom, tile_x, tile_y FROM heatmap_pixels WHERE zoom = ?",
+            (zoom,),
+        )
+        return [tuple(row) for row in rows]
+
+    def heatmap_generation(self) -> int:
+        """Generation of the latest heatmap pixel change (0 before any)."""
+        row = self.conn.execute("SELECT MAX(generation) FROM heatmap_changes")
+        return row.fetchone()[0] or 0
+
+    def changed_heatmap_tiles(
+        self, zoom: int, since: int = 0
+    ) -> list[tuple[int, int, int]]:
+        """Tiles whose pixels changed after generation ``since``.
+
+        Tiles left without pixels are included, so their files can be removed.
+        """
+        rows = self.conn.execute(
+            "SELECT zoom, tile_x, tile_y FROM heatmap_changes"
+            " WHERE zoom = ? AND generation > ?",
+            (zoom, since),
+        )
+        return [tuple(row) for row in rows]
+
+    def starts_within(
+        self, box: tuple[float, float, float, float]
+    ) -> list[sqlite3.Row]:
+        """Start points inside (min_lat, max_lat, min_lon, max_lon)."""
+        return list(
+            self.conn.execute(
+                """
+                SELECT activity_id,
+                       (min_lat + max_lat) / 2 AS lat,
+                       (min_lon + max_lon) / 2 AS lon
+                FROM activity_start_index
+                WHERE max_lat >= ? AND min_lat <= ? AND max_lon >= ? AND min_lon <= ?
+                """,
+                box,
+            )
+        )
+
+    def tracks_overlapping(
+        self, box: tuple[float, float, float, float]
+    ) -> list[sqlite3.Row]:
+        """Tracks whose bounding box intersects (min_lat, max_lat, min_lon, max_lon)."""
+        min_lat, max_lat, min_lon, max_lon = box
+        return list(
+            self.conn.execute(
+                """
+                SELECT t.activity_id, t.points
+                FROM activity_track_index i
+                JOIN activity_tracks t ON t.activity_id = i.activity_id
+                WHERE i.max_lat >= ? AND i.min_lat <= ?
+                  AND i.max_lon >= ? AND i.min_lon <= ?
+                """,
+                (min_lat, max_lat, min_lon, max_lon),
+            )
+        )
+
+    def activity_summaries(self, activity_ids: list[int]) -> dict[int, sqlite3.Row]:
+        rows = self.conn.execute(
+            """
+            SELECT activity_id, start_time_local, activity_type, activity_name,
+                   distance
+            FROM activities
+            WHERE activity_id IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(activity_ids),),
+        )
+        return {row["activity_id"]: row for row in rows}
+
+    def search_activities(
+        self,
+        match: Optional[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        activity_type: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[sqlite3.Row]:
+        """Newest-first activities matching an FTS5 expression and filters."""
+        # CROSS JOIN keeps activity_facets as the outer loop, so ORDER BY
+        # start walks its index instead of sorting every FTS row.
+        sql, params = _search_filter(
+            """
+            SELECT f.activity_id, f.start, s.name, f.type, s.location, s.gear,
+                   f.device
+            FROM activity_facets f
+            CROSS JOIN activity_search s ON s.rowid = f.activity_id
+            WHERE 1 = 1
+            """,
+            match,
+            start,
+            end,
+            activity_type,
+        )
+        sql += " ORDER BY f.start DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return list(self.conn.execute(sql, params))
+
+    def search_facets(
+        self,
+        match: Optional[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        activity_type: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """Counts of matching activities by type, month and device."""
+        rows = []
+        for facet, expression in _SEARCH_FACET_COLUMNS.items():
+            sql, params = _search_filter(
+                f"SELECT {expression} AS value, COUNT(*) AS count"
+                " FROM activity_facets f WHERE 1 = 1",
+                match,
+                start,
+                end,
+                activity_type,
+            )
+            sql += " GROUP BY value ORDER BY count DESC, value"
+            rows += [
+                {"facet": facet, "value": row["value"], "count": row["count"]}
+                for row in self.conn.execute(sql, params)
+            ]
+        return rows
+
+    def has_activity(self, activity_id: int) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM activities WHERE activity_id = ?", (activity_id,)
+        ).fetchone()
+        return row is not None
+
+    def count_activities(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM activities").fetchone()[0]
+
+    def activities_missing_gear(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> list[int]:
+        """Return IDs of activities whose gear links were never fetched."""
+        sql = "SELECT activity_id FROM activities WHERE gear_synced = 0"
+        sql, params = _date_filter(sql, start, end)
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def set_activity_gear(self, activity_id: int, gear: list[dict]) -> None:
+        """Record the gear used for an activity (an empty list is remembered too)."""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM activity_gear WHERE activity_id = ?", (activity_id,)
+            )
+            for item in gear:
+                uuid = item.get("uuid")
+                if not uuid:
+                    continue
+                self.conn.execute(
+                    """
+                    INSERT INTO gear (gear_uuid, display_name, maximum_meters, payload)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (gear_uuid) DO UPDATE SET
+                        display_name = excluded.display_name,
+                        maximum_meters = excluded.maximum_meters,
+                        payload = excluded.payload
+                    """,
+                    (
+                        uuid,
+                        _gear_name(item),
+                        item.get("maximumMeters"),
+                        json.dumps(item, default=str),
+                    ),
+                )
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO activity_gear VALUES (?, ?)",
+                    (activity_id, uuid),
+                )
+            self.conn.execute(
+                "UPDATE activities SET gear_synced = 1 WHERE activity_id = ?",
+                (activity_id,),
+            )
+            self._index_activities([activity_id])
+
+    def activities_missing_zones(
+        self,
+        kind: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        activity_type: Optional[str] = None,
+    ) -> list[int]:
+        """IDs of activities whose ``kind`` zone times were never fetched."""
+        sql = """
+            SELECT activity_id FROM activities a
+            WHERE NOT EXISTS (
+                SELECT 1 FROM activity_zones z
+                WHERE z.activity_id = a.activity_id AND z.kind = ?
+            )
+        """
+        sql, params = _date_filter(sql, start, end)
+        if activity_type:
+            sql += " AND activity_type = ?"
+            params.append(activity_type)
+        return [row[0] for row in self.conn.execute(sql, [kind, *params])]
+
+    def set_activity_zones(self, kind: str, zones: Iterable[tuple[int, Any]]) -> int:
+        rows = [
+            (activity_id, kind, json.dumps(payload or [], default=str))
+            for activity_id, payload in zones
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO activity_zones VALUES (?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def zone_totals(
+        self,
+        kind: str,
+        period: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        activity_type: Optional[str] = None,
+    ) -> list[sqlite3.Row]:
+        """Seconds per (period, zone) and the number of activities in the period.
+
+        Activities are counted before their zones are expanded, so those
+        stored without zones (no heart rate or power recorded) still count;
+        a period with only such activities has a single row with zone None.
+        """
+        sql = f"""
+            SELECT {ZONE_PERIODS[period]} AS period, az.payload
+            FROM activity_zones az
+            JOIN activities a ON a.activity_id = az.activity_id
+            WHERE az.kind = ?
+        """
+        params: list[Any] = [kind]
+        sql, dates = _date_filter(sql, start, end, column="a.start_time_local")
+        params += dates
+        if activity_type:
+            sql += " AND a.activity_type = ?"
+            params.append(activity_type)
+        sql = f"""
+            WITH scoped AS ({sql}),
+            counts AS (
+                SELECT period, COUNT(*) AS activities FROM scoped GROUP BY period
+            ),
+            zones AS (
+                SELECT s.period,
+                       CAST(json_extract(z.value, '$.zoneNumber') AS INTEGER) AS zone,
+                       SUM(json_extract(z.value, '$.secsInZone')) AS seconds
+                FROM scoped s
+                JOIN json_each(
+                    CASE json_type(s.payload) WHEN 'array' THEN s.payload ELSE '[]' END
+                ) z
+                GROUP BY s.period, zone
+            )
+            SELECT c.period, z.zone, z.seconds, c.activities
+            FROM counts c LEFT JOIN zones z ON z.period = c.period
+            ORDER BY c.period, z.zone
+        """
+        return list(self.conn.execute(sql, params))
+
+    def upsert_daily(self, dataset: str, days: Iterable[tuple[str, Any]]) -> int:
+        """Store one payload per calendar day; empty payloads are skipped."""
+        rows = [
+            (dataset, day, json.dumps(payload, default=str))
+            for day, payload in days
+            if payload
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO daily VALUES (?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def last_daily_date(self, dataset: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT MAX(calendar_date) FROM daily WHERE dataset = ?", (dataset,)
+        ).fetchone()
+        return row[0]
+
+    def upsert_weigh_ins(self, samples: Iterable[dict]) -> int:
+        rows = [
+            (s["samplePk"], s.get("calendarDate"), json.dumps(s, default=str))
+            for s in samples
+            if s.get("samplePk") is not None
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO weigh_in_samples VALUES (?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def gear_activities(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> list[sqlite3.Row]:
+        """Return one row per (gear, activity) pair in a single join."""
+        sql = """
+            SELECT g.gear_uuid, g.display_name, g.maximum_meters,
+                   a.activity_id, a.start_time_local, a.distance, a.duration
+            FROM activity_gear ag
+            JOIN gear g ON g.gear_uuid = ag.gear_uuid
+            JOIN activities a ON a.activity_id = ag.activity_id
+            WHERE 1 = 1
+        """
+        sql, params = _date_filter(sql, start, end, column="a.start_time_local")
+        return list(self.conn.execute(sql + " ORDER BY a.start_time_local", params))
+
+
+def _date_filter(
+    sql: str,
+    start: Optional[str],
+    end: Optional[str],
+    column: str = "start_time_local",
+) -> tuple[str, list[str]]:
+    params: list[str] = []
+    if start:
+        sql += f" AND {column} >= ?"
+        params.append(start)
+    if end:
+        # startTimeLocal is "YYYY-MM-DD HH:MM:SS"; include the whole end day.
+        sql += f" AND {column} < ?"
+        params.append(end + "~")
+    return sql, params
+
+
+def _search_filter(
+    sql: str,
+    match: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+    activity_type: Optional[str],
+) -> tuple[str, list[Any]]:
+    params: list[Any] = []
+    if match:
+        sql += (
+            " AND f.activity_id IN"
+            " (SELECT rowid FROM activity_search WHERE activity_search MATCH ?)"
+        )
+        params.append(match)
+    if activity_type:
+        sql += " AND f.type = ?"
+        params.append(activity_type)
+    sql, dates = _date_filter(sql, start, end, column="f.start")
+    return sql, params + dates
+
+
+def connect_readonly(path: Optional[str] = None) -> sqlite3.Connection:
+    """Read-only connection with the typed QUERY_VIEWS defined."""
+    db_path = get_store_path(path)
+    if not db_path.exists():
+        raise GarminCliError(f"No local store at {db_path}. Run 'gc sync' first.")
+    conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    for name, sql in QUERY_VIEWS.items():
+        conn.execute(f"CREATE TEMP VIEW {name} AS {sql}")
+    return conn
@@ -0,0 +1,204 @@
+"""Flatten payloads into rows and write them as CSV/TSV, Parquet or Arrow IPC."""
+
+import csv
+import itertools
+import json
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Sequence, TextIO
+
+from .errors import GarminCliError
+from .output import binary_stdout, console, err_console, open_output, open_text_output
+
+DELIMITERS = {"csv": ",", "tsv": "\t"}
+COLUMNAR_FORMATS = ("parquet", "arrow")
+BATCH_ROWS = 10_000
+LOOKAHEAD_ROWS = 1_000
+
+
+def flatten(record: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Nested objects become dotted keys (``activityType.typeKey``)."""
+    flat: dict[str, Any] = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def flat_keys(record: dict[str, Any], prefix: str = "") -> Iterator[str]:
+    """The keys ``flatten`` would produce, without building the row."""
+    for key, value in record.items():
+        if isinstance(value, dict):
+            yield from flat_keys(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}"
+
+
+def wrapped_records(data: dict[str, Any]) -> Optional[list[dict[str, Any]]]:
+    """The records of a dict whose only list-of-objects value holds them
+    (e.g. ``dailyWeightSummaries``), or None."""
+    lists = [
+        value
+        for value in data.values()
+        if isinstance(value, list) and value and isinstance(value[0], dict)
+    ]
+    return lists[0] if len(lists) == 1 else None
+
+
+def table_rows(data: Any) -> list[dict[str, Any]]:
+    """The list of records in a payload.
+
+    Lists are used as-is; a dict wrapping a list of records yields that list
+    (see ``wrapped_records``); any other dict is a single row.
+    """
+    if data is None:
+        return []
+    if isinstance(data, dict):
+        records = wrapped_records(data)
+        data = records if records is not None else [data]
+    if not isinstance(data, list):
+        return [{"value": data}]
+    return [item if isinstance(item, dict) else {"value": item} for item in data]
+
+
+def union_keys(rows: list[dict[str, Any]]) -> list[str]:
+    """All keys in first-seen order."""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+
+def header_and_rows(
+    rows: Iterable[dict[str, Any]], lookahead: int = LOOKAHEAD_ROWS
+) -> tuple[list[str], Iterator[dict[str, Any]]]:
+    """Union header and lazily flattened rows.
+
+    An in-memory sequence is scanned once for keys only, so fields missing
+    from the first rows are still found. For other iterables the header
+    comes from the first ``lookahead`` rows.
+    """
+    if isinstance(rows, Sequence):
+        header = dict.fromkeys(key for row in rows for key in flat_keys(row))
+        return list(header), (flatten(row) for row in rows)
+    rows = iter(rows)
+    buffered = [flatten(row) for row in itertools.islice(rows, lookahead)]
+    rest = (flatten(row) for row in rows)
+    return union_keys(buffered), itertools.chain(buffered, rest)
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+@contextmanager
+def _text_sink(output: Optional[str]) -> Iterator[TextIO]:
+    if output:
+        with open_text_output(output) as text:
+            yield text
+    else:
+        yield console.file
+
+
+def write_delimited(
+    data: Any, fmt: str, output: Optional[str], columns: Optional[list[str]] = None
+) -> None:
+    """Write ``data`` as CSV or TSV one row at a time, with a dotted-key header.
+
+    An iterator of records is consumed as it is written.
+    """
+    records = data if isinstance(data, Iterator) else table_rows(data)
+    header, rows = header_and_rows(records)
+    header = columns or header
+    if not header:
+        err_console.print("[yellow]No data available.[/yellow]")
+        return
+    with _text_sink(output) as f:
+        writer = csv.writer(f, delimiter=DELIMITERS[fmt], lineterminator="\n")
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow([_cell(row.get(name)) for name in header])
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise GarminCliError(
+            "Parquet and Arrow output need pyarrow: pip install 'garmin-cli[arrow]'"
+        ) from e
+    return pyarrow
+
+
+def _as_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def _has_empty_struct(pa: Any, dtype: Any) -> bool:
+    if pa.types.is_struct(dtype):
+        fields = [dtype.field(i).type for i in range(dtype.num_fields)]
+        return not fields or any(_has_empty_struct(pa, f) for f in fields)
+    if pa.types.is_list(dtype) or pa.types.is_large_list(dtype):
+        return _has_empty_struct(pa, dtype.value_type)
+    return False
+
+
+def _column(pa: Any, values: list[Any]) -> Any:
+    """Typed column, or strings if the values do not share one type.
+
+    Objects without fields cannot be stored in Parquet and are kept as text.
+    """
+    try:
+        column = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        column = None
+    if column is None or _has_empty_struct(pa, column.type):
+        column = pa.array([_as_text(v) for v in values], type=pa.string())
+    return column
+
+
+def to_arrow(data: Any, columns: Optional[list[str]] = None) -> Any:
+    """A pyarrow Table with one inferred-type column per flattened field."""
+    pa = _pyarrow()
+    rows = [flatten(row) for row in table_rows(data)]
+    names = columns or union_keys(rows)
+    return pa.table(
+        {name: _column(pa, [row.get(name) for row in rows]) for name in names}
+    )
+
+
+@contextmanager
+def _sink(output: Optional[str]) -> Iterator[BinaryIO]:
+    if output:
+        with open_output(output) as f:
+            yield f
+    else:
+        stdout = binary_stdout()
+        yield stdout
+        stdout.flush()
+
+
+def write_columnar(
+    data: Any, fmt: str, output: Optional[str], columns: Optional[list[str]] = None
+) -> None:
+    """Write ``data`` as Parquet or an Arrow IPC stream in BATCH_ROWS batches."""
+    pa = _pyarrow()
+    table = to_arrow(data, columns)
+    with _sink(output) as f:
+        if fmt == "parquet":
+            pa.parquet.write_table(table, f, row_group_size=BATCH_ROWS)
+            return
+        with pa.ipc.new_stream(f, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=BATCH_ROWS):
+                writer.write_batch(batch)
@@ -0,0 +1,270 @@
+"""Read GPS tracks from downloaded GPX, TCX and FIT files and simplify them."""
+
+import math
+import re
+import struct
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+from xml.etree import ElementTree
+
+Point = tuple[float, float]  # (lat, lon) in degrees
+
+TRACK_SUFFIXES = (".gpx", ".tcx", ".fit", ".zip")
+SIMPLIFY_TOLERANCE_M = 15.0
+EARTH_RADIUS_M = 6_371_008.8
+
+# Garmin download names: "<id>_ACTIVITY.fit", or "<id>/original.zip" in exports.
+_ACTIVITY_ID_RE = re.compile(r"^(\d{6,})(?:_ACTIVITY)?$", re.IGNORECASE)
+_SEMICIRCLES = 180.0 / 2**31
+_FIT_RECORD = 20
+_FIT_INVALID_SINT32 = 0x7FFFFFFF
+
+
+def activity_id_for(path: Path) -> Optional[int]:
+    """Activity ID from a download name (``123_ACTIVITY.fit``) or its directory.
+
+    Only whole names count, so dates and other numbers in a file name are
+    never mistaken for an ID.
+    """
+    for name in (path.stem, path.parent.name):
+        match = _ACTIVITY_ID_RE.match(name)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def find_track_files(paths: Iterable[Path]) -> list[Path]:
+    """Track files among ``paths``, searching directories recursively."""
+    found = []
+    for path in paths:
+        if path.is_dir():
+            found += sorted(
+                p for p in path.rglob("*") if p.suffix.lower() in TRACK_SUFFIXES
+            )
+        elif path.suffix.lower() in TRACK_SUFFIXES:
+            found.append(path)
+    return found
+
+
+def _gpx_points(data: bytes) -> list[Point]:
+    root = ElementTree.fromstring(data)
+    return [
+        (float(p.get("lat")), float(p.get("lon"))) for p in root.iterfind(".//{*}trkpt")
+    ]
+
+
+def _tcx_points(data: bytes) -> list[Point]:
+    root = ElementTree.fromstring(data)
+    points = []
+    for position in root.iterfind(".//{*}Position"):
+        lat = position.findtext("{*}LatitudeDegrees")
+        lon = position.findtext("{*}LongitudeDegrees")
+        if lat and lon:
+            points.append((float(lat), float(lon)))
+    return points
+
+
+def fit_points(data: bytes) -> list[Point]:
+    """Positions of the record messages of a (possibly chained) FIT file."""
+    points = []
+    offset = 0
+    while offset + 12 <= len(data):
+        header_size = data[offset]
+        data_size = struct.unpack_from("<I", data, offset + 4)[0]
+        if data[offset + 8 : offset + 12] != b".FIT":
+            raise ValueError("not a FIT file")
+        end = offset + header_size + data_size
+        points += _fit_records(data, offset + header_size, min(end, len(data)))
+        offset = end + 2  # file CRC
+    return points
+
+
+def _fit_records(data: bytes, offset: int, end: int) -> list[Point]:
+    definitions: dict[int, tuple[int, str, int, Optional[tuple[int, int]]]] = {}
+    points = []
+    while offset < end:
+        header = data[offset]
+        offset += 1
+        if header & 0x80:  # compressed timestamp data message
+            local, is_definition = (header >> 5) & 0x03, False
+        else:
+            local, is_definition = header & 0x0F, bool(header & 0x40)
+
+        if is_definition:
+            big_endian = data[offset + 1] == 1
+            order = ">" if big_endian else "<"
+            global_num, count = struct.unpack_from(f"{order}HB", data, offset + 2)
+            offset += 5
+            size = 0
+            position = None
+            lat_at = lon_at = None
+            for i in range(count):
+                number, field_size = data[offset + 3 * i], data[offset + 3 * i + 1]
+                if number == 0 and field_size == 4:
+                    lat_at = size
+                elif number == 1 and field_size == 4:
+                    lon_at = size
+                size += field_size
+            offset += 3 * count
+            if header & 0x20:  # developer fields
+                dev_count = data[offset]
+                size += sum(data[offset + 2 + 3 * i] for i in range(dev_count))
+                offset += 1 + 3 * dev_count
+            if lat_at is not None and lon_at is not None:
+                position = (lat_at, lon_at)
+            definitions[local] = (global_num, order, size, position)
+            continue
+
+        if local not in definitions:
+            raise ValueError("FIT data message without definition")
+        global_num, order, size, position = definitions[local]
+        if global_num == _FIT_RECORD and position is not None:
+            lat = struct.unpack_from(f"{order}i", data, offset + position[0])[0]
+            lon = struct.unpack_from(f"{order}i", data, offset + position[1])[0]
+            if _FIT_INVALID_SINT32 not in (lat, lon):
+                points.append((lat * _SEMICIRCLES, lon * _SEMICIRCLES))
+        offset += size
+    return points
+
+
+def read_track(path: Path) -> list[Point]:
+    """All positions in a GPX, TCX, FIT or zipped FIT/GPX/TCX file."""
+    suffix = path.suffix.lower()
+    if suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                inner = Path(name).suffix.lower()
+                if inner in (".fit", ".gpx", ".tcx"):
+                    return _parse(inner, archive.read(name))
+        return []
+    return _parse(suffix, path.read_bytes())
+
+
+def _parse(suffix: str, data: bytes) -> list[Point]:
+    if suffix == ".fit":
+        return fit_points(data)
+    if suffix == ".gpx":
+        return _gpx_points(data)
+    return _tcx_points(data)
+
+
+def _project(points: list[Point]) -> list[tuple[float, float]]:
+    """Local equirectangular metres, good enough at track scale."""
+    lat0 = math.radians(points[0][0])
+    scale = math.radians(1) * EARTH_RADIUS_M
+    return [(lon * scale * math.cos(lat0), lat * scale) for lat, lon in points]
+
+
+def _segment_distance(
+    p: tuple[float, float], a: tuple[float, float], b: tuple[float, float]
+) -> float:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length = dx * dx + dy * dy
+    t = 0.0 if length == 0 else ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length
+    t = max(0.0, min(1.0, t))
+    return math.hypot(p[0] - a[0] - t * dx, p[1] - a[1] - t * dy)
+
+
+def simplify(
+    points: list[Point], tolerance_m: float = SIMPLIFY_TOLERANCE_M
+) -> list[Point]:
+    """Douglas-Peucker simplification (iterative, so long tracks are fine).
+
+    Points closer than the tolerance to the previous kept point are dropped
+    first, which removes most of a 1 s recording before the quadratic pass.
+    """
+    if len(points) < 3:
+        return list(points)
+    xy = _project(points)
+    dense = [0]
+    for i in range(1, len(points) - 1):
+        prev = xy[dense[-1]]
+        if math.hypot(xy[i][0] - prev[0], xy[i][1] - prev[1]) > tolerance_m:
+            dense.append(i)
+    dense.append(len(points) - 1)
+    points = [points[i] for i in dense]
+    xy = [xy[i] for i in dense]
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        worst, worst_at = 0.0, first
+        for i in range(first + 1, last):
+            d = _segment_distance(xy[i], xy[first], xy[last])
+            if d > worst:
+                worst, worst_at = d, i
+        if worst > tolerance_m:
+            keep[worst_at] = True
+            stack += [(first, worst_at), (worst_at, last)]
+    return [p for p, kept in zip(points, keep) if kept]
+
+
+def haversine_m(a: Point, b: Point) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(h))
+
+
+def distance_to_track_m(point: Point, track: list[Point]) -> float:
+    """Shortest distance from ``point`` to a polyline."""
+    if len(track) == 1:
+        return haversine_m(point, track[0])
+    xy = _project([point, *track])
+    p, rest = xy[0], xy[1:]
+    return min(_segment_distance(p, a, b) for a, b in zip(rest, rest[1:]))
+
+
+def bounding_box(point: Point, radius_m: float) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing a circle."""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    cos_lat = max(math.cos(math.radians(point[0])), 1e-6)
+    dlon = min(180.0, dlat / cos_lat)
+    return point[0] - dlat, point[0] + dlat, point[1] - dlon, point[1] + dlon
+
+
+def parse_track_file(path: Path) -> Optional[dict[str, Any]]:
+    """Index entry for one file (runs in worker processes); None if unusable."""
+    activity_id = activity_id_for(path)
+    if activity_id is None:
+        return None
+    try:
+        points = read_track(path)
+    except (
+        OSError,
+        ValueError,
+        struct.error,
+        zipfile.BadZipFile,
+        ElementTree.ParseError,
+    ):
+        return {"activity_id": activity_id, "source": str(path), "error": True}
+    stat = path.stat()
+    return {
+        "activity_id": activity_id,
+        "source": str(path),
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "points": [(round(lat, 5), round(lon, 5)) for lat, lon in simplify(points)],
+    }
+
+
+def process_map(
+    function: Callable[[Any], Any], items: list, workers: int, chunksize: int = 1
+) -> Iterator[Any]:
+    """Map ``function`` over ``items`` in ``workers`` processes, in order."""
+    if workers <= 1 or len(items) <= 1:
+        yield from map(function, items)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(function, items, chunksize=chunksize)
+
+
+def iter_parsed(files: list[Path], workers: int) -> Iterator[Optional[dict[str, Any]]]:
+    """Parse files across ``workers`` processes, yielding results in order."""
+    return process_map(parse_track_file, files, workers, chunksize=8)
@@ -0,0 +1,344 @@
+"""HTTP transport overrides for the garth session (stand-in servers, cassettes)."""
+
+import base64
+import functools
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+from requests.structures import CaseInsensitiveDict
+
+from .errors import GarminCliError
+from .output import atomic_write
+
+API_URL_ENV = "GARMINCLI_API_URL"
+
+RECORD = "record"
+REPLAY = "replay"
+CASSETTE_SUFFIX = ".json.gz"
+
+# Never written to a cassette: credentials in headers and token payloads.
+DROP_HEADERS = frozenset({"authorization", "cookie", "set-cookie"})
+SECRET_KEYS = frozenset(
+    {
+        "access_token",
+        "refresh_token",
+        "jti",
+        "oauth_token",
+        "oauth_token_secret",
+        "mfa_token",
+    }
+)
+REDACTED = "REDACTED"
+
+
+def _retry(garth_client: Any) -> Retry:
+    """Same retry policy garth configures for its own adapter."""
+    return Retry(
+        total=garth_client.retries,
+        status_forcelist=garth_client.status_forcelist,
+        backoff_factor=garth_client.backoff_factor,
+    )
+
+
+def _canonical_body(body: Any) -> bytes:
+    if isinstance(body, str):
+        body = body.encode()
+    try:
+        return json.dumps(json.loads(body), sort_keys=True).encode()
+    except (ValueError, UnicodeDecodeError):
+        return body
+
+
+def request_key(method: str, url: str, body: Any = None) -> dict[str, Any]:
+    """Identify a request by method, path, sorted query params and body hash.
+
+    The host is left out so recordings replay against any base URL.
+    """
+    parts = urlsplit(url)
+    key: dict[str, Any] = {
+        "method": method.upper(),
+        "path": parts.path,
+        "params": sorted(parse_qsl(parts.query, keep_blank_values=True)),
+    }
+    if body:
+        key["body"] = hashlib.sha256(_canonical_body(body)).hexdigest()
+    return key
+
+
+def key_digest(key: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if k in SECRET_KEYS else _redact(v) for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(v) for v in value]
+    return value
+
+
+def _encode_body(content: bytes) -> tuple[str, str]:
+    """Response body as (text, encoding) with token values redacted."""
+    try:
+        text = content.decode()
+    except UnicodeDecodeError:
+        return base64.b64encode(content).decode(), "base64"
+    try:
+        return json.dumps(_redact(json.loads(text))), "utf-8"
+    except ValueError:
+        pass
+    pairs = parse_qsl(text, keep_blank_values=True)
+    if any(k in SECRET_KEYS for k, _ in pairs):
+        redacted = [(k, REDACTED if k in SECRET_KEYS else v) for k, v in pairs]
+        return urlencode(redacted), "utf-8"
+    return text, "utf-8"
+
+
+def build_response(
+    request: requests.PreparedRequest,
+    status: int,
+    reason: str,
+    headers: dict[str, str],
+    content: bytes,
+) -> requests.Response:
+    """A complete ``requests`` response that did not come from the network."""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    response.elapsed = timedelta(0)
+    return response
+
+
+class Cassette:
+    """Directory of recorded HTTP exchanges, one gzip file per request key.
+
+    Files are named after the key digest, so a lookup is a single open.
+    Repeated requests with the same key are kept in order and replayed in
+    order; the last one repeats once they run out.
+    """
+
+    def __init__(self, directory: str, mode: str) -> None:
+        self.directory = Path(directory).expanduser()
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._cursors: dict[str, int] = {}
+        if mode == RECORD:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        elif not self.directory.is_dir():
+            raise GarminCliError(f"No recordings found at {self.directory}")
+
+    def path(self, digest: str) -> Path:
+        return self.directory / f"{digest}{CASSETTE_SUFFIX}"
+
+    def record(
+        self,
+        key: dict[str, Any],
+        response: Optional[requests.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Append one response (or transport error) for ``key`` and persist it."""
+        if error is not None:
+            exchange: dict[str, Any] = {
+                "error": type(error).__name__,
+                "message": str(error),
+            }
+        else:
+            body, encoding = _encode_body(response.content)
+            exchange = {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    k: v
+                    for k, v in response.headers.items()
+                    if k.lower() not in DROP_HEADERS
+                },
+                "body": body,
+                "encoding": encoding,
+            }
+        digest = key_digest(key)
+        with self._lock:
+            # The first exchange of a session replaces older recordings.
+            entry = self._entries.setdefault(digest, {"key": key, "exchanges": []})
+            entry["exchanges"].append(exchange)
+            data = gzip.compress(json.dumps(entry).encode())
+            atomic_write(self.path(digest), data)
+
+    def _load(self, digest: str) -> Optional[dict[str, Any]]:
+        if digest not in self._entries:
+            try:
+                with gzip.open(self.path(digest), "rt") as f:
+                    self._entries[digest] = json.load(f)
+            except FileNotFoundError:
+                return None
+        return self._entries[digest]
+
+    def play(self, request: requests.PreparedRequest) -> requests.Response:
+        """Rebuild the next recorded response for ``request``."""
+        key = request_key(request.method, request.url, request.body)
+        digest = key_digest(key)
+        with self._lock:
+            entry = self._load(digest)
+            if entry is None:
+                raise requests.ConnectionError(
+                    f"No recorded response for {key['method']} {key['path']}",
+                    request=request,
+                )
+            exchanges = entry["exchanges"]
+            index = self._cursors.get(digest, 0)
+            self._cursors[digest] = index + 1
+            exchange = exchanges[min(index, len(exchanges) - 1)]
+
+        if "error" in exchange:
+            error_cls = getattr(requests.exceptions, exchange["error"], None)
+            if not (
+                isinstance(error_cls, type)
+                and issubclass(error_cls, requests.RequestException)
+            ):
+                error_cls = requests.ConnectionError
+            raise error_cls(exchange["message"], request=request)
+
+        if exchange["encoding"] == "base64":
+            content = base64.b64decode(exchange["body"])
+        else:
+            content = exchange["body"].encode()
+        return build_response(
+            request,
+            exchange["status"],
+            exchange["reason"],
+            exchange["headers"],
+            content,
+        )
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Every stored key with its exchanges, e.g. to build fixtures."""
+        result = []
+        for path in sorted(self.directory.glob(f"*{CASSETTE_SUFFIX}")):
+            with gzip.open(path, "rt") as f:
+                result.append(json.load(f))
+        return result
+
+
+_cassette: Optional[Cassette] = None
+
+
+def set_cassette(cassette: Optional[Cassette]) -> None:
+    """Record or replay the HTTP traffic of clients loaded from now on."""
+    global _cassette
+    _cassette = cassette
+
+
+def get_cassette() -> Optional[Cassette]:
+    return _cassette
+
+
+def replaying() -> bool:
+    """Whether HTTP traffic is served from a cassette, with no network."""
+    return _cassette is not None and _cassette.mode == REPLAY
+
+
+class RedirectAdapter(HTTPAdapter):
+    """Send every request to ``base_url`` (if set), keeping path and query."""
+
+    def __init__(self, base_url: Optional[str], **kwargs: Any) -> None:
+        self.base = urlsplit(base_url.rstrip("/")) if base_url else None
+        super().__init__(**kwargs)
+
+    def redirect(self, request: Any) -> None:
+        if self.base is not None:
+            parts = urlsplit(request.url)
+            request.url = urlunsplit(
+                (
+                    self.base.scheme,
+                    self.base.netloc,
+                    self.base.path + parts.path,
+                    parts.query,
+                    parts.fragment,
+                )
+            )
+
+    def send(self, request: Any, **kwargs: Any) -> Any:
+        self.redirect(request)
+        return super().send(request, **kwargs)
+
+
+class CassetteAdapter(RedirectAdapter):
+    """Record every exchange to a cassette, or serve them back offline."""
+
+    def __init__(
+        self, cassette: Cassette, base_url: Optional[str], **kwargs: Any
+    ) -> None:
+        self.cassette = cassette
+        super().__init__(base_url, **kwargs)
+
+    def send(self, request: Any, **kwargs: Any) -> Any:
+        if self.cassette.mode == REPLAY:
+            return self.cassette.play(request)
+        key = request_key(request.method, request.url, request.body)
+        try:
+            response = super().send(request, **kwargs)
+        except requests.RequestException as e:
+            self.cassette.record(key, error=e)
+            raise
+        self.cassette.record(key, response)
+        return response
+
+
+def install_transport(garth_client: Any, api_url: Optional[str] = None) -> None:
+    """Mount transport overrides on a garth client's session.
+
+    With ``api_url`` (or GARMINCLI_API_URL) set, all Garmin traffic goes to
+    that base URL instead, e.g. a local stand-in server; with a cassette set
+    it is recorded or replayed; with the asyncio backend enabled, requests
+    made inside ``async_backend.run`` are handed to its event loop (a
+    cassette takes precedence). garth remounts its own adapter whenever it
+    is configured (token load included), so the override is re-applied
+    after every ``configure`` call.
+    """
+    from .async_backend import DeferredAdapter, async_limit  # imports this module
+
+    api_url = api_url or os.environ.get(API_URL_ENV)
+    cassette = _cassette
+    deferred = async_limit() is not None
+    if not api_url and cassette is None and not deferred:
+        return
+
+    def mount() -> None:
+        options = {
+            "max_retries": _retry(garth_client),
+            "pool_connections": garth_client.pool_connections,
+            "pool_maxsize": garth_client.pool_maxsize,
+        }
+        if cassette is not None:
+            adapter = CassetteAdapter(cassette, api_url, **options)
+        elif deferred:
+            adapter = DeferredAdapter(api_url, **options)
+        else:
+            adapter = RedirectAdapter(api_url, **options)
+        garth_client.sess.mount("https://", adapter)
+
+    configure = garth_client.configure
+
+    @functools.wraps(configure)
+    def configure_and_mount(*args: Any, **kwargs: Any) -> None:
+        configure(*args, **kwargs)
+        mount()
+
+    garth_client.configure = configure_and_mount
+    mount()
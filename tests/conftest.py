@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _no_stats_log(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep CLI runs in tests from appending to the user's request log."""
+    monkeypatch.setenv("GARMINCLI_STATS", "off")
+
+
+@pytest.fixture(autouse=True)
+def _no_rate_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Commands such as `gc export` install a process-wide limiter; undo it."""
+    from garmincli import api
+
+    monkeypatch.setattr(api, "_rate_limiter", None)
@@ -0,0 +1,152 @@
+import json
+import subprocess
+from pathlib import Path
+from typing import Any
+
+from typer.testing import CliRunner
+
+from garmincli import accounts, cli
+from garmincli.cli import app
+
+
+runner = CliRunner()
+
+
+def _token_store(path: Path) -> Path:
+    path.mkdir(parents=True)
+    (path / "oauth2_token.json").write_text("{}")
+    return path
+
+
+def test_resolve_accounts_from_directory(tmp_path: Path) -> None:
+    _token_store(tmp_path / "bob")
+    _token_store(tmp_path / "alice")
+    (tmp_path / "notes").mkdir()
+
+    resolved = accounts.resolve_accounts(str(tmp_path))
+    assert [name for name, _ in resolved] == ["alice", "bob"]
+
+
+def test_resolve_accounts_from_list(tmp_path: Path) -> None:
+    a = _token_store(tmp_path / "a")
+    b = _token_store(tmp_path / "b")
+    resolved = accounts.resolve_accounts(f"{a}, {b}")
+    assert resolved == [("a", a.resolve()), ("b", b.resolve())]
+
+
+def test_pop_option_handles_both_spellings() -> None:
+    value, rest = accounts.pop_option(
+        ["health", "today", "-f", "table", "--format=json"], ("--format", "-f")
+    )
+    assert value == "json"
+    assert rest == ["health", "today"]
+
+
+def test_accounts_mode_merges_rows_and_reports_failures(monkeypatch) -> None:
+    seen: dict[str, Any] = {}
+
+    def _fake_run_accounts(resolved, args, workers, rate_limit, **kwargs):  # noqa: ANN001
+        seen.update({"args": args, "workers": workers, "rate_limit": rate_limit})
+        return [
+            {"account": "alice", "data": [{"steps": 100}, {"steps": 200}]},
+            {"account": "bob", "error": "Not logged in."},
+            {"account": "carol", "data": {"steps": 300}},
+        ]
+
+    monkeypatch.setattr(
+        cli,
+        "resolve_accounts",
+        lambda spec: [("alice", Path("a")), ("bob", Path("b")), ("carol", Path("c"))],
+    )
+    monkeypatch.setattr(cli, "run_accounts", _fake_run_accounts)
+
+    captured: dict[str, Any] = {}
+
+    def _capture_render(data: Any, **kwargs: Any) -> None:
+        captured["data"] = data
+        captured.update(kwargs)
+
+    monkeypatch.setattr(cli, "render", _capture_render)
+
+    result = runner.invoke(
+        app,
+        [
+            "--accounts",
+            "team",
+            "--rate-limit",
+            "2",
+            "steps",
+            "week",
+            "--format",
+            "json",
+            "--tokenstore",
+            "ignored",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert seen == {"args": ["steps", "week"], "workers": 4, "rate_limit": 2.0}
+    assert captured["fmt"] == "json"
+    assert captured["data"] == [
+        {"account": "alice", "steps": 100},
+        {"account": "alice", "steps": 200},
+        {"account": "bob", "error": "Not logged in."},
+        {"account": "carol", "steps": 300},
+    ]
+    cli.set_rate_limit(None)
+
+
+def test_accounts_mode_forwards_global_options(monkeypatch, tmp_path: Path) -> None:
+    commands: dict[str, list[str]] = {}
+
+    def _fake_run(cmd: list[str], env: dict[str, str]) -> Any:
+        account = Path(cmd[cmd.index("--tokenstore") + 1]).name
+        commands[account] = cmd
+        output = Path(cmd[cmd.index("--output") + 1])
+        output.write_text('[{"steps": 100}]')
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(accounts, "_run", _fake_run)
+    monkeypatch.setattr(
+        cli,
+        "resolve_accounts",
+        lambda spec: [("alice", tmp_path / "alice"), ("bob", tmp_path / "bob")],
+    )
+    cassette = str(tmp_path / "cassette")
+
+    result = runner.invoke(
+        app,
+        [
+            "--accounts",
+            "team",
+            "--fields",
+            "steps",
+            "--where",
+            "steps > 10",
+            "--replay",
+            cassette,
+            "steps",
+            "week",
+            "--format",
+            "json",
+        ],
+    )
+    cli.set_cassette(None)
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout) == [
+        {"account": "alice", "steps": 100},
+        {"account": "bob", "steps": 100},
+    ]
+    alice = commands["alice"]
+    start = alice.index("--fields")
+    assert alice[start : start + 8] == [
+        "--fields",
+        "steps",
+        "--where",
+        "steps > 10",
+        "--replay",
+        str(Path(cassette) / "alice"),
+        "steps",
+        "week",
+    ]
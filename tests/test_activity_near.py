@@ -0,0 +1,144 @@
+import json
+import struct
+import zipfile
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from garmincli import tracks
+from garmincli.cli import app
+from garmincli.store import Store
+
+runner = CliRunner()
+
+# Two out-and-back routes from the same park: one heads north, one east.
+PARK = (52.5000, 13.4000)
+NORTH = [(52.5000 + i * 0.001, 13.4000) for i in range(30)]
+EAST = [(52.5000, 13.4000 + i * 0.0015) for i in range(30)]
+
+
+def _gpx(points: list[tuple[float, float]]) -> str:
+    trkpts = "".join(f'<trkpt lat="{lat}" lon="{lon}"></trkpt>' for lat, lon in points)
+    return (
+        '<gpx xmlns="http://www.topografix.com/GPX/1/1">'
+        f"<trk><trkseg>{trkpts}</trkseg></trk></gpx>"
+    )
+
+
+def _fit(points: list[tuple[float, float]]) -> bytes:
+    """Minimal FIT file: a record definition (timestamp, lat, long) and data."""
+    body = bytes([0x40, 0, 0]) + struct.pack("<HB", 20, 3)
+    body += bytes([253, 4, 0x86, 0, 4, 0x85, 1, 4, 0x85])
+    for i, (lat, lon) in enumerate(points):
+        semis = [round(v * 2**31 / 180) for v in (lat, lon)]
+        body += bytes([0]) + struct.pack("<Iii", 1000 + i, *semis)
+    header = struct.pack("<BBHI4s", 12, 0x10, 2100, len(body), b".FIT")
+    return header + body + b"\0\0"
+
+
+def _store(tmp_path: Path) -> str:
+    store = str(tmp_path / "store.db")
+    with Store(store) as db:
+        db.upsert_activities(
+            [
+                {
+                    "activityId": 14000101,
+                    "activityName": "North loop",
+                    "startTimeLocal": "2024-05-01 07:00:00",
+                    "startLatitude": PARK[0],
+                    "startLongitude": PARK[1],
+                },
+                {
+                    "activityId": 14000102,
+                    "activityName": "East loop",
+                    "startTimeLocal": "2024-05-02 07:00:00",
+                },
+                {
+                    "activityId": 14000103,
+                    "activityName": "Elsewhere",
+                    "startTimeLocal": "2024-05-03 07:00:00",
+                    "startLatitude": 48.1,
+                    "startLongitude": 11.5,
+                },
+            ]
+        )
+    return store
+
+
+def _near(store: str, *args: str) -> list[dict]:
+    result = runner.invoke(
+        app, ["activities", "near", *args, "--store", store, "-f", "json"]
+    )
+    assert result.exit_code == 0, result.output
+    return json.loads(result.output)
+
+
+def test_track_formats_and_simplify(tmp_path) -> None:
+    tcx = tmp_path / "14000104.tcx"
+    tcx.write_text(
+        '<TrainingCenterDatabase xmlns="http://www.garmin.com/xmlschemas/'
+        'TrainingCenterDatabase/v2"><Trackpoint><Position>'
+        "<LatitudeDegrees>52.5</LatitudeDegrees>"
+        "<LongitudeDegrees>13.4</LongitudeDegrees>"
+        "</Position></Trackpoint><Trackpoint><Time/></Trackpoint>"
+        "</TrainingCenterDatabase>"
+    )
+    assert tracks.read_track(tcx) == [(52.5, 13.4)]
+
+    decoded = tracks.fit_points(_fit(NORTH))
+    assert len(decoded) == 30
+    assert abs(decoded[5][0] - NORTH[5][0]) < 1e-6
+
+    # A straight line collapses to its ends; a corner is kept.
+    assert tracks.simplify(NORTH) == [NORTH[0], NORTH[-1]]
+    corner = NORTH + [(NORTH[-1][0], 13.4 + i * 0.001) for i in range(1, 10)]
+    assert len(tracks.simplify(corner)) == 3
+
+
+def test_activity_ids_come_from_download_names_only() -> None:
+    assert tracks.activity_id_for(Path("14000101_ACTIVITY.fit")) == 14000101
+    assert tracks.activity_id_for(Path("dl/14000102.gpx")) == 14000102
+    assert tracks.activity_id_for(Path("2024/03/14000103/original.zip")) == 14000103
+    assert tracks.activity_id_for(Path("rides/20240301_morning_run.gpx")) is None
+    assert tracks.activity_id_for(Path("2024-03-01/morning.gpx")) is None
+
+
+def test_index_tracks_then_near(tmp_path) -> None:
+    store = _store(tmp_path)
+    downloads = tmp_path / "downloads"
+    (downloads / "14000102").mkdir(parents=True)
+    (downloads / "14000101_ACTIVITY.gpx").write_text(_gpx(NORTH))
+    with zipfile.ZipFile(downloads / "14000102" / "original.zip", "w") as archive:
+        archive.writestr("14000102_ACTIVITY.fit", _fit(EAST))
+    (downloads / "notes.gpx").write_text("no activity id")
+
+    result = runner.invoke(
+        app, ["activities", "index-tracks", str(downloads), "--store", store, "-w", "1"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Indexed 2 track(s) from 2 new file(s)" in result.output
+
+    # 14000102 has no start point in its summary; its track provides one.
+    assert [r["activity_id"] for r in _near(store, "52.5005,13.4005")] == [
+        14000102,
+        14000101,
+    ]
+    assert _near(store, "48.1,11.5", "-r", "0.1")[0]["name"] == "Elsewhere"
+
+    # Only the north route passes 2 km north of the park.
+    north = _near(store, "52.518,13.4001", "--track", "-r", "0.2")
+    assert [r["activity_id"] for r in north] == [14000101]
+    both = _near(store, f"{PARK[0]},{PARK[1]}", "52.5,13.43", "--track", "-r", "0.1")
+    assert [r["activity_id"] for r in both] == [14000102]
+
+    result = runner.invoke(
+        app, ["activities", "index-tracks", str(downloads), "--store", store]
+    )
+    assert "from 0 new file(s)" in result.output
+
+
+def test_near_validates_points(tmp_path) -> None:
+    store = _store(tmp_path)
+    for args in (["52.5"], ["95,13"], ["52.5,13.4", "52.6,13.4"]):
+        result = runner.invoke(app, ["activities", "near", *args, "--store", store])
+        assert result.exit_code == 1
@@ -0,0 +1,129 @@
+import json
+from typing import Any
+
+from typer.testing import CliRunner
+
+from garmincli.cli import app
+from garmincli.commands.activities import search_expression
+from garmincli.store import Store
+
+runner = CliRunner()
+
+
+def _activity(
+    activity_id: int, name: str, type_key: str, start: str, **extra: Any
+) -> dict[str, Any]:
+    return {
+        "activityId": activity_id,
+        "activityName": name,
+        "activityType": {"typeKey": type_key},
+        "startTimeLocal": start,
+        "deviceId": 3456,
+        **extra,
+    }
+
+
+def _seed(path: str) -> None:
+    with Store(path) as db:
+        db.upsert_activities(
+            [
+                _activity(
+                    1, "Tempo Tuesday", "treadmill_running", "2024-03-05 18:00:00"
+                ),
+                _activity(2, "Tempo run", "running", "2024-04-02 07:00:00"),
+                _activity(
+                    3,
+                    "Easy spin",
+                    "indoor_cycling",
+                    "2024-04-03 19:00:00",
+                    description="After the tempo session",
+                ),
+                _activity(4, "Tempo", "treadmill_running", "2023-11-20 18:00:00"),
+                _activity(
+                    5,
+                    "Parkrun",
+                    "running",
+                    "2024-04-06 09:00:00",
+                    locationName="Zürich",
+                ),
+            ]
+        )
+
+
+def _search(store: str, *args: str) -> list[dict[str, Any]]:
+    result = runner.invoke(
+        app, ["activities", "search", *args, "--store", store, "-f", "json"]
+    )
+    assert result.exit_code == 0, result.output
+    return json.loads(result.output)
+
+
+def test_search_expression() -> None:
+    assert search_expression("*tempo* tread") == '"tempo"* AND "tread"*'
+    assert search_expression("name:tempo") == 'name : "tempo"*'
+    assert search_expression("") is None
+
+
+def test_search_matches_words_fields_and_filters(tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    _seed(store)
+
+    rows = _search(
+        store, "tempo treadmill", "--start", "2024-01-01", "--end", "2024-12-31"
+    )
+    assert [r["activity_id"] for r in rows] == [1]
+
+    rows = _search(store, "tempo")
+    assert [r["activity_id"] for r in rows] == [3, 2, 1, 4]  # newest first
+
+    rows = _search(store, "tempo", "--start", "2024-W14", "--end", "2024-04")
+    assert [r["activity_id"] for r in rows] == [3, 2]
+    facets = _search(store, "tempo", "--facets", "--end", "2023-Q4")
+    assert {"facet": "month", "value": "2023-11", "count": 1} in facets
+
+    assert [r["activity_id"] for r in _search(store, "name:tempo", "-l", "2")] == [2, 1]
+    assert [r["activity_id"] for r in _search(store, "zurich")] == [5]
+
+
+def test_facets(tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    _seed(store)
+
+    facets = _search(store, "tempo", "--facets")
+
+    assert {"facet": "type", "value": "treadmill_running", "count": 2} in facets
+    assert {"facet": "month", "value": "2024-04", "count": 2} in facets
+    assert {"facet": "device", "value": "3456", "count": 4} in facets
+
+
+def test_index_follows_updates_and_gear(tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    _seed(store)
+    with Store(store) as db:
+        db.upsert_activities(
+            [_activity(2, "Threshold run", "running", "2024-04-02 07:00:00")]
+        )
+        db.set_activity_gear(2, [{"uuid": "g1", "displayName": "Pegasus 40"}])
+
+    assert [r["activity_id"] for r in _search(store, "threshold pegasus")] == [2]
+    assert 2 not in [r["activity_id"] for r in _search(store, "tempo")]
+
+
+def test_existing_store_is_backfilled(tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    _seed(store)
+    with Store(store) as db:  # simulate a store synced before search existed
+        db.conn.execute("DELETE FROM activity_search")
+        db.conn.execute("DELETE FROM activity_facets")
+        db.conn.execute("PRAGMA user_version = 0")
+        db.conn.commit()
+
+    assert len(_search(store, "tempo")) == 4
+
+
+def test_unknown_field(tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    _seed(store)
+    result = runner.invoke(app, ["activities", "search", "foo:bar", "--store", store])
+    assert result.exit_code == 1
+    assert "Unknown search field" in result.output
@@ -0,0 +1,186 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import garth
+import pytest
+from garth.auth_tokens import OAuth1Token, OAuth2Token
+
+pytest.importorskip("httpx")
+
+from garmincli import api, async_backend, profiling, transport  # noqa: E402
+from garmincli.errors import GarminCliError  # noqa: E402
+
+DELAY = 0.1
+
+
+class _Slow(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures: dict[str, int] = {}
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def do_GET(self) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        try:
+            time.sleep(DELAY)
+            self._answer()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _answer(self) -> None:
+        remaining = self.failures.get(self.path, 0)
+        if remaining:
+            self.failures[self.path] = remaining - 1
+            self._reply(503, {})
+            return
+        self._reply(200, {"path": self.path, "auth": self.headers["Authorization"]})
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 128  # the default backlog of 5 would serialize us
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    _Slow.peak = 0
+    httpd = _Server(("127.0.0.1", 0), _Slow)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _garth_client() -> garth.Client:
+    garth_client = garth.Client()
+    garth_client.oauth1_token = OAuth1Token("token", "secret")
+    now = int(time.time())
+    garth_client.oauth2_token = OAuth2Token(
+        scope="",
+        jti="",
+        token_type="Bearer",
+        access_token="abc",
+        refresh_token="def",
+        expires_in=3600,
+        expires_at=now + 3600,
+        refresh_token_expires_in=7200,
+        refresh_token_expires_at=now + 7200,
+    )
+    return garth_client
+
+
+def _threads_of(garth_client: garth.Client) -> set[int]:
+    threads: set[int] = set()
+    garth_client.sess.hooks["response"].append(
+        lambda response, *args, **kwargs: threads.add(threading.get_ident())
+    )
+    return threads
+
+
+@pytest.fixture
+def client(server_url: str) -> Iterator[garth.Client]:
+    async_backend.set_async_limit(64)
+    garth_client = _garth_client()
+    transport.install_transport(garth_client, server_url)
+    yield garth_client
+    async_backend.set_async_limit(None)
+
+
+def test_calls_share_one_thread(client: garth.Client) -> None:
+    paths = [f"/usersummary-service/day/{i}" for i in range(40)]
+    threads = _threads_of(client)
+
+    results = api.api_map(client.connectapi, paths, workers=4)
+
+    assert [r["path"] for r in results] == paths
+    assert {r["auth"] for r in results} == {"Bearer abc"}
+    assert threads == {threading.get_ident()}
+    assert _Slow.peak > 4  # more in flight than the 4 threads would allow
+
+
+def test_sessions_without_the_adapter_stay_on_threads(
+    server_url: str, monkeypatch
+) -> None:
+    # Loaded before the engine was enabled: a plain redirect adapter.
+    garth_client = _garth_client()
+    transport.install_transport(garth_client, server_url)
+    async_backend.set_async_limit(64)
+    try:
+
+        def no_engine(*args: object) -> None:
+            raise AssertionError("the engine would block on this session")
+
+        monkeypatch.setattr(async_backend, "run", no_engine)
+        threads = _threads_of(garth_client)
+        paths = [f"/{i}" for i in range(8)]
+
+        results = api.api_map(garth_client.connectapi, paths, workers=4)
+
+        assert [r["path"] for r in results] == paths
+        assert len(threads) > 1 and _Slow.peak > 1
+    finally:
+        async_backend.set_async_limit(None)
+
+
+def test_cassette_takes_precedence(client: garth.Client, tmp_path) -> None:
+    transport.set_cassette(transport.Cassette(str(tmp_path), transport.RECORD))
+    try:
+        assert not async_backend.drives(client.connectapi)
+    finally:
+        transport.set_cassette(None)
+    assert async_backend.drives(client.connectapi)
+    assert not async_backend.drives(lambda path: client.connectapi(path))
+
+
+def test_retries_and_errors_follow_garth(client: garth.Client) -> None:
+    _Slow.failures = {"/retry": 1, "/down": 99}
+    client.retries = 1
+    client.backoff_factor = 0
+    client.configure()
+
+    results = api.api_map(client.connectapi, ["/retry", "/ok"], workers=2)
+    assert [r["path"] for r in results] == ["/retry", "/ok"]
+
+    with pytest.raises(GarminCliError):
+        api.api_map(partial(client.connectapi), ["/down", "/ok"], workers=2)
+    assert _Slow.failures["/down"] == 97  # one try and one retry
+
+
+def test_suspended_calls_are_profiled_once(client: garth.Client) -> None:
+    profiler = profiling.enable_profiling()
+    profiler.attach(client.sess)
+    try:
+        api.api_map(client.connectapi, ["/a", "/b"], workers=2)
+    finally:
+        profiling.disable_profiling()
+
+    calls = [s for s in profiler.spans if s["kind"] == "api"]
+    assert len(calls) == 2
+    assert all("error" not in s and s["http_requests"] == 1 for s in calls)
+
+
+def test_disabled_backend_uses_threads(client: garth.Client) -> None:
+    async_backend.set_async_limit(None)
+    assert api.api_map(lambda x: x * 2, [1, 2, 3]) == [2, 4, 6]
+    with pytest.raises(GarminCliError, match="at least 1"):
+        async_backend.set_async_limit(0)
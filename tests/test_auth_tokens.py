@@ -0,0 +1,142 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any
+
+from garth.auth_tokens import OAuth1Token, OAuth2Token
+from typer.testing import CliRunner
+
+from garmincli import auth, transport
+from garmincli.cli import app
+
+
+def _oauth2(expires_in: int, access_token: str = "access") -> OAuth2Token:
+    now = int(time.time())
+    return OAuth2Token(
+        scope="scope",
+        jti="jti",
+        token_type="Bearer",
+        access_token=access_token,
+        refresh_token="refresh",
+        expires_in=expires_in,
+        expires_at=now + expires_in,
+        refresh_token_expires_in=86400,
+        refresh_token_expires_at=now + 86400,
+    )
+
+
+class _FakeGarth:
+    def __init__(self, oauth2: OAuth2Token) -> None:
+        self.oauth1_token = OAuth1Token(oauth_token="t", oauth_token_secret="s")
+        self.oauth2_token: Any = oauth2
+        self.exchanges = 0
+
+    def refresh_oauth2(self) -> None:
+        self.exchanges += 1
+        self.oauth2_token = _oauth2(3600, access_token=f"fresh-{self.exchanges}")
+
+
+def test_dump_tokens_writes_both_files_atomically(tmp_path: Path) -> None:
+    garth = _FakeGarth(_oauth2(3600))
+    auth.dump_tokens(garth, tmp_path)
+
+    assert (
+        json.loads((tmp_path / "oauth1_token.json").read_text())["oauth_token"] == "t"
+    )
+    assert (
+        json.loads((tmp_path / "oauth2_token.json").read_text())["access_token"]
+        == "access"
+    )
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "oauth1_token.json",
+        "oauth2_token.json",
+    ]
+    assert {p.stat().st_mode & 0o777 for p in tmp_path.iterdir()} == {0o600}
+
+
+def test_refresh_hook_exchanges_and_persists_stale_token(tmp_path: Path) -> None:
+    garth = _FakeGarth(_oauth2(10))
+    auth.dump_tokens(garth, tmp_path)
+    auth._install_refresh_hook(garth, tmp_path)
+
+    garth.refresh_oauth2()
+
+    assert garth.exchanges == 1
+    stored = json.loads((tmp_path / "oauth2_token.json").read_text())
+    assert stored["access_token"] == "fresh-1"
+
+
+def test_refresh_hook_reuses_token_refreshed_by_another_process(
+    tmp_path: Path,
+) -> None:
+    other = _FakeGarth(_oauth2(3600, access_token="from-other-process"))
+    auth.dump_tokens(other, tmp_path)
+
+    garth = _FakeGarth(_oauth2(10))
+    auth._install_refresh_hook(garth, tmp_path)
+    garth.refresh_oauth2()
+
+    assert garth.exchanges == 0
+    assert garth.oauth2_token.access_token == "from-other-process"
+
+
+class _Connect(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = json.dumps(
+            {
+                "displayName": "runner",
+                "userData": {"measurementSystem": "metric"},
+                "totalCount": 42,
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def test_replay_with_expired_token_stays_offline(tmp_path: Path, monkeypatch) -> None:
+    httpd = HTTPServer(("127.0.0.1", 0), _Connect)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    tokens, cassette = tmp_path / "tokens", str(tmp_path / "cassette")
+    auth.dump_tokens(_FakeGarth(_oauth2(3600)), tokens)
+    monkeypatch.setattr(auth, "_clients", {})
+    try:
+        monkeypatch.setenv(
+            transport.API_URL_ENV, f"http://127.0.0.1:{httpd.server_port}"
+        )
+        recorded = CliRunner().invoke(
+            app,
+            ["--record", cassette, "activities", "count", "--tokenstore", str(tokens)],
+        )
+        assert recorded.exit_code == 0, recorded.output
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        transport.set_cassette(None)
+
+    auth.dump_tokens(_FakeGarth(_oauth2(-60)), tokens)
+    auth._clients.clear()
+    monkeypatch.delenv(transport.API_URL_ENV)
+
+    def offline(*args: Any, **kwargs: Any) -> None:
+        raise OSError("network blocked")
+
+    monkeypatch.setattr(socket.socket, "connect", offline)
+    try:
+        replayed = CliRunner().invoke(
+            app,
+            ["--replay", cassette, "activities", "count", "--tokenstore", str(tokens)],
+        )
+    finally:
+        transport.set_cassette(None)
+
+    assert replayed.exit_code == 0, replayed.output
+    assert "Total activities: 42" in replayed.output
@@ -0,0 +1,88 @@
+import json
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from garmincli.cli import app
+from garmincli.commands import batch, health
+from garmincli.errors import GarminCliError
+
+
+runner = CliRunner()
+
+
+class _SummaryClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def get_user_summary(self, cdate: str) -> dict[str, Any]:
+        self.calls.append(cdate)
+        return {"calendarDate": cdate, "totalSteps": 1234}
+
+
+def test_parse_line_formats() -> None:
+    assert batch.parse_line("gc health 'today'") == ["health", "today"]
+    assert batch.parse_line('["steps", "--start", "2025-01-01"]') == [
+        "steps",
+        "--start",
+        "2025-01-01",
+    ]
+    assert batch.parse_line("   ") is None
+    assert batch.parse_line("# note") is None
+
+
+def test_parse_line_rejects_bad_input() -> None:
+    for line in ('["health", 1]', "[not json", "batch", "health 'unterminated"):
+        with pytest.raises(GarminCliError):
+            batch.parse_line(line)
+
+
+def test_batch_shares_client_and_cache(monkeypatch) -> None:
+    client = _SummaryClient()
+    loads: list[str | None] = []
+
+    def _load_client(tokenstore: str | None = None) -> _SummaryClient:
+        loads.append(tokenstore)
+        return client
+
+    monkeypatch.setattr(health, "load_client", _load_client)
+
+    stdin = "\n".join(
+        [
+            "health 2025-01-02",
+            '["health", "2025-01-02"]',
+            "health 2025-01-03",
+            "no-such-command",
+        ]
+    )
+    result = runner.invoke(app, ["batch", "--jobs", "2"], input=stdin)
+
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["line"] for r in records] == [1, 2, 3, 4]
+    assert records[0]["data"] == {"calendarDate": "2025-01-02", "totalSteps": 1234}
+    assert records[1]["data"] == records[0]["data"]
+    assert records[3]["ok"] is False
+    assert "no-such-command" in records[3]["error"]
+    assert result.exit_code == 1
+    assert sorted(client.calls) == ["2025-01-02", "2025-01-03"]
+
+
+def test_batch_survives_unexpected_errors(monkeypatch) -> None:
+    client = _SummaryClient()
+
+    def _load_client(tokenstore: str | None = None) -> _SummaryClient:
+        if tokenstore == "broken":
+            raise KeyError("oauth2_token")
+        return client
+
+    monkeypatch.setattr(health, "load_client", _load_client)
+
+    stdin = "health 2025-01-02 --tokenstore broken\nhealth 2025-01-03\n"
+    result = runner.invoke(app, ["batch"], input=stdin)
+
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["ok"] for r in records] == [False, True]
+    assert records[0]["exit_code"] == 1
+    assert "KeyError('oauth2_token')" in records[0]["error"]
+    assert records[1]["data"]["calendarDate"] == "2025-01-03"
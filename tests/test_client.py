@@ -0,0 +1,101 @@
+from datetime import date
+from typing import Any
+
+import pytest
+
+import garmincli
+from garmincli import api
+from garmincli.client import Client, Records
+from garmincli.errors import GarminCliError
+
+
+class _Garmin:
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def get_sleep_data(self, cdate: str) -> Any:
+        self.calls.append(("sleep", cdate))
+        if cdate == "2024-01-02":
+            return None
+        return {"dailySleepDTO": {"sleepTimeSeconds": 28000}}
+
+    def get_activities_by_date(
+        self, start: str, end: str, activity_type: Any = None
+    ) -> list[dict[str, Any]]:
+        self.calls.append(("activities", start, end))
+        return [
+            {
+                "activityId": int(start.replace("-", "")),
+                "activityType": {"typeKey": "running"},
+                "distance": 5000.0,
+            }
+        ]
+
+    def get_stats(self, cdate: str) -> dict[str, Any]:
+        self.calls.append(("stats", cdate))
+        return {"totalSteps": 1000}
+
+
+@pytest.fixture
+def client(monkeypatch) -> Client:
+    monkeypatch.setattr(api, "_cache", None)
+    return Client(garmin=_Garmin(), workers=2)
+
+
+def test_package_exports_client() -> None:
+    assert garmincli.Client is Client
+
+
+def test_daily_records(client: Client) -> None:
+    sleep = client.daily("sleep", "2024-01-01", date(2024, 1, 3))
+
+    assert [r.calendarDate for r in sleep] == ["2024-01-01", "2024-01-03"]
+    assert sleep[0].dailySleepDTO.sleepTimeSeconds == 28000
+    assert sleep[0]["dailySleepDTO"] == {"sleepTimeSeconds": 28000}
+    with pytest.raises(AttributeError):
+        sleep[0].missing
+
+
+def test_range_expression_end_covers_the_whole_range(client: Client) -> None:
+    client.daily("sleep", "2024-01", "2024-03")
+    days = [call[1] for call in client.garmin.calls]
+    assert (min(days), max(days), len(days)) == ("2024-01-01", "2024-03-31", 91)
+
+
+def test_range_calls_are_split_and_cached(client: Client) -> None:
+    runs = client.activities("2023-01-01", "2023-12-31")
+
+    assert len(runs) == 3  # 180-day windows
+    assert runs[0].activityType.typeKey == "running"
+    assert isinstance(runs[1:], Records)
+
+    client.get_stats("2024-05-01")
+    client.get_stats("2024-05-01")
+    assert client.garmin.calls.count(("stats", "2024-05-01")) == 1
+
+
+def test_records_to_arrow(client: Client) -> None:
+    pytest.importorskip("pyarrow")
+    table = client.activities("2024-01-01", "2024-01-31").to_arrow()
+    assert table.column_names == ["activityId", "activityType.typeKey", "distance"]
+
+
+def test_bad_dates_raise_library_errors(client: Client) -> None:
+    with pytest.raises(GarminCliError):
+        client.daily("sleep", "2024-13-01")
+    with pytest.raises(GarminCliError):
+        client.daily("nope", "2024-01-01")
+
+
+def test_process_wide_settings_must_agree(client: Client, monkeypatch) -> None:
+    monkeypatch.setattr(api, "_rate_limiter", None)
+    Client(garmin=_Garmin(), rate_limit=5)
+    assert api.get_rate_limit() == 5
+    Client(garmin=_Garmin(), rate_limit=5)
+
+    with pytest.raises(GarminCliError, match="rate_limit"):
+        Client(garmin=_Garmin(), rate_limit=2)
+    # The installed cache cannot be switched off by a later client.
+    with pytest.raises(GarminCliError, match="cache_ttl"):
+        Client(garmin=_Garmin(), cache_ttl=0)
+    assert api.get_rate_limit() == 5
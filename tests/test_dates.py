@@ -39,3 +39,83 @@ def test_resolve_date_range() -> None:
 
 def test_resolve_date_single_date() -> None:
     assert dates.resolve_date(date_str="2025-02-05") == ("2025-02-05", None)
+
+
+def test_plan_range_splits_into_windows() -> None:
+    assert dates.plan_range("2025-01-01", "2025-03-05", 28) == [
+        ("2025-01-01", "2025-01-28"),
+        ("2025-01-29", "2025-02-25"),
+        ("2025-02-26", "2025-03-05"),
+    ]
+
+
+def test_plan_range_single_window() -> None:
+    assert dates.plan_range("2025-01-01", "2025-01-01", 28) == [
+        ("2025-01-01", "2025-01-01")
+    ]
+
+
+def test_plan_range_rejects_reversed_range() -> None:
+    with pytest.raises(typer.BadParameter):
+        dates.plan_range("2025-02-01", "2025-01-01", 28)
+
+
+def test_resolve_date_range_expressions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(dates, "date", FixedDate)
+    assert dates.resolve_date("last-90d") == ("2024-10-18", "2025-01-15")
+    assert dates.resolve_date("last-2w") == ("2025-01-02", "2025-01-15")
+    assert dates.resolve_date("ytd") == ("2025-01-01", "2025-01-15")
+    assert dates.resolve_date("2024-W07") == ("2024-02-12", "2024-02-18")
+    assert dates.resolve_date("2024-02") == ("2024-02-01", "2024-02-29")
+    assert dates.resolve_date("2024-Q4") == ("2024-10-01", "2024-12-31")
+    assert dates.resolve_date("since:2024-12-01") == ("2024-12-01", "2025-01-15")
+    assert dates.resolve_date(date_str="2024-Q1") == ("2024-01-01", "2024-03-31")
+
+
+def test_resolve_range_clips_future_end(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(dates, "date", FixedDate)
+    assert dates.resolve_date("2025-01") == ("2025-01-01", "2025-01-15")
+    assert dates.resolve_date("2025-Q1") == ("2025-01-01", "2025-01-15")
+
+
+def test_resolve_range_invalid_expressions() -> None:
+    for value in ("2024-W60", "2024-13", "since:2024/01/01", "last-0d"):
+        with pytest.raises(typer.BadParameter):
+            dates.resolve_date(value)
+
+
+def test_equivalent_ranges_resolve_to_the_same_strings() -> None:
+    a = dates.resolve_range("2024-02")
+    b = dates.resolve_range(start="2024-02-01", end="2024-02-29")
+    assert a == b
+    assert a.as_strings() == ("2024-02-01", "2024-02-29")
+    assert dates.resolve_range("2024-02-05").as_strings() == ("2024-02-05", None)
+
+
+def test_resolve_bounds(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(dates, "date", FixedDate)
+    assert dates.resolve_bounds() == (None, None)
+    assert dates.resolve_bounds("ytd", "today") == ("2025-01-01", "2025-01-15")
+    assert dates.resolve_bounds("2024-02", "2024-02") == ("2024-02-01", "2024-02-29")
+    assert dates.resolve_bounds(end="2024-12-24") == (None, "2024-12-24")
+
+
+def test_ranges_starting_after_today_are_rejected(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(dates, "date", FixedDate)
+    for value in ("2025-02", "2025-W04", "2025-Q2", "2026-01", "since:2025-01-16"):
+        with pytest.raises(typer.BadParameter, match="starts after today"):
+            dates.resolve_range(value)
+    assert dates.resolve_date("since:2025-01-15") == ("2025-01-15", "2025-01-15")
+
+
+def test_parse_intervals() -> None:
+    names = ["sleep", "stats"]
+    assert dates.parse_intervals(["sleep=60", "stats=1.5"], names) == {
+        "sleep": 60.0,
+        "stats": 1.5,
+    }
+    for value in ("hrv=60", "sleep=0", "sleep=soon"):
+        with pytest.raises(typer.BadParameter):
+            dates.parse_intervals([value], names)
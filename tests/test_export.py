@@ -0,0 +1,210 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from typer.testing import CliRunner
+
+from garmincli.cli import app
+from garmincli.commands import export
+from garmincli.errors import GarminCliError
+
+runner = CliRunner()
+
+
+class _Garth:
+    profile = {"profileId": 42}
+
+
+class _Client:
+    garth = _Garth()
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.fail_sleep_on: set[str] = set()
+
+    def _log(self, name: str, *args: Any) -> None:
+        self.calls.append(":".join([name, *map(str, args)]))
+
+    def get_user_summary(self, cdate: str) -> dict[str, Any]:
+        self._log("summary", cdate)
+        return {"calendarDate": cdate, "totalSteps": 1000}
+
+    def get_sleep_data(self, cdate: str) -> dict[str, Any]:
+        self._log("sleep", cdate)
+        if cdate in self.fail_sleep_on:
+            raise GarminCliError("boom")
+        return {"dailySleepDTO": {"calendarDate": cdate}}
+
+    def get_stress_data(self, cdate: str) -> dict[str, Any]:
+        self._log("stress", cdate)
+        return {"calendarDate": cdate}
+
+    def get_hrv_data(self, cdate: str) -> dict[str, Any]:
+        self._log("hrv", cdate)
+        return {"hrvSummary": {"calendarDate": cdate}}
+
+    def get_body_composition(self, start: str, end: str) -> dict[str, Any]:
+        self._log("body", start, end)
+        return {"dateWeightList": []}
+
+    def get_activities_by_date(self, start: str, end: str) -> list[dict[str, Any]]:
+        self._log("activities", start, end)
+        if start.startswith("2024-01"):
+            return [{"activityId": 7, "startTimeLocal": "2024-01-02 07:00:00"}]
+        return []
+
+    def get_activity(self, activity_id: int) -> dict[str, Any]:
+        self._log("activity", activity_id)
+        return {"activityId": activity_id}
+
+    def get_activity_details(self, activity_id: int) -> dict[str, Any]:
+        self._log("details", activity_id)
+        return {"metrics": []}
+
+    def download_activity(self, activity_id: int, dl_fmt: Any) -> bytes:
+        self._log("download", activity_id)
+        return b"PK\x03\x04fit"
+
+    def get_workouts(self, start: int, limit: int) -> list[dict[str, Any]]:
+        self._log("workouts", start)
+        return [{"workoutId": i} for i in range(start, min(start + limit, 150))]
+
+    def get_gear(self, profile_id: int) -> list[dict[str, Any]]:
+        self._log("gear", profile_id)
+        return []
+
+    def get_goals(self, status: str, start: int, limit: int) -> list[dict[str, Any]]:
+        self._log("goals", status)
+        return []
+
+    def get_earned_badges(self) -> list[dict[str, Any]]:
+        self._log("badges")
+        return []
+
+    def get_devices(self) -> list[dict[str, Any]]:
+        self._log("devices")
+        return []
+
+
+def _export(monkeypatch, client: _Client, *args: str):
+    monkeypatch.setattr(export, "load_client", lambda tokenstore=None: client)
+    monkeypatch.setattr(export, "EXPORT_RATE_LIMIT", None)
+    return runner.invoke(app, ["export", *args, "--format", "json"])
+
+
+def test_export_layout_and_manifest(monkeypatch, tmp_path: Path) -> None:
+    client = _Client()
+    result = _export(
+        monkeypatch,
+        client,
+        str(tmp_path),
+        "--start",
+        "2024-01-31",
+        "--end",
+        "2024-02-01",
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["failed"] == 0
+    assert (tmp_path / "daily/sleep/2024/2024-01-31.json").exists()
+    assert (tmp_path / "activities/2024/2024-02.json").exists()
+    assert (
+        tmp_path / "activities/2024/01/7/original.zip"
+    ).read_bytes() == b"PK\x03\x04fit"
+    assert len(json.loads((tmp_path / "account/workouts.json").read_text())) == 150
+    assert "activities:2024-01-31:2024-01-31" in client.calls
+
+    manifest = json.loads((tmp_path / export.MANIFEST_FILE).read_text())
+    assert manifest["start"] == "2024-01-31"
+    assert manifest["units"]["activity/7/details"]["path"] == (
+        "activities/2024/01/7/details.json"
+    )
+    assert not (tmp_path / export.JOURNAL_FILE).exists()
+
+    result = runner.invoke(app, ["export", str(tmp_path), "--verify"])
+    assert result.exit_code == 0, result.output
+
+
+def test_rerun_only_fetches_failed_and_refreshing_units(
+    monkeypatch, tmp_path: Path
+) -> None:
+    client = _Client()
+    client.fail_sleep_on = {"2024-01-01"}
+    args = [str(tmp_path), "--start", "2024-01-01", "--end", "2024-01-02"]
+
+    result = _export(monkeypatch, client, *args)
+    assert result.exit_code == 1
+    assert "daily/sleep/2024-01-01" in result.output
+
+    client = _Client()
+    result = _export(monkeypatch, client, *args)
+
+    assert result.exit_code == 0, result.output
+    fetched = {call.split(":")[0] for call in client.calls}
+    assert "sleep:2024-01-01" in client.calls
+    assert "summary" not in fetched and "activity" not in fetched
+    assert "devices" in fetched  # account-wide data is always refreshed
+
+
+def test_write_errors_fail_only_their_unit(monkeypatch, tmp_path: Path) -> None:
+    write = export.atomic_write
+
+    def full_disk(path: Path, data: bytes) -> None:
+        if "sleep" in Path(path).parts:
+            raise OSError(28, "No space left on device", str(path))
+        write(path, data)
+
+    monkeypatch.setattr(export, "atomic_write", full_disk)
+    args = [str(tmp_path), "--start", "2024-01-01", "--end", "2024-01-01"]
+
+    result = _export(monkeypatch, _Client(), *args)
+
+    assert result.exit_code == 1
+    assert "No space left on device" in result.output
+    manifest = json.loads((tmp_path / export.MANIFEST_FILE).read_text())
+    assert list(manifest["failed"]) == ["daily/sleep/2024-01-01"]
+    assert "daily/summary/2024-01-01" in manifest["units"]
+    assert "activity/7/details" in manifest["units"]
+
+
+def test_resumes_from_checkpoint_journal(tmp_path: Path) -> None:
+    unit = export.Unit("badges", "account/badges.json", lambda c: [])
+    manifest = export.Manifest(tmp_path)
+    manifest.record(unit, b"[]")
+    # Simulate a crash mid-write of the next journal line.
+    with open(tmp_path / export.JOURNAL_FILE, "a") as f:
+        f.write('{"id": "dev')
+
+    resumed = export.Manifest(tmp_path)
+
+    assert resumed.done("badges")
+    assert not resumed.done("dev")
+
+
+def test_verify_detects_tampered_file(monkeypatch, tmp_path: Path) -> None:
+    client = _Client()
+    _export(
+        monkeypatch,
+        client,
+        str(tmp_path),
+        "--start",
+        "2024-03-01",
+        "--end",
+        "2024-03-01",
+    )
+    (tmp_path / "daily/hrv/2024/2024-03-01.json").write_text("{}")
+
+    result = runner.invoke(app, ["export", str(tmp_path), "--verify", "-f", "json"])
+
+    assert result.exit_code == 1
+    assert json.loads(result.output) == [
+        {"unit": "daily/hrv/2024-03-01", "problem": "checksum mismatch"}
+    ]
+
+
+def test_recent_days_are_marked_for_refresh() -> None:
+    today = date(2024, 5, 10)
+    units = export.plan_units(date(2024, 5, 8), today, today)
+    refresh = {u.id for u in units if u.refresh and u.id.startswith("daily/summary")}
+    assert refresh == {"daily/summary/2024-05-09", "daily/summary/2024-05-10"}
@@ -0,0 +1,109 @@
+from pathlib import Path
+from typing import Any
+
+from typer.testing import CliRunner
+
+from garmincli.cli import app
+from garmincli.commands import exporter
+from garmincli.errors import RateLimitError
+
+runner = CliRunner()
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def get_user_summary(self, cdate: str) -> dict[str, Any]:
+        self.calls.append("user_summary")
+        return {
+            "restingHeartRate": 52,
+            "bodyBatteryMostRecentValue": 71,
+            "averageStressLevel": 31,
+            "maxStressLevel": 94,
+            "totalSteps": 11234,
+            "dailyStepGoal": 10000,
+        }
+
+    def get_sleep_data(self, cdate: str) -> dict[str, Any]:
+        self.calls.append("sleep")
+        return {"dailySleepDTO": {"sleepScores": {"overall": {"value": 82}}}}
+
+    def get_hrv_data(self, cdate: str) -> dict[str, Any]:
+        self.calls.append("hrv")
+        return {"hrvSummary": {"lastNightAvg": 61, "weeklyAvg": 58}}
+
+    def get_training_readiness(self, cdate: str) -> list[dict[str, Any]]:
+        self.calls.append("training_readiness")
+        return [{"score": 40}, {"score": 77}]
+
+    def get_max_metrics(self, cdate: str) -> list[dict[str, Any]]:
+        self.calls.append("max_metrics")
+        return [{"generic": {"vo2MaxPreciseValue": 52.3}, "cycling": None}]
+
+    def get_devices(self) -> list[dict[str, Any]]:
+        self.calls.append("devices")
+        raise RateLimitError("slow down")
+
+
+def test_render_metrics_from_cache() -> None:
+    cache = exporter.MetricsCache(exporter.SOURCES)
+    cache.refresh_due(_Client(), now=0.0)
+
+    text = exporter.render_metrics(cache.snapshot())
+
+    assert "# TYPE garmin_resting_heart_rate_bpm gauge" in text
+    assert "garmin_resting_heart_rate_bpm 52.0\n" in text
+    assert 'garmin_stress_level{stat="max"} 94.0\n' in text
+    assert "garmin_sleep_score 82.0\n" in text
+    assert 'garmin_hrv_ms{stat="last_night"} 61.0\n' in text
+    assert "garmin_training_readiness_score 77.0\n" in text
+    assert 'garmin_vo2max{sport="running"} 52.3\n' in text
+    assert 'sport="cycling"' not in text
+    assert "garmin_device_battery_percent" not in text
+    assert 'garmin_exporter_refresh_errors_total{source="devices"} 1.0\n' in text
+    assert text.endswith("\n")
+
+
+def test_sources_refresh_on_their_own_schedule() -> None:
+    client = _Client()
+    sources = [
+        exporter.Source("user_summary", exporter.SOURCES[0].fetch, 300),
+        exporter.Source("sleep", exporter.SOURCES[1].fetch, 1800),
+    ]
+    cache = exporter.MetricsCache(sources)
+
+    cache.refresh_due(client, now=0.0)
+    cache.refresh_due(client, now=100.0)  # nothing due
+    cache.refresh_due(client, now=300.0)
+    for _ in range(3):
+        exporter.render_metrics(cache.snapshot())  # scrapes never fetch
+
+    assert client.calls == ["user_summary", "sleep", "user_summary"]
+    assert cache.next_due() == 600.0
+
+
+def test_label_values_are_escaped() -> None:
+    line = exporter._line("garmin_x", {"device": 'Edge "530"\n'}, 1)
+    assert line == 'garmin_x{device="Edge \\"530\\"\\n"} 1.0'
+
+
+def test_exporter_once_writes_textfile(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(exporter, "load_client", lambda tokenstore=None: _Client())
+    target = tmp_path / "garmin.prom"
+
+    result = runner.invoke(
+        app,
+        ["exporter", "--once", "--textfile", str(target), "--interval", "sleep=60"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "garmin_steps 11234.0" in target.read_text()
+
+
+def test_exporter_rejects_unknown_interval_source(tmp_path: Path) -> None:
+    result = runner.invoke(
+        app,
+        ["exporter", "--once", "--textfile", str(tmp_path / "x"), "--interval", "x=1"],
+    )
+    assert result.exit_code == 2
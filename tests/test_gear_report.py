@@ -0,0 +1,133 @@
+from typing import Any
+
+from typer.testing import CliRunner
+
+from garmincli.cli import app
+from garmincli.commands import gear
+from garmincli.store import Store
+
+
+runner = CliRunner()
+
+SHOE = {"uuid": "shoe-1", "displayName": "Pegasus", "maximumMeters": 800000.0}
+BIKE = {"uuid": "bike-1", "displayName": "Tarmac", "maximumMeters": 0.0}
+
+
+def _activity(activity_id: int, start: str, distance: float) -> dict[str, Any]:
+    return {
+        "activityId": activity_id,
+        "activityName": f"Activity {activity_id}",
+        "activityType": {"typeKey": "running"},
+        "startTimeLocal": start,
+        "distance": distance,
+        "duration": 3600.0,
+    }
+
+
+class _GearClient:
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    def get_activity_gear(self, activity_id: int) -> list[dict[str, Any]]:
+        self.calls.append(activity_id)
+        return {1: [SHOE], 2: [SHOE], 3: [BIKE], 4: []}[activity_id]
+
+
+def _seed(path: str) -> None:
+    with Store(path) as db:
+        db.upsert_activities(
+            [
+                _activity(1, "2025-01-05 07:00:00", 10000.0),
+                _activity(2, "2025-02-03 07:00:00", 795000.0),
+                _activity(3, "2025-02-04 07:00:00", 40000.0),
+                _activity(4, "2025-02-05 07:00:00", 5000.0),
+            ]
+        )
+
+
+def test_gear_report_fetches_missing_links_once(monkeypatch, tmp_path) -> None:
+    store_path = str(tmp_path / "store.db")
+    _seed(store_path)
+    client = _GearClient()
+    monkeypatch.setattr(gear, "load_client", lambda tokenstore=None: client)
+
+    captured: dict[str, Any] = {}
+    monkeypatch.setattr(
+        gear,
+        "render",
+        lambda data, fmt, title, output: captured.update({"data": data}),  # noqa: ARG005
+    )
+
+    result = runner.invoke(app, ["gear", "report", "--store", store_path])
+    assert result.exit_code == 0
+    assert sorted(client.calls) == [1, 2, 3, 4]
+
+    shoe, bike = captured["data"]
+    assert shoe["gear"] == "Pegasus"
+    assert shoe["activities"] == 2
+    assert shoe["distance_km"] == 805.0
+    assert shoe["limit_km"] == 800.0
+    assert shoe["retire"] is True
+    assert bike["limit_km"] is None
+    assert bike["retire"] is False
+
+    # Second run is served entirely from the store.
+    monkeypatch.setattr(gear, "load_client", lambda tokenstore=None: None)
+    result = runner.invoke(
+        app, ["gear", "report", "--store", store_path, "--threshold", "1000"]
+    )
+    assert result.exit_code == 0
+    assert captured["data"][0]["retire"] is False
+    assert captured["data"][0]["remaining_km"] == 195.0
+
+
+def test_gear_report_groups_by_period(monkeypatch, tmp_path) -> None:
+    store_path = str(tmp_path / "store.db")
+    _seed(store_path)
+    monkeypatch.setattr(gear, "load_client", lambda tokenstore=None: _GearClient())
+
+    captured: dict[str, Any] = {}
+    monkeypatch.setattr(
+        gear,
+        "render",
+        lambda data, fmt, title, output: captured.update({"data": data}),  # noqa: ARG005
+    )
+
+    result = runner.invoke(
+        app, ["gear", "report", "--store", store_path, "--period", "month"]
+    )
+    assert result.exit_code == 0
+    rows = [(r["gear"], r["period"], r["activities"]) for r in captured["data"]]
+    assert rows == [
+        ("Pegasus", "2025-01", 1),
+        ("Pegasus", "2025-02", 1),
+        ("Tarmac", "2025-02", 1),
+    ]
+
+
+def test_gear_report_resolves_dates_and_zero_threshold(monkeypatch, tmp_path) -> None:
+    store_path = str(tmp_path / "store.db")
+    _seed(store_path)
+    monkeypatch.setattr(gear, "load_client", lambda tokenstore=None: _GearClient())
+    captured: dict[str, Any] = {}
+    monkeypatch.setattr(
+        gear,
+        "render",
+        lambda data, fmt, title, output: captured.update({"data": data}),  # noqa: ARG005
+    )
+
+    args = ["--start", "2025-02", "--end", "2025-02", "--threshold", "0"]
+    result = runner.invoke(app, ["gear", "report", "--store", store_path, *args])
+    assert result.exit_code == 0, result.output
+    shoe, bike = captured["data"]
+    assert (shoe["activities"], shoe["distance_km"]) == (1, 795.0)
+    assert shoe["limit_km"] == bike["limit_km"] == 0
+    assert shoe["retire"] is bike["retire"] is True
+    assert bike["remaining_km"] == -40.0
+
+
+def test_gear_report_requires_synced_store(tmp_path) -> None:
+    result = runner.invoke(
+        app, ["gear", "report", "--store", str(tmp_path / "empty.db")]
+    )
+    assert result.exit_code == 1
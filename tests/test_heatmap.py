@@ -0,0 +1,130 @@
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from garmincli import heatmap
+from garmincli.cli import app
+from garmincli.store import Store
+
+np = pytest.importorskip("numpy")
+
+runner = CliRunner()
+
+# Three tracks in Berlin: two along the same street, one a few km away.
+STREET = [[52.5200, 13.3700], [52.5200, 13.4100]]
+ELSEWHERE = [[52.4500, 13.5000], [52.4600, 13.5100]]
+
+
+def _track(activity_id: int, points: list) -> dict:
+    return {
+        "activity_id": activity_id,
+        "source": f"{activity_id}.gpx",
+        "mtime": 0.0,
+        "size": 0,
+        "points": points,
+    }
+
+
+def _png_pixels(data: bytes) -> "np.ndarray":
+    width, height = struct.unpack(">II", data[16:24])
+    idat = data[data.index(b"IDAT") + 4 : data.index(b"IEND") - 8]
+    raw = np.frombuffer(zlib.decompress(idat), dtype=np.uint8)
+    return raw.reshape(height, width * 4 + 1)[:, 1:].reshape(height, width, 4)
+
+
+def _heatmap(store: str, *args: str) -> str:
+    result = runner.invoke(
+        app, ["activities", "heatmap", *args, "--store", store, "-w", "1"]
+    )
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_track_pixels_are_contiguous() -> None:
+    pixels = heatmap.track_pixels(np, STREET, 16)
+    world = heatmap.TILE_SIZE * 2**16
+    ys, xs = np.divmod(pixels, world)
+    assert len(set(ys.tolist())) == 1
+    assert np.all(np.diff(np.sort(xs)) == 1)
+
+
+def test_tiles_redraw_only_what_changed(tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    tiles = tmp_path / "tiles"
+    with Store(store) as db:
+        db.upsert_tracks([_track(1, STREET), _track(2, STREET)])
+
+    assert "from 2 new track(s)" in _heatmap(store, str(tiles), "-z", "12")
+    pngs = sorted(tiles.rglob("*.png"))
+    assert pngs and all(p.parts[-3] == "12" for p in pngs)
+    street = _png_pixels(pngs[0].read_bytes())
+    assert street[..., 3].any()
+
+    assert "Rendered 0 of" in _heatmap(store, str(tiles), "-z", "12")
+
+    with Store(store) as db:
+        db.upsert_tracks([_track(3, ELSEWHERE)])
+    output = _heatmap(store, str(tiles), "-z", "12")
+    assert "Rendered 1 of" in output and "from 1 new track(s)" in output
+    assert _png_pixels(pngs[0].read_bytes()).tobytes() == street.tobytes()
+
+    # A removed tile file is drawn again.
+    pngs[0].unlink()
+    assert "Rendered 1 of" in _heatmap(store, str(tiles), "-z", "12")
+    assert pngs[0].exists()
+
+
+def test_each_directory_and_style_keeps_its_own_state(tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    first, second = tmp_path / "a", tmp_path / "b"
+    with Store(store) as db:
+        db.upsert_tracks([_track(1, STREET)])
+    _heatmap(store, str(first), "-z", "12")
+
+    with Store(store) as db:
+        db.upsert_tracks([_track(2, ELSEWHERE)])
+    assert "Rendered 2 of 2" in _heatmap(store, str(second), "-z", "12")
+    # Drawing the second directory does not hide the change from the first.
+    assert "Rendered 1 of 2" in _heatmap(store, str(first), "-z", "12")
+    assert "Rendered 0 of 2" in _heatmap(store, str(first), "-z", "12")
+
+    tile = sorted(first.rglob("*.png"))[0]
+    before = _png_pixels(tile.read_bytes())
+    assert "Rendered 2 of 2" in _heatmap(
+        store, str(first), "-z", "12", "--saturation", "1"
+    )
+    assert _png_pixels(tile.read_bytes()).tobytes() != before.tobytes()
+    assert "Rendered 0 of 2" in _heatmap(
+        store, str(first), "-z", "12", "--saturation", "1"
+    )
+
+
+def test_single_image(tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    with Store(store) as db:
+        db.upsert_tracks([_track(1, STREET), _track(2, ELSEWHERE)])
+    target = tmp_path / "berlin.png"
+
+    _heatmap(store, str(target), "-z", "13")
+
+    pixels = _png_pixels(target.read_bytes())
+    assert pixels.shape[0] < pixels.shape[1] < heatmap.MAX_IMAGE_SIDE
+    assert pixels[..., 3].any()
+
+
+def test_heatmap_needs_tracks(tmp_path) -> None:
+    result = runner.invoke(
+        app,
+        [
+            "activities",
+            "heatmap",
+            str(tmp_path / "t"),
+            "--store",
+            str(Path(tmp_path, "s.db")),
+        ],
+    )
+    assert result.exit_code == 1
+    assert "index-tracks" in result.output
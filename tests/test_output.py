@@ -0,0 +1,129 @@
+import gzip
+import json
+import lzma
+from datetime import date, datetime, timezone
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from garmincli import output
+from garmincli.cli import app
+from garmincli.commands import health
+
+runner = CliRunner()
+
+PAYLOAD = {"name": "[bold]Ride[/bold] über", "laps": [1, 2.5, None], "ok": True}
+
+
+class _Client:
+    def get_user_summary(self, cdate: str) -> dict[str, Any]:
+        return PAYLOAD
+
+
+MIXED = {
+    **PAYLOAD,
+    "start": datetime(2024, 3, 1, 7, 30, tzinfo=timezone.utc),
+    "naive": datetime(2024, 3, 1, 7, 30, 5, 250000),
+    "day": date(2024, 3, 1),
+    "splits": [{"pace": float("nan")}, {"pace": float("inf")}, (1, -float("inf"))],
+    "empty": {"list": [], "dict": {}},
+    1: "int key",
+}
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("payload", [PAYLOAD, MIXED])
+def test_backends_produce_the_same_json(compact: bool, payload: Any) -> None:
+    if output.orjson is None:
+        pytest.skip("orjson not installed")
+    fast = output._orjson_dumps(payload, compact)
+    assert fast == output._stdlib_dumps(payload, compact)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("rows", [[], [PAYLOAD], [PAYLOAD, {"n": 1}]])
+def test_iterators_stream_the_same_json(compact: bool, rows: list) -> None:
+    output.set_compact_json(compact)
+    try:
+        with output.capture_output() as (out, _):
+            output.print_json(iter(rows))
+    finally:
+        output.set_compact_json(False)
+    assert out.getvalue().encode() == output.dumps_json(rows, compact) + b"\n"
+
+
+def test_large_non_ascii_output_is_not_split_mid_character(tmp_path) -> None:
+    data = {"note": "é" * output.WRITE_CHUNK}
+    with output.capture_output() as (out, _):
+        output.print_json(data)
+    assert json.loads(out.getvalue()) == data
+
+    target = tmp_path / "note.json"
+    output.print_json(data, output=str(target))
+    assert json.loads(target.read_text(encoding="utf-8")) == data
+
+
+def test_huge_ints_fall_back_to_stdlib() -> None:
+    data = {"big": 2**70}
+    assert json.loads(output.dumps_json(data, True)) == data
+
+
+def test_json_bypasses_rich_markup(monkeypatch) -> None:
+    monkeypatch.setattr(health, "load_client", lambda tokenstore=None: _Client())
+
+    result = runner.invoke(app, ["health", "2024-01-01", "-f", "json"])
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == PAYLOAD
+    assert '\n  "name": "[bold]Ride[/bold] über",\n' in result.output
+
+
+def test_compact_option(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(health, "load_client", lambda tokenstore=None: _Client())
+    target = tmp_path / "out.json"
+
+    result = runner.invoke(
+        app, ["--compact", "health", "2024-01-01", "-f", "json", "-o", str(target)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert target.read_text(encoding="utf-8") == (
+        '{"name":"[bold]Ride[/bold] über","laps":[1,2.5,null],"ok":true}\n'
+    )
+
+
+@pytest.mark.parametrize("suffix,opener", [(".gz", gzip.open), (".xz", lzma.open)])
+def test_compressed_output(monkeypatch, tmp_path, suffix, opener) -> None:
+    monkeypatch.setattr(health, "load_client", lambda tokenstore=None: _Client())
+    target = tmp_path / f"out.csv{suffix}"
+
+    result = runner.invoke(app, ["health", "-f", "csv", "-o", str(target)])
+
+    assert result.exit_code == 0, result.output
+    with opener(target, "rt", encoding="utf-8") as f:
+        assert f.readline() == "name,laps,ok\n"
+    assert [p.name for p in tmp_path.iterdir()] == [target.name]
+
+
+def test_failed_write_keeps_previous_file(tmp_path) -> None:
+    target = tmp_path / "out.json.gz"
+    target.write_bytes(b"previous")
+
+    with pytest.raises(RuntimeError):
+        with output.open_output(target) as f:
+            f.write(b"partial")
+            raise RuntimeError("interrupted")
+
+    assert target.read_bytes() == b"previous"
+    assert [p.name for p in tmp_path.iterdir()] == [target.name]
+
+
+def test_unwritable_output_is_reported(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(health, "load_client", lambda tokenstore=None: _Client())
+    target = tmp_path / "missing" / "out.json"
+
+    result = runner.invoke(app, ["health", "-f", "json", "-o", str(target)])
+
+    assert result.exit_code == 1
+    assert "Cannot write" in result.output
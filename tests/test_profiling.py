@@ -0,0 +1,91 @@
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from garmincli import api, profiling
+from garmincli.cache import ResponseCache
+from garmincli.cli import app
+from garmincli.commands import health
+from garmincli.errors import GarminCliError
+
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def _reset_profiler():
+    yield
+    profiling.disable_profiling()
+    api.set_cache(None)
+
+
+class _Client:
+    def get_user_summary(self, cdate: str) -> dict[str, Any]:
+        return {"calendarDate": cdate}
+
+    def get_broken(self) -> None:
+        raise RuntimeError("boom")
+
+
+def test_profiler_aggregates_api_calls_and_cache_results() -> None:
+    profiler = profiling.enable_profiling()
+    api.set_cache(ResponseCache())
+    client = _Client()
+
+    api.api_call(client.get_user_summary, "2025-01-01")
+    api.api_call(client.get_user_summary, "2025-01-01")
+    with pytest.raises(GarminCliError):
+        api.api_call(client.get_broken)
+
+    report = profiler.report()
+    stats = {e["endpoint"]: e for e in report["endpoints"]}
+    assert stats["get_user_summary"]["calls"] == 2
+    assert stats["get_user_summary"]["cache_hits"] == 1
+    assert stats["get_user_summary"]["cache_misses"] == 1
+    assert stats["get_broken"]["errors"] == 1
+    assert report["phases"]["api"]["count"] == 3
+    assert report["spans"][0]["args"] == "'2025-01-01'"
+
+
+def test_profiler_attributes_http_responses_to_active_span() -> None:
+    profiler = profiling.enable_profiling()
+    response = SimpleNamespace(
+        elapsed=timedelta(milliseconds=25),
+        content=b"{}" * 10,
+        status_code=200,
+        raw=SimpleNamespace(retries=SimpleNamespace(history=("retry",))),
+    )
+    with profiler.span("api", "get_x") as span:
+        profiler.on_response(response)
+    profiler.on_response(response)  # outside any span: ignored
+
+    assert span["http_requests"] == 1
+    assert span["bytes"] == 20
+    assert span["retries"] == 1
+    assert span["http_ms"] == pytest.approx(25.0)
+
+
+def test_profile_flag_writes_json_report(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(health, "load_client", lambda tokenstore=None: _Client())
+    report_path = tmp_path / "profile.json"
+
+    result = runner.invoke(
+        app,
+        [
+            "--profile-output",
+            str(report_path),
+            "health",
+            "2025-01-02",
+            "--format",
+            "json",
+        ],
+    )
+
+    assert result.exit_code == 0
+    report = json.loads(report_path.read_text())
+    assert report["endpoints"][0]["endpoint"] == "get_user_summary"
+    assert report["phases"]["render"]["count"] == 1
@@ -0,0 +1,113 @@
+import json
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from garmincli.cli import app
+from garmincli.commands import activities
+from garmincli.errors import GarminCliError
+from garmincli.projection import Projection, compile_path, compile_where
+
+runner = CliRunner()
+
+ACTIVITIES = [
+    {
+        "activityId": 1,
+        "activityName": "Morning Run",
+        "distance": 5200.0,
+        "activityType": {"typeKey": "running"},
+    },
+    {
+        "activityId": 2,
+        "activityName": "Commute",
+        "distance": 9000.0,
+        "activityType": {"typeKey": "cycling"},
+    },
+    {"activityId": 3, "activityName": "Walk", "activityType": {"typeKey": "walking"}},
+]
+
+
+class _Client:
+    def get_activities(
+        self, start: int, limit: int, activity_type: Any = None
+    ) -> list[dict[str, Any]]:
+        return ACTIVITIES[start : start + limit]
+
+
+def test_compile_path() -> None:
+    get = compile_path("activityType.typeKey")
+    assert get(ACTIVITIES[0]) == "running"
+    assert get({"activityType": None}) is None
+    assert compile_path("laps.1.n")({"laps": [{"n": 1}, {"n": 2}]}) == 2
+
+
+def test_where_operators() -> None:
+    long_runs = compile_where("distance >= 5000 and activityType.typeKey ~ RUN")
+    assert [a["activityId"] for a in ACTIVITIES if long_runs(a)] == [1]
+
+    either = compile_where("activityName == 'Walk' or distance > 8000")
+    assert [a["activityId"] for a in ACTIVITIES if either(a)] == [2, 3]
+
+    assert compile_where("distance < 6000")(ACTIVITIES[2]) is False
+
+
+@pytest.mark.parametrize("expression", ["distance >", "distance 5", "a => 1", ""])
+def test_invalid_where(expression: str) -> None:
+    with pytest.raises(GarminCliError):
+        compile_where(expression)
+
+
+def test_projection_filters_then_projects() -> None:
+    projection = Projection(["activityId,activityType.typeKey"], ["distance > 0"])
+    assert projection.apply(ACTIVITIES) == [
+        {"activityId": 1, "activityType.typeKey": "running"},
+        {"activityId": 2, "activityType.typeKey": "cycling"},
+    ]
+    assert Projection(["activityId,activityType.typeKey"]).apply(ACTIVITIES[0]) == {
+        "activityId": 1,
+        "activityType.typeKey": "running",
+    }
+    with pytest.raises(GarminCliError, match="single object"):
+        projection.apply(ACTIVITIES[0])
+
+
+def test_projection_unwraps_wrapped_records() -> None:
+    payload = {
+        "dailyWeightSummaries": [
+            {"summaryDate": "2024-01-01", "weight": 80000},
+            {"summaryDate": "2024-01-02", "weight": 79000},
+        ],
+        "totalAverage": {"weight": 79500},
+    }
+    projection = Projection(["summaryDate"], ["weight < 80000"])
+    assert projection.apply(payload) == [{"summaryDate": "2024-01-02"}]
+
+
+def test_fields_and_where_options(monkeypatch) -> None:
+    monkeypatch.setattr(activities, "load_client", lambda tokenstore=None: _Client())
+
+    result = runner.invoke(
+        app,
+        [
+            "--fields",
+            "activityName",
+            "--where",
+            "activityType.typeKey != walking",
+            "activities",
+            "-f",
+            "json",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == [
+        {"activityName": "Morning Run"},
+        {"activityName": "Commute"},
+    ]
+
+
+def test_bad_where_option_fails() -> None:
+    result = runner.invoke(app, ["--where", "distance >", "status"])
+    assert result.exit_code == 1
+    assert "--where" in result.output
@@ -0,0 +1,141 @@
+import json
+from datetime import date, timedelta
+from typing import Any, Iterator
+
+from typer.testing import CliRunner
+
+from garmincli.cli import app
+from garmincli.commands import query, sync
+from garmincli.store import Store
+
+runner = CliRunner()
+
+TODAY = date.today()
+
+
+def _day(offset: int) -> str:
+    return (TODAY - timedelta(days=offset)).isoformat()
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.days: list[str] = []
+
+    def get_activities(self, start: int, limit: int) -> list[dict[str, Any]]:
+        return [
+            {
+                "activityId": 1,
+                "activityType": {"typeKey": "running"},
+                "startTimeLocal": f"{_day(3)} 07:00:00",
+                "distance": 21000.0,
+                "averageHR": 151,
+            },
+            {
+                "activityId": 2,
+                "activityType": {"typeKey": "running"},
+                "startTimeLocal": f"{_day(2)} 07:00:00",
+                "distance": 5000.0,
+            },
+        ][start:]
+
+    def get_user_summary(self, cdate: str) -> dict[str, Any]:
+        self.days.append(cdate)
+        resting = 60 if cdate == _day(2) else 50
+        return {"calendarDate": cdate, "restingHeartRate": resting}
+
+    def get_sleep_data(self, cdate: str) -> dict[str, Any]:
+        return {"dailySleepDTO": {"sleepTimeSeconds": 27000}}
+
+    def get_stress_data(self, cdate: str) -> dict[str, Any]:
+        return {"avgStressLevel": 30}
+
+    def get_hrv_data(self, cdate: str) -> Any:
+        return None  # no HRV without a compatible watch
+
+    def get_weigh_ins(self, start: str, end: str) -> dict[str, Any]:
+        sample = {"samplePk": 9, "calendarDate": end, "weight": 70500.0}
+        return {"dailyWeightSummaries": [{"allWeightMetrics": [sample]}]}
+
+
+def test_sync_daily_then_query(monkeypatch, tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    client = _Client()
+    monkeypatch.setattr(sync, "load_client", lambda tokenstore=None: client)
+
+    result = runner.invoke(
+        app, ["sync", "--daily", "--since", _day(4), "--store", store]
+    )
+    assert result.exit_code == 0, result.output
+
+    # "Average resting HR on days after long runs"
+    sql = """
+        SELECT avg(d.resting_hr) AS resting_hr, count(*) AS days
+        FROM activities a
+        JOIN daily_summary d ON d.calendar_date = date(a.date, '+1 day')
+        WHERE a.activity_type = 'running' AND a.distance > 15000
+    """
+    result = runner.invoke(app, ["query", sql, "--store", store, "-f", "json"])
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == [{"resting_hr": 60.0, "days": 1}]
+
+    result = runner.invoke(
+        app,
+        [
+            "query",
+            "SELECT weight_kg FROM weigh_ins UNION ALL SELECT count(*) FROM hrv",
+            "--store",
+            store,
+            "-f",
+            "csv",
+        ],
+    )
+    assert result.output == "weight_kg\n70.5\n0\n"
+
+
+def test_daily_sync_resumes_from_last_day(monkeypatch, tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    with Store(store) as db:
+        db.upsert_daily("summary", [(_day(1), {"restingHeartRate": 50})])
+        client = _Client()
+        sync.sync_daily(client, db)
+
+    assert sorted(client.days) == [_day(1), _day(0)]
+
+
+def test_query_is_read_only(tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    Store(store).close()
+
+    result = runner.invoke(
+        app, ["query", "DELETE FROM main.activities", "--store", store]
+    )
+
+    assert result.exit_code == 1
+    assert "readonly" in result.output
+
+
+def test_query_without_store(tmp_path) -> None:
+    result = runner.invoke(
+        app, ["query", "SELECT 1", "--store", str(tmp_path / "none.db")]
+    )
+    assert result.exit_code == 1
+    assert "gc sync" in result.output
+    assert not (tmp_path / "none.db").exists()
+
+
+def test_query_streams_rows(monkeypatch, tmp_path) -> None:
+    store = str(tmp_path / "store.db")
+    Store(store).close()
+    rendered: dict[str, Any] = {}
+
+    def _render(data: Any, **kwargs: Any) -> None:
+        rendered["lazy"] = isinstance(data, Iterator)
+        rendered["rows"] = list(data)
+
+    monkeypatch.setattr(query, "render", _render)
+    sql = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n LIMIT 3)"
+    result = runner.invoke(app, ["query", f"{sql} SELECT i FROM n", "--store", store])
+
+    assert result.exit_code == 0, result.output
+    assert rendered == {"lazy": True, "rows": [{"i": 1}, {"i": 2}, {"i": 3}]}
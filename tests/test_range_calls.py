@@ -0,0 +1,88 @@
+from functools import partial
+from typing import Any
+
+from garmincli import api
+
+
+class _RangeClient:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str]] = []
+
+    def get_weigh_ins(self, start: str, end: str) -> dict[str, Any]:
+        self.calls.append((start, end))
+        # Newest first, like Garmin; the boundary day shows up in both chunks.
+        days = [
+            d for d in ("2025-01-01", "2025-03-31", "2025-04-01") if start <= d <= end
+        ]
+        if end >= "2025-03-31":
+            days.append("2025-03-31")
+        summaries = [
+            {"summaryDate": d, "weight": 70000.0 if d < "2025-04" else 72000.0}
+            for d in sorted(set(days), reverse=True)
+        ]
+        return {
+            "dailyWeightSummaries": summaries,
+            "totalAverage": {"from": start, "weight": 0.0},
+            "previousDateWeight": {"date": start},
+            "nextDateWeight": {"date": end},
+        }
+
+    def get_activities_by_date(
+        self, start: str, end: str, activity_type: str | None
+    ) -> list[dict[str, Any]]:
+        self.calls.append((start, end))
+        return [{"activityId": int(end.replace("-", ""))}]
+
+    def get_device_solar_data(
+        self, device_id: str, start: str, end: str | None
+    ) -> dict[str, Any]:
+        self.calls.append((start, end))
+        return {"deviceId": device_id, "solarDailyDataDTOs": []}
+
+
+def test_api_range_call_short_range_is_single_call() -> None:
+    client = _RangeClient()
+    data = api.api_range_call(client.get_weigh_ins, "2025-01-01", "2025-01-31")
+    assert client.calls == [("2025-01-01", "2025-01-31")]
+    assert data["totalAverage"]["weight"] == 0.0
+
+
+def test_api_range_call_chunks_and_merges_descending() -> None:
+    client = _RangeClient()
+    data = api.api_range_call(client.get_weigh_ins, "2025-01-01", "2025-04-10")
+
+    assert sorted(client.calls) == [
+        ("2025-01-01", "2025-03-31"),
+        ("2025-04-01", "2025-04-10"),
+    ]
+    assert [s["summaryDate"] for s in data["dailyWeightSummaries"]] == [
+        "2025-04-01",
+        "2025-03-31",
+        "2025-01-01",
+    ]
+    assert data["previousDateWeight"] == {"date": "2025-01-01"}
+    assert data["nextDateWeight"] == {"date": "2025-04-10"}
+    assert data["totalAverage"]["weight"] == (72000.0 + 70000.0 + 70000.0) / 3
+
+
+def test_api_range_call_passes_extra_args_and_partials() -> None:
+    client = _RangeClient()
+    data = api.api_range_call(
+        client.get_activities_by_date, "2025-01-01", "2025-12-31", "running"
+    )
+    assert len(client.calls) == 3
+    assert [a["activityId"] for a in data] == [20251231, 20251226, 20250629]
+
+    client = _RangeClient()
+    api.api_range_call(
+        partial(client.get_device_solar_data, "dev-1"), "2025-01-01", "2025-02-15"
+    )
+    assert len(client.calls) == 2
+
+
+def test_api_range_call_single_date_keeps_none_end() -> None:
+    client = _RangeClient()
+    api.api_range_call(
+        partial(client.get_device_solar_data, "dev-1"), "2025-01-01", None
+    )
+    assert client.calls == [("2025-01-01", None)]
@@ -0,0 +1,127 @@
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from garmincli import api, profiling, stats
+from garmincli.cli import app
+from garmincli.errors import RateLimitError
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats_log():
+    yield
+    stats._log = None
+    profiling.disable_profiling()
+
+
+class _Client:
+    def get_user_summary(self, cdate: str) -> dict[str, Any]:
+        return {"calendarDate": cdate}
+
+
+def test_api_calls_are_logged_without_profiling(monkeypatch, tmp_path: Path) -> None:
+    path = tmp_path / "stats.log"
+    monkeypatch.setenv(stats.STATS_ENV, str(path))
+    stats.enable_stats_log()
+
+    api.api_call(_Client().get_user_summary, "2025-01-01")
+
+    (record,) = [json.loads(line) for line in path.read_text().splitlines()]
+    assert record["endpoint"] == "get_user_summary"
+    assert record["ms"] >= 0
+    assert "error" not in record
+    # Spans feed the log but are not kept without --profile.
+    assert profiling.get_profiler().spans == []
+
+
+def test_stats_log_disabled_by_env(monkeypatch) -> None:
+    monkeypatch.setenv(stats.STATS_ENV, "off")
+    assert stats.enable_stats_log() is None
+    assert profiling.get_profiler() is None
+
+
+def test_stats_log_rotates(tmp_path: Path) -> None:
+    log = stats.StatsLog(tmp_path / "stats.log", max_bytes=200, backups=2)
+    for i in range(30):
+        log.write({"ts": i, "endpoint": "get_x", "ms": 1.0})
+
+    assert [p.name for p in log.files()] == ["stats.log.2", "stats.log.1", "stats.log"]
+    records = list(log.read())
+    assert [r["ts"] for r in records] == sorted(r["ts"] for r in records)
+    assert records[-1]["ts"] == 29
+    assert list(log.read(since=29)) == [records[-1]]
+
+
+def test_summarize_percentiles_and_rates() -> None:
+    records = [
+        {"endpoint": "get_a", "ms": float(ms), "status": 200} for ms in range(1, 101)
+    ]
+    records += [
+        {"endpoint": "get_b", "ms": 5.0, "status": 200},
+        {"endpoint": "get_b", "ms": 50.0, "status": 429, "error": "RateLimitError"},
+        {"endpoint": "get_b", "ms": 9.0, "status": 500, "error": "GarminCliError"},
+        {"endpoint": "get_b", "ms": 0.1, "cache": "hit"},
+    ]
+
+    rows = {row["endpoint"]: row for row in stats.summarize(records)}
+
+    assert (
+        rows["get_a"]["p50_ms"],
+        rows["get_a"]["p95_ms"],
+        rows["get_a"]["p99_ms"],
+    ) == (50.0, 95.0, 99.0)
+    assert rows["get_a"]["error_rate"] == 0
+    assert rows["get_b"]["calls"] == 4
+    assert rows["get_b"]["rate_429"] == 0.25
+    assert rows["get_b"]["error_rate"] == 0.5
+    assert rows["get_b"]["cache_hit_rate"] == 0.25
+    assert rows["get_b"]["p50_ms"] == 9.0  # cache hits excluded from latency
+
+
+def test_failed_calls_record_error(monkeypatch, tmp_path: Path) -> None:
+    path = tmp_path / "stats.log"
+    monkeypatch.setenv(stats.STATS_ENV, str(path))
+    stats.enable_stats_log()
+
+    def get_throttled() -> None:
+        raise RateLimitError("slow down")
+
+    monkeypatch.setattr(api, "_call", lambda func, args, kwargs: func())
+    with pytest.raises(RateLimitError):
+        api.api_call(get_throttled)
+
+    record = json.loads(path.read_text())
+    assert record["error"] == "RateLimitError"
+
+
+def test_stats_command_windows_and_filters(tmp_path: Path) -> None:
+    log = stats.StatsLog(tmp_path / "stats.log")
+    now = time.time()
+    log.write({"ts": now - 7200, "endpoint": "get_old", "ms": 1.0})
+    log.write({"ts": now - 10, "endpoint": "get_user_summary", "ms": 12.0})
+    log.write({"ts": now - 5, "endpoint": "get_sleep_data", "ms": 30.0})
+
+    result = runner.invoke(
+        app, ["stats", "--log", str(log.path), "--window", "1h", "--format", "json"]
+    )
+
+    assert result.exit_code == 0, result.output
+    rows = json.loads(result.stdout)
+    assert {r["endpoint"] for r in rows} == {"get_user_summary", "get_sleep_data"}
+
+    result = runner.invoke(
+        app,
+        ["stats", "--log", str(log.path), "--window", "all", "-e", "old", "-f", "json"],
+    )
+    assert [r["endpoint"] for r in json.loads(result.stdout)] == ["get_old"]
+
+
+def test_stats_command_rejects_bad_window(tmp_path: Path) -> None:
+    result = runner.invoke(app, ["stats", "--log", str(tmp_path / "x"), "-w", "soon"])
+    assert result.exit_code == 2
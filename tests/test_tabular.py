@@ -0,0 +1,121 @@
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from garmincli import tabular
+from garmincli.cli import app
+from garmincli.commands import health
+
+runner = CliRunner()
+
+ACTIVITIES = [
+    {"activityId": 1, "distance": 5000, "activityType": {"typeKey": "running"}},
+    {"activityId": 2, "distance": 10.5, "activityType": {"typeKey": "cycling"}},
+    {"activityId": 3, "activityType": {}, "hr": [120, 130], "laps": [{}]},
+]
+
+
+class _Client:
+    def get_user_summary(self, cdate: str) -> dict[str, Any]:
+        return {"calendarDate": cdate, "totalSteps": 1234}
+
+
+def test_flatten_nested_objects() -> None:
+    record = {"a": {"b": {"c": 1}, "d": None}, "e": [1], "f": {}}
+    assert tabular.flatten(record) == {"a.b.c": 1, "a.d": None, "e": [1]}
+
+
+def test_table_rows_unwraps_single_record_list() -> None:
+    weigh_ins = {"dailyWeightSummaries": [{"weight": 1}], "totalAverage": {"w": 1}}
+    assert tabular.table_rows(weigh_ins) == [{"weight": 1}]
+    assert tabular.table_rows({"steps": 3}) == [{"steps": 3}]
+    assert tabular.table_rows([1, 2]) == [{"value": 1}, {"value": 2}]
+
+
+def test_union_keys_keeps_fields_missing_from_first_row() -> None:
+    rows = [tabular.flatten(row) for row in ACTIVITIES]
+    assert tabular.union_keys(rows) == [
+        "activityId",
+        "distance",
+        "activityType.typeKey",
+        "hr",
+        "laps",
+    ]
+
+
+def test_missing_pyarrow_is_reported(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setattr(health, "load_client", lambda tokenstore=None: _Client())
+
+    result = runner.invoke(
+        app, ["health", "-f", "parquet", "-o", str(tmp_path / "out.parquet")]
+    )
+
+    assert result.exit_code == 1
+    assert "pyarrow" in result.output
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parquet_and_arrow_round_trip(tmp_path: Path) -> None:
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    tabular.write_columnar(ACTIVITIES, "parquet", str(tmp_path / "a.parquet"))
+    table = pq.read_table(tmp_path / "a.parquet")
+    assert table.column("distance").type == pa.float64()
+    assert table.column("activityType.typeKey").to_pylist() == [
+        "running",
+        "cycling",
+        None,
+    ]
+
+    assert table.column("hr").type == pa.list_(pa.int64())
+    assert table.column("laps").to_pylist() == [None, None, "[{}]"]
+
+    tabular.write_columnar(ACTIVITIES, "arrow", str(tmp_path / "a.arrows"))
+    with pa.ipc.open_stream(str(tmp_path / "a.arrows")) as reader:
+        assert reader.read_all().num_rows == 3
+
+
+def test_arrow_stream_to_stdout(monkeypatch) -> None:
+    pa = pytest.importorskip("pyarrow")
+    monkeypatch.setattr(health, "load_client", lambda tokenstore=None: _Client())
+
+    result = runner.invoke(app, ["health", "2024-01-01", "-f", "arrow"])
+
+    assert result.exit_code == 0, result.output
+    table = pa.ipc.open_stream(result.stdout_bytes).read_all()
+    assert table.to_pylist() == [{"calendarDate": "2024-01-01", "totalSteps": 1234}]
+
+
+def test_csv_header_includes_fields_missing_from_first_row(tmp_path: Path) -> None:
+    target = tmp_path / "a.csv"
+    tabular.write_delimited(ACTIVITIES, "csv", str(target))
+
+    assert target.read_text().splitlines() == [
+        "activityId,distance,activityType.typeKey,hr,laps",
+        "1,5000,running,,",
+        "2,10.5,cycling,,",
+        '3,,,"[120, 130]",[{}]',
+    ]
+
+
+def test_lookahead_bounds_header_for_iterators() -> None:
+    rows = iter([{"a": 1}, {"a": 2, "b": {"c": 3}}, {"d": 4}])
+
+    header, flat = tabular.header_and_rows(rows, lookahead=2)
+
+    assert header == ["a", "b.c"]
+    assert list(flat) == [{"a": 1}, {"a": 2, "b.c": 3}, {"d": 4}]
+
+
+def test_tsv_to_stdout(monkeypatch) -> None:
+    monkeypatch.setattr(health, "load_client", lambda tokenstore=None: _Client())
+
+    result = runner.invoke(app, ["health", "2024-01-01", "-f", "tsv"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output == "calendarDate\ttotalSteps\n2024-01-01\t1234\n"
@@ -0,0 +1,137 @@
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import garth
+import pytest
+import requests
+
+from garmincli import transport
+from garmincli.errors import GarminCliError
+
+
+class _Echo(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    httpd = HTTPServer(("127.0.0.1", 0), _Echo)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_install_transport_without_url_is_noop(monkeypatch) -> None:
+    monkeypatch.delenv(transport.API_URL_ENV, raising=False)
+    client = garth.Client()
+    adapter = client.sess.get_adapter("https://connectapi.garmin.com/")
+
+    transport.install_transport(client)
+
+    assert client.sess.get_adapter("https://connectapi.garmin.com/") is adapter
+
+
+def test_redirect_keeps_path_and_query(server_url: str) -> None:
+    client = garth.Client()
+    transport.install_transport(client, server_url + "/prefix")
+
+    response = client.sess.get(
+        "https://connectapi.garmin.com/weight-service/weight/range/a/b?x=1"
+    )
+
+    assert response.json() == {"path": "/prefix/weight-service/weight/range/a/b?x=1"}
+
+
+def test_redirect_survives_reconfigure(monkeypatch, server_url: str) -> None:
+    monkeypatch.setenv(transport.API_URL_ENV, server_url)
+    client = garth.Client()
+    transport.install_transport(client)
+
+    client.configure(domain="garmin.cn")  # garth remounts its own adapter here
+
+    adapter = client.sess.get_adapter("https://connectapi.garmin.cn/")
+    assert isinstance(adapter, transport.RedirectAdapter)
+    assert client.sess.get("https://connectapi.garmin.cn/x").json() == {"path": "/x"}
+
+
+@pytest.fixture
+def cassette_dir(tmp_path) -> Iterator[str]:
+    yield str(tmp_path / "cassette")
+    transport.set_cassette(None)
+
+
+def _client_with(cassette: transport.Cassette, api_url: str = "") -> garth.Client:
+    transport.set_cassette(cassette)
+    client = garth.Client()
+    transport.install_transport(client, api_url or None)
+    return client
+
+
+def test_record_then_replay_offline(server_url: str, cassette_dir: str) -> None:
+    recorder = _client_with(
+        transport.Cassette(cassette_dir, transport.RECORD), server_url
+    )
+    url = "https://connectapi.garmin.com/usersummary-service/x?b=2&a=1"
+    recorded = recorder.sess.get(url).json()
+
+    player = _client_with(transport.Cassette(cassette_dir, transport.REPLAY))
+    # Same params in another order, different host: still the same request.
+    replayed = player.sess.get(
+        "https://connectapi.garmin.cn/usersummary-service/x?a=1&b=2"
+    )
+
+    assert replayed.json() == recorded
+    with pytest.raises(requests.ConnectionError, match="No recorded response"):
+        player.sess.get("https://connectapi.garmin.com/usersummary-service/y")
+
+
+def test_replay_raises_recorded_transport_errors(cassette_dir: str) -> None:
+    recorder = _client_with(
+        transport.Cassette(cassette_dir, transport.RECORD), "http://127.0.0.1:9"
+    )
+    recorder.retries = 0
+    recorder.configure()
+    with pytest.raises(requests.ConnectionError):
+        recorder.sess.get("https://connectapi.garmin.com/down")
+
+    player = _client_with(transport.Cassette(cassette_dir, transport.REPLAY))
+    with pytest.raises(requests.ConnectionError) as excinfo:
+        player.sess.get("https://connectapi.garmin.com/down")
+    assert "No recorded response" not in str(excinfo.value)
+
+
+def test_token_values_are_redacted(tmp_path) -> None:
+    cassette = transport.Cassette(str(tmp_path), transport.RECORD)
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Set-Cookie"] = "session=secret"
+    response._content = b'{"access_token": "secret", "expires_in": 3600}'
+    key = transport.request_key("POST", "https://x/oauth-service/exchange", b"{}")
+
+    cassette.record(key, response)
+
+    (entry,) = cassette.entries()
+    (exchange,) = entry["exchanges"]
+    assert json.loads(exchange["body"]) == {
+        "access_token": transport.REDACTED,
+        "expires_in": 3600,
+    }
+    assert "Set-Cookie" not in exchange["headers"]
+
+
+def test_replay_requires_existing_directory(tmp_path) -> None:
+    with pytest.raises(GarminCliError):
+        transport.Cassette(str(tmp_path / "missing"), transport.REPLAY)
@@ -0,0 +1,108 @@
+import json
+from typing import Any
+
+from typer.testing import CliRunner
+
+from garmincli.cli import app
+from garmincli.commands import watch
+from garmincli.errors import RateLimitError
+
+runner = CliRunner()
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.activities = [
+            {"activityId": 2, "name": "b"},
+            {"activityId": 1, "name": "a"},
+        ]
+        self.badges = [{"badgeId": 10, "earnedNumber": 1}]
+        self.calls: list[str] = []
+        self.fail_badges = False
+
+    def count_activities(self) -> int:
+        self.calls.append("count_activities")
+        return len(self.activities)
+
+    def get_activities(self, start: int, limit: int) -> list[dict[str, Any]]:
+        self.calls.append(f"get_activities:{limit}")
+        return [dict(a) for a in self.activities[start : start + limit]]
+
+    def get_earned_badges(self) -> list[dict[str, Any]]:
+        if self.fail_badges:
+            raise RateLimitError("slow down")
+        return [dict(b) for b in self.badges]
+
+
+def test_probe_skips_full_fetch_when_unchanged() -> None:
+    client = _Client()
+    source = watch.SOURCES["activities"]
+    state = watch.WatchState()
+
+    assert watch.poll(source, state, client) == []  # baseline
+    assert watch.poll(source, state, client) == []
+    assert state.fetches == 1
+    assert f"get_activities:{watch.ACTIVITY_WINDOW}" in client.calls[:4]
+
+    client.activities.insert(0, {"activityId": 3, "name": "c"})
+    events = watch.poll(source, state, client)
+
+    assert [(e["event"], e["key"]) for e in events] == [("added", 3)]
+    assert events[0]["item"]["name"] == "c"
+    assert state.fetches == 2
+
+
+def test_changed_and_removed_items() -> None:
+    client = _Client()
+    source = watch.SOURCES["badges"]
+    state = watch.WatchState()
+    watch.poll(source, state, client)
+
+    client.badges = [{"badgeId": 10, "earnedNumber": 2}]
+    assert [e["event"] for e in watch.poll(source, state, client)] == ["changed"]
+
+    client.badges = []
+    assert [(e["event"], e["key"]) for e in watch.poll(source, state, client)] == [
+        ("removed", 10)
+    ]
+
+
+def test_initial_emits_existing_items() -> None:
+    events = watch.poll(
+        watch.SOURCES["badges"], watch.WatchState(), _Client(), initial=True
+    )
+    assert [(e["event"], e["key"]) for e in events] == [("added", 10)]
+
+
+def test_watch_command_streams_ndjson(monkeypatch) -> None:
+    client = _Client()
+    client.fail_badges = True
+    monkeypatch.setattr(watch, "load_client", lambda tokenstore=None: client)
+    monkeypatch.setattr(watch.time, "sleep", lambda seconds: None)
+
+    result = runner.invoke(
+        app,
+        [
+            "watch",
+            "activities",
+            "badges",
+            "--initial",
+            "--count",
+            "1",
+            "--interval",
+            "badges=30",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    events = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(e["source"], e["event"]) for e in events] == [
+        ("activities", "added"),
+        ("activities", "added"),
+        ("badges", "error"),
+    ]
+
+
+def test_watch_rejects_unknown_source() -> None:
+    result = runner.invoke(app, ["watch", "steps"])
+    assert result.exit_code == 2
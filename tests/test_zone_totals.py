@@ -0,0 +1,110 @@
+import json
+from typing import Any
+
+from typer.testing import CliRunner
+
+from garmincli.cli import app
+from garmincli.commands import activities
+from garmincli.store import Store
+
+runner = CliRunner()
+
+
+def _zones(easy: float, hard: float) -> list[dict[str, Any]]:
+    return [
+        {"zoneNumber": 1, "secsInZone": easy, "zoneLowBoundary": 100},
+        {"zoneNumber": 2, "secsInZone": 0.0, "zoneLowBoundary": 130},
+        {"zoneNumber": 3, "secsInZone": hard, "zoneLowBoundary": 160},
+    ]
+
+
+ZONES = {
+    1: _zones(3000, 0),  # Monday 2024-05-06
+    2: _zones(2400, 600),  # Sunday 2024-05-12, same week
+    3: _zones(1200, 1200),  # Monday 2024-05-13
+    4: None,  # no heart rate recorded
+}
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.fetched: list[int] = []
+
+    def get_activity_hr_in_timezones(self, activity_id: int) -> Any:
+        self.fetched.append(activity_id)
+        return ZONES[activity_id]
+
+
+def _store(tmp_path) -> str:
+    store = str(tmp_path / "store.db")
+    days = {1: "2024-05-06", 2: "2024-05-12", 3: "2024-05-13", 4: "2024-05-14"}
+    with Store(store) as db:
+        db.upsert_activities(
+            {
+                "activityId": activity_id,
+                "startTimeLocal": f"{day} 07:00:00",
+                "activityType": {"typeKey": "running"},
+            }
+            for activity_id, day in days.items()
+        )
+    return store
+
+
+def _totals(store: str, *args: str) -> list[dict]:
+    result = runner.invoke(
+        app, ["activities", "zone-totals", *args, "--store", store, "-f", "json"]
+    )
+    assert result.exit_code == 0, result.output
+    return json.loads(result.output)
+
+
+def test_zone_totals_by_week_fetch_once(monkeypatch, tmp_path) -> None:
+    client = _Client()
+    monkeypatch.setattr(activities, "load_client", lambda tokenstore=None: client)
+    store = _store(tmp_path)
+
+    assert _totals(store) == [
+        {
+            "period": "2024-05-06",
+            "activities": 2,
+            "zone_1": 90.0,
+            "zone_2": 0.0,
+            "zone_3": 10.0,
+            "total_minutes": 100.0,
+        },
+        {
+            "period": "2024-05-13",
+            "activities": 2,  # activity 4 counts despite having no zones
+            "zone_1": 20.0,
+            "zone_2": 0.0,
+            "zone_3": 20.0,
+            "total_minutes": 40.0,
+        },
+    ]
+    assert sorted(client.fetched) == [1, 2, 3, 4]
+
+    month = _totals(store, "--by", "month", "--percent")
+    assert [(m["period"], m["zone_1"], m["zone_3"]) for m in month] == [
+        ("2024-05", 78.6, 21.4)
+    ]
+    assert sorted(client.fetched) == [1, 2, 3, 4]  # cached, even the empty one
+
+
+def test_zone_totals_resolves_date_expressions(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(activities, "load_client", lambda tokenstore=None: _Client())
+    store = _store(tmp_path)
+
+    weeks = _totals(store, "--start", "2024-W20", "--end", "2024-W20")
+    assert [(w["period"], w["activities"]) for w in weeks] == [("2024-05-13", 2)]
+
+    # A period whose only activity has no heart rate is still listed.
+    (week,) = _totals(store, "--start", "2024-05-14")
+    assert (week["activities"], week["total_minutes"]) == (1, 0.0)
+
+
+def test_zone_totals_rejects_unknown_period(tmp_path) -> None:
+    result = runner.invoke(
+        app, ["activities", "zone-totals", "--by", "day", "--store", _store(tmp_path)]
+    )
+    assert result.exit_code == 1
+    assert "Unknown period" in result.output